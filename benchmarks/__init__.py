@@ -0,0 +1,14 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss benchmarks."""
@@ -0,0 +1,242 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Synthetic CSS and HTML corpus generator."""
+
+import os
+import random
+
+import chcss
+
+
+def vocabulary(config, size=None):
+    """Get a configuration with a vocabulary of at least ``size`` words.
+
+    Pads the namespaces, components, and modifiers of ``config`` with
+    synthetic words, so the vocabulary size can be varied
+    independently of any project configuration.  Functions are padded
+    to at least two words only, as real projects have few.
+
+    Parameters
+    ----------
+    config : Config
+        The configuration to extend.
+    size : int (optional)
+        Minimum number of words of each padded segment kind; default
+        is no padding.
+
+    Returns
+    -------
+    Config
+        A copy of ``config`` with the padded vocabulary.
+    """
+    options = dict(vars(config))
+
+    for kind, prefix, minimum in (
+        ("namespaces", "ns", size),
+        ("functions", "fn", size and min(size, 2)),
+        ("components", "cmp", size),
+        ("modifiers", "mod", size),
+    ):
+        words = list(getattr(config, kind))
+        i = 0
+        while minimum is not None and len(words) < minimum:
+            word = f"{prefix}{i}"
+            if word not in words:
+                words.append(word)
+            i += 1
+        options[kind] = words
+
+    return chcss.Config(**options)
+
+
+def _words(config):
+    return set().union(
+        config.namespaces,
+        config.functions,
+        config.components,
+        config.elements,
+        config.modifiers,
+    )
+
+
+def valid_name(config, rng):
+    """Generate a valid class name.
+
+    Parameters
+    ----------
+    config : Config
+        The configuration providing the vocabulary.
+    rng : random.Random
+        The random number generator.
+
+    Returns
+    -------
+    string
+        A class name valid under ``config``.
+    """
+    segments = [rng.choice(config.namespaces), rng.choice(config.functions)]
+
+    if config.components and rng.random() < 0.9:
+        segments += rng.choices(config.components, k=rng.randint(1, 3))
+        elements = sorted(set(config.elements) - set(config.components))
+        if elements and rng.random() < 0.5:
+            segments.append(rng.choice(elements))
+            if config.modifiers and rng.random() < 0.5:
+                segments += rng.choices(config.modifiers, k=rng.randint(1, 2))
+
+    return "-".join(segments)
+
+
+def invalid_name(config, rng):
+    """Generate an invalid class name.
+
+    Misspells one segment of a valid name, as a typo would.
+
+    Parameters
+    ----------
+    config : Config
+        The configuration providing the vocabulary.
+    rng : random.Random
+        The random number generator.
+
+    Returns
+    -------
+    string
+        A class name invalid under ``config``.
+    """
+    words = _words(config)
+    segments = valid_name(config, rng).split("-")
+    i = rng.randrange(len(segments))
+
+    while segments[i] in words:
+        j = rng.randrange(len(segments[i]) + 1)
+        segments[i] = segments[i][:j] + rng.choice("qxz") + segments[i][j:]
+
+    return "-".join(segments)
+
+
+def names(config, count, invalid_ratio=0.1, rng=None):
+    """Generate class names.
+
+    Parameters
+    ----------
+    config : Config
+        The configuration providing the vocabulary.
+    count : int
+        Number of names.
+    invalid_ratio : float (optional)
+        Fraction of the names that are invalid.
+    rng : random.Random (optional)
+        The random number generator; default is one seeded with 0.
+
+    Returns
+    -------
+    [(string, boolean)]
+        Each name, with its validity.
+    """
+    rng = rng or random.Random(0)  # nosec B311
+
+    return [
+        (
+            (invalid_name(config, rng), False)
+            if rng.random() < invalid_ratio
+            else (valid_name(config, rng), True)
+        )
+        for _ in range(count)
+    ]
+
+
+def _css(classes):
+    lines = []
+
+    for i in range(0, len(classes), 2):
+        selector = ", ".join(f".{name}" for name in classes[i : i + 2])
+        lines.append(f"{selector} {{\n  color: #{i % 4096:03x};\n}}\n")
+
+    return "\n".join(lines)
+
+
+def _html(classes):
+    lines = ["<!DOCTYPE html>", "<html>", "<body>"]
+
+    for i in range(0, len(classes), 3):
+        lines.append(f'  <div class="{" ".join(classes[i : i + 3])}">x</div>')
+
+    lines += ["</body>", "</html>", ""]
+
+    return "\n".join(lines)
+
+
+def write_corpus(
+    directory,
+    config,
+    files=100,
+    names_per_file=100,
+    invalid_ratio=0.1,
+    html_ratio=0.5,
+    seed=0,
+):
+    """Write a synthetic corpus of CSS and HTML files.
+
+    The corpus depends only on the arguments, so runs with the same
+    arguments are comparable.
+
+    Parameters
+    ----------
+    directory : string
+        Directory to write the files to; created if missing.
+    config : Config
+        The configuration providing the vocabulary.
+    files : int (optional)
+        Number of files.
+    names_per_file : int (optional)
+        Number of class names in each file.
+    invalid_ratio : float (optional)
+        Fraction of the names that are invalid.
+    html_ratio : float (optional)
+        Fraction of the files that are HTML.
+    seed : int (optional)
+        Random seed.
+
+    Returns
+    -------
+    dict
+        Numbers of files, names, invalid names, and bytes written, and
+        the file names.
+    """
+    rng = random.Random(seed)  # nosec B311
+    os.makedirs(directory, exist_ok=True)
+    stats = {"files": 0, "names": 0, "invalid": 0, "bytes": 0, "paths": []}
+
+    for i in range(files):
+        generated = names(config, names_per_file, invalid_ratio, rng)
+        classes = [name for name, _ in generated]
+
+        if rng.random() < html_ratio:
+            fn = os.path.join(directory, f"page{i:05d}.html")
+            text = _html(classes)
+        else:
+            fn = os.path.join(directory, f"style{i:05d}.css")
+            text = _css(classes)
+
+        with open(fn, "w", encoding="utf-8") as file:
+            file.write(text)
+
+        stats["files"] += 1
+        stats["names"] += len(generated)
+        stats["invalid"] += sum(not valid for _, valid in generated)
+        stats["bytes"] += len(text.encode("utf-8"))
+        stats["paths"].append(fn)
+
+    return stats
@@ -0,0 +1,69 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Subprocess probe for the CLI benchmarks.
+
+Runs ``import chcss`` or the chcss CLI in a fresh interpreter and
+writes its peak RSS to a file, as the resource usage of a spawned
+child reports the peak of the spawning process too::
+
+    python -m benchmarks.probe OUTPUT (import | cli) [ARGS...]
+"""
+
+import json
+import resource
+import sys
+
+
+def peak_rss():
+    """Get the peak RSS of this process in bytes.
+
+    Uses ``VmHWM`` where available, as ``ru_maxrss`` is not reset on
+    ``exec()``.
+    """
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return rss
+
+    return rss * 1024
+
+
+def main(args=None):
+    """Run the probe."""
+    output, command, *args = sys.argv[1:] if args is None else args
+    status = 0
+
+    import chcss
+
+    if command == "cli":
+        try:
+            status = chcss.main(args)
+        except SystemExit as error:
+            status = error.code
+
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump({"peak_rss": peak_rss()}, file)
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
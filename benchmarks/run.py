@@ -0,0 +1,432 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Run the chcss benchmarks.
+
+Generates a synthetic corpus and measures name and file throughput of
+each backend, in process and through the CLI, with startup time and
+peak memory, writing the results as JSON::
+
+    python -m benchmarks.run --files 200 --output results.json
+
+Results depend only on the options and the machine, so results from
+the same options can be compared across commits.
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+
+import chcss
+from chcss.parser import BACKENDS
+
+from . import corpus
+from .probe import peak_rss
+
+# Format of the results; bump on incompatible changes.
+RESULTS_FORMAT = 1
+
+
+def _time(function, repeat):
+    """Time calls of ``function``, returning the minimum and median."""
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return min(times), statistics.median(times)
+
+
+def _jobs():
+    """Get the job counts to benchmark, serial and one per CPU."""
+    return sorted({1, os.cpu_count() or 1})
+
+
+def _spawn(args, cwd):
+    """Run a probe, returning its wall time and peak RSS in bytes."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(chcss.__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (root, env.get("PYTHONPATH")) if path
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "probe.json")
+        start = time.perf_counter()
+        subprocess.run(  # nosec B603
+            [sys.executable, "-m", "benchmarks.probe", output] + args,
+            cwd=cwd,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        elapsed = time.perf_counter() - start
+        with open(output, "r", encoding="utf-8") as file:
+            rss = json.load(file)["peak_rss"]
+
+    return elapsed, rss
+
+
+def _result(benchmark, backend, seconds, median, names=None, files=None, **extra):
+    result = {
+        "benchmark": benchmark,
+        "backend": backend,
+        "seconds": seconds,
+        "seconds_median": median,
+    }
+    if names is not None:
+        result["names"] = names
+        result["names_per_second"] = names / seconds
+    if files is not None:
+        result["files"] = files
+        result["files_per_second"] = files / seconds
+    result.update(extra)
+
+    return result
+
+
+def bench_names(config, names, repeat):
+    """Measure name throughput of each backend.
+
+    Parameters
+    ----------
+    config : Config
+        The configuration.
+    names : [string]
+        Class names to check.
+    repeat : int
+        Number of timed runs of each benchmark.
+
+    Returns
+    -------
+    [dict]
+        The results.
+    """
+    results = []
+
+    for backend in BACKENDS:
+        conf = chcss.Config(**{**vars(config), "backend": backend})
+        validator = chcss.get_validator(conf)
+
+        def check():
+            for name in names:
+                validator.check(name)
+
+        results.append(_result("names", backend, *_time(check, repeat), len(names)))
+
+        def check_memoized():
+            cache = chcss.VerdictCache(validator, config.verdict_cache_size)
+            for name in names:
+                cache.check(name)
+
+        results.append(
+            _result(
+                "names-memoized",
+                backend,
+                *_time(check_memoized, repeat),
+                len(names),
+                unique=len(set(names)),
+            )
+        )
+
+        def parse_class_name():
+            with contextlib.redirect_stdout(io.StringIO()):
+                for name in names:
+                    chcss.parse_class_name(name, conf)
+
+        results.append(
+            _result(
+                "parse_class_name",
+                backend,
+                *_time(parse_class_name, repeat),
+                len(names),
+            )
+        )
+
+    return results
+
+
+def bench_files(config, paths, names, repeat):
+    """Measure file throughput of each backend, serial and parallel.
+
+    Parameters
+    ----------
+    config : Config
+        The configuration.
+    paths : [string]
+        Files to check.
+    names : int
+        Number of class names in the files.
+    repeat : int
+        Number of timed runs of each benchmark.
+
+    Returns
+    -------
+    [dict]
+        The results.
+    """
+    results = []
+
+    for backend in BACKENDS:
+        for jobs in _jobs():
+            conf = chcss.Config(
+                **{**vars(config), "backend": backend, "cache": False, "jobs": jobs}
+            )
+            checker = chcss.get_checker(conf)
+
+            def check():
+                # Memoized results of earlier runs would hide the
+                # backend.
+                getattr(checker, "clear", lambda: None)()
+                for _ in chcss.check_files(paths, conf):
+                    pass
+
+            results.append(
+                _result(
+                    "files",
+                    backend,
+                    *_time(check, repeat),
+                    names,
+                    len(paths),
+                    jobs=jobs,
+                )
+            )
+
+    return results
+
+
+def bench_cli(config, directory, files, names, repeat):
+    """Measure startup time, CLI throughput, and peak RSS.
+
+    Parameters
+    ----------
+    config : Config
+        The configuration.
+    directory : string
+        Corpus directory.
+    files : int
+        Number of files in the corpus.
+    names : int
+        Number of class names in the corpus.
+    repeat : int
+        Number of timed runs of each benchmark.
+
+    Returns
+    -------
+    [dict]
+        The results.
+    """
+    config_file = os.path.join(directory, "chcss.json")
+    with open(config_file, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "chcss": {
+                    "namespaces": list(config.namespaces),
+                    "functions": list(config.functions),
+                    "components": list(config.components),
+                    "elements": list(config.elements),
+                    "modifiers": list(config.modifiers),
+                }
+            },
+            file,
+        )
+
+    commands = [("import", None, ["import"])]
+    cli = ["cli", "--config-file", config_file, "--no-cache", "--no-daemon"]
+    commands.append(("startup", None, cli + ["-"]))
+    for backend in BACKENDS:
+        for jobs in _jobs():
+            command = cli + ["--backend", backend, "--jobs", str(jobs), directory]
+            commands.append(("cli", backend, command, jobs))
+
+    results = []
+
+    for benchmark, backend, command, *jobs in commands:
+        runs = [_spawn(command, directory) for _ in range(repeat)]
+        times = [elapsed for elapsed, _ in runs]
+        extra = {"peak_rss": max(rss for _, rss in runs)}
+        if jobs:
+            extra["jobs"] = jobs[0]
+
+        results.append(
+            _result(
+                benchmark,
+                backend,
+                min(times),
+                statistics.median(times),
+                names if benchmark == "cli" else None,
+                files if benchmark == "cli" else None,
+                **extra,
+            )
+        )
+
+    return results
+
+
+def run(options):
+    """Generate the corpus and run the benchmarks.
+
+    Parameters
+    ----------
+    options : argparse.Namespace
+        The parsed command line options.
+
+    Returns
+    -------
+    dict
+        The parameters, environment, and results of the run.
+    """
+    config = chcss.Config(verdict_cache_size=options.verdict_cache_size)
+    if options.config_file:
+        with contextlib.redirect_stdout(io.StringIO()):
+            config.load(["--config-file", options.config_file])
+    config = corpus.vocabulary(config, options.vocabulary_size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        if options.corpus:
+            directory = options.corpus
+        stats = corpus.write_corpus(
+            directory,
+            config,
+            options.files,
+            options.names_per_file,
+            options.invalid_ratio,
+            options.html_ratio,
+            options.seed,
+        )
+        names = corpus.names(
+            config, options.names, options.invalid_ratio, corpus.random.Random(1)
+        )
+        names = [name for name, _ in names]
+
+        results = []
+        results += bench_names(config, names, options.repeat)
+        results += bench_files(config, stats["paths"], stats["names"], options.repeat)
+        if not options.no_cli:
+            results += bench_cli(
+                config, directory, stats["files"], stats["names"], options.repeat
+            )
+
+    parameters = {
+        key: value for key, value in vars(options).items() if key not in ("output",)
+    }
+    parameters["vocabulary"] = {
+        kind: len(getattr(config, kind))
+        for kind in ("namespaces", "functions", "components", "elements", "modifiers")
+    }
+    parameters["corpus"] = {key: stats[key] for key in ("files", "names", "invalid")}
+    parameters["corpus"]["bytes"] = stats["bytes"]
+
+    return {
+        "format": RESULTS_FORMAT,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "parameters": parameters,
+        "peak_rss": peak_rss(),
+        "results": results,
+    }
+
+
+def _create_argument_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Run the chcss benchmarks on a synthetic corpus.",
+    )
+    parser.add_argument("--files", type=int, default=100, help="Corpus files.")
+    parser.add_argument(
+        "--names-per-file", type=int, default=200, help="Class names per file."
+    )
+    parser.add_argument(
+        "--names",
+        type=int,
+        default=20000,
+        help="Class names in the name throughput benchmarks.",
+    )
+    parser.add_argument(
+        "--vocabulary-size",
+        type=int,
+        default=10,
+        help="Minimum number of namespaces, components, and modifiers."
+        "  Default is 10.",
+    )
+    parser.add_argument(
+        "--invalid-ratio", type=float, default=0.1, help="Fraction of invalid names."
+    )
+    parser.add_argument(
+        "--html-ratio", type=float, default=0.5, help="Fraction of HTML files."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed.")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs of each benchmark."
+    )
+    parser.add_argument(
+        "--verdict-cache-size",
+        type=int,
+        default=65536,
+        help="Verdict cache size of the memoized benchmarks.",
+    )
+    parser.add_argument(
+        "--config-file",
+        default=None,
+        help="Configuration file providing the base vocabulary.",
+    )
+    parser.add_argument(
+        "--corpus",
+        default=None,
+        help="Directory to write the corpus to; default is a temporary one.",
+    )
+    parser.add_argument(
+        "--no-cli", action="store_true", help="Skip the CLI benchmarks."
+    )
+    parser.add_argument(
+        "--output", default="-", help="Results file; default is standard output."
+    )
+
+    return parser
+
+
+def main(args=None):
+    """Run the benchmarks from the command line."""
+    options = _create_argument_parser().parse_args(args)
+    results = run(options)
+
+    if options.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,10 +10,78 @@
 #
 # ******************************************************************************
 
-"""chcss module."""
+"""chcss module.
 
-from .config import Config
-from .data import HTML5_ELEMENTS
-from .data import HTML5_ELEMENTS_OBSOLETE
-from .parser import main
-from .parser import parse_class_name
+The public names are imported from their modules on first use, so
+that importing ``chcss``, or running the CLI, imports only what is
+needed; in particular, pyparsing is imported only to compile the
+``pyparsing`` backend.
+"""
+
+import importlib
+
+# Defining module of each public name.
+_EXPORTS = {
+    "BKTree": "suggest",
+    "CSSScanner": "css",
+    "ClassNameResult": "result",
+    "Config": "config",
+    "ConfigCache": "cache",
+    "ConfigResolver": "resolve",
+    "DFAValidator": "dfa",
+    "FileResult": "result",
+    "Finding": "result",
+    "FrozenConfig": "config",
+    "HTML5_ELEMENTS": "data",
+    "HTML5_ELEMENTS_OBSOLETE": "data",
+    "HTMLClassScanner": "markup",
+    "HierarchyIndex": "index",
+    "Identifier": "result",
+    "JSONLinesReporter": "reporters",
+    "LineIndex": "lines",
+    "OccurrenceTable": "dedup",
+    "Reporter": "reporters",
+    "ResultCache": "cache",
+    "SARIFReporter": "reporters",
+    "Stats": "stats",
+    "Suggester": "suggest",
+    "TextReporter": "reporters",
+    "Validator": "grammar",
+    "VerdictCache": "parser",
+    "check_file": "check",
+    "check_file_async": "aio",
+    "check_files": "check",
+    "check_files_async": "aio",
+    "check_files_unique": "dedup",
+    "check_staged": "staged",
+    "check_stream": "check",
+    "expand_paths": "check",
+    "get_checker": "parser",
+    "get_validator": "parser",
+    "main": "cli",
+    "parse_class_name": "parser",
+    "parse_class_names": "parser",
+    "scan_css": "css",
+    "scan_css_file": "css",
+    "scan_html": "markup",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import a public name from its module on first use."""
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    """List the module attributes, including public names not yet imported."""
+    return sorted(set(globals()) | set(_EXPORTS))
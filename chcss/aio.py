@@ -0,0 +1,134 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss asyncio interface."""
+
+import asyncio
+import collections
+import itertools
+import os
+
+from .cache import ResultCache
+from .check import _check
+from .check import expand_paths
+from .parser import get_checker
+
+
+async def check_file_async(fn, config, executor=None):
+    """Check a CSS or HTML file without blocking the event loop.
+
+    The file is read in chunks and validated, as by ``check_file()``,
+    in ``executor``.
+
+    Parameters
+    ----------
+    fn : string
+        Name of the file to be checked.
+    config : Config
+        The configuration providing the syntax, backend, and segment
+        vocabularies.
+    executor : concurrent.futures.Executor (optional)
+        Executor to check the file in; default is the default executor
+        of the event loop.
+
+    Returns
+    -------
+    FileResult
+        The result for the file, with the reason for failure if it
+        could not be checked.
+    """
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(executor, _check, fn, config)
+
+
+async def check_files_async(paths, config, jobs=None, limit=None, executor=None):
+    """Check files concurrently without blocking the event loop.
+
+    Paths are expanded, the validator compiled, and each file read and
+    validated in a pool of threads, so the event loop only schedules
+    files and collects results.  All threads share the validator
+    compiled from ``config``, which is compiled once before the first
+    file is checked.  Results are produced in the order of
+    ``expand_paths(paths)``.
+
+    At most ``limit`` files are in flight, counting results not yet
+    consumed, so a slow consumer holds back reading instead of results
+    accumulating in memory.  Cancelling the consumer, or closing the
+    generator, cancels the files not yet started; files being checked
+    are finished in the background.
+
+    Results are cached as by ``check_files()`` if ``config.cache`` is
+    set.
+
+    Parameters
+    ----------
+    paths : [string]
+        Files, directories, or glob patterns to be checked.
+    config : Config
+        The configuration providing the syntax, backend, and segment
+        vocabularies.
+    jobs : int (optional)
+        Number of threads; default is ``config.jobs`` or the number of
+        CPUs.  Ignored if ``executor`` is given.
+    limit : int (optional)
+        Maximum number of files in flight; default is twice ``jobs``.
+    executor : concurrent.futures.Executor (optional)
+        Executor to check the files in; default is a thread pool of
+        ``jobs`` threads, shut down when done.
+
+    Yields
+    ------
+    FileResult
+        The results for each file.
+    """
+    loop = asyncio.get_running_loop()
+    jobs = jobs or config.jobs or os.cpu_count() or 1
+    limit = max(1, limit or 2 * jobs)
+    owned = executor is None
+
+    if owned:
+        import concurrent.futures
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=jobs, thread_name_prefix="chcss"
+        )
+
+    pending = collections.deque()
+
+    try:
+        files = await loop.run_in_executor(executor, expand_paths, paths)
+        await loop.run_in_executor(executor, get_checker, config)
+        cache = ResultCache(config) if config.cache else None
+
+        def submit(fn):
+            pending.append(loop.run_in_executor(executor, _check, fn, config, cache))
+
+        files = iter(files)
+        for fn in itertools.islice(files, limit):
+            submit(fn)
+
+        while pending:
+            result = await pending[0]
+            pending.popleft()
+            for fn in itertools.islice(files, 1):
+                submit(fn)
+            yield result
+
+        if cache is not None:
+            await loop.run_in_executor(executor, cache.prune)
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,437 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""chcss persistent result cache."""
+
+import collections
+import hashlib
+import json
+import os
+import time
+
+from .result import ClassNameResult
+from .result import FileResult
+from .result import Finding
+from .result import Identifier
+
+# Bump when scanning or the stored format changes, to invalidate all
+# existing entries.
+CACHE_FORMAT = 2
+
+DEFAULT_CACHE_DIR = ".chcss_cache"
+DEFAULT_CACHE_SIZE = 64
+
+_ENTRY_SUFFIX = ".json"
+_CONFIG_SUFFIX = ".config"
+
+# Files modified this recently may be modified again within the
+# timestamp resolution of the file system without changing their
+# signature, so their contents are not cached.
+_RACY_NS = 2 * 10**9
+
+# Entries of both caches kept in memory by ``keep_in_memory()``, or
+# ``None``.
+_memory = None
+_memory_size = 0
+
+
+def keep_in_memory(maxsize=4096):
+    """Keep cache entries in memory as well as on disk.
+
+    For long-running processes, such as the daemon, which then serve
+    results and configuration options without reading the cache
+    directory.  Entries are validated as they are on disk.
+
+    Parameters
+    ----------
+    maxsize : int (optional)
+        Maximum number of entries kept, least recently used first
+        evicted; 0 stops keeping entries.
+    """
+    global _memory, _memory_size
+
+    _memory = collections.OrderedDict() if maxsize else None
+    _memory_size = maxsize
+
+
+def _remember(key, value):
+    """Keep a cache entry in memory, if enabled."""
+    if _memory is None:
+        return
+
+    _memory[key] = value
+    _memory.move_to_end(key)
+    if len(_memory) > _memory_size:
+        _memory.popitem(last=False)
+
+
+def _recall(key):
+    """Get a cache entry kept in memory, or ``None``."""
+    if _memory is None:
+        return None
+
+    value = _memory.get(key)
+    if value is not None:
+        _memory.move_to_end(key)
+
+    return value
+
+
+def config_hash(config):
+    """Hash the configuration options that determine check results.
+
+    Parameters
+    ----------
+    config : Config or FrozenConfig
+        The configuration.
+
+    Returns
+    -------
+    string
+        Hex digest of the backend and frozen segment vocabularies, so
+        independent of their order.
+    """
+    frozen = config.freeze()
+    options = [CACHE_FORMAT, frozen.backend] + [
+        sorted(words)
+        for words in (
+            frozen.namespaces,
+            frozen.functions,
+            frozen.components,
+            frozen.elements,
+            frozen.modifiers,
+        )
+    ]
+
+    return hashlib.sha256(json.dumps(options).encode("utf-8")).hexdigest()
+
+
+def _ensure_directory(directory):
+    """Create a cache directory, ignored by git, if missing."""
+    if os.path.isdir(directory):
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, ".gitignore"), "w") as file:
+        file.write("# Created by chcss.\n*\n")
+
+
+def _mkstemp(directory):
+    """Create a temporary file in a directory, for an atomic replace."""
+    import tempfile
+
+    return tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+
+def _identifier(namespace, function, components, element, modifiers):
+    """Rebuild an ``Identifier()`` from its stored fields."""
+    return Identifier(namespace, function, tuple(components), element, tuple(modifiers))
+
+
+class ResultCache:
+    """On-disk cache of file results.
+
+    Entries are keyed by a hash of the file contents, its syntax, and
+    the configuration options that affect results (``config_hash()``),
+    so editing a file or the ``[tool.chcss]`` vocabularies invalidates
+    the affected entries without any bookkeeping.  Entries are stored
+    one per file in ``directory`` and do not depend on the file name,
+    so renamed or copied files hit the cache too.
+
+    ``prune()`` bounds the cache by evicting the least recently used
+    entries.
+
+    Attributes
+    ----------
+    directory : string
+        The cache directory.
+    max_size : int
+        Maximum total size of the entries, in bytes.
+    """
+
+    def __init__(self, config, directory=None, max_size=None):
+        """Create a ``ResultCache()`` object.
+
+        Parameters
+        ----------
+        config : Config
+            The configuration providing the cache directory and size
+            and the options that determine results.
+        directory : string (optional)
+            The cache directory; default is ``config.cache_dir``.
+        max_size : int (optional)
+            Maximum total size of the entries in MiB; default is
+            ``config.cache_size``.
+        """
+        self.directory = directory or config.cache_dir
+        self.max_size = (max_size or config.cache_size) * 1024 * 1024
+        self._config_hash = config_hash(config)
+
+    def key(self, fn, syntax):
+        """Compute the cache key of a file.
+
+        Parameters
+        ----------
+        fn : string
+            Name of the file.
+        syntax : string
+            Syntax the file is checked as.
+
+        Returns
+        -------
+        string
+            Hex digest of the file contents, syntax, and configuration.
+
+        Raises
+        ------
+        OSError
+            Raised if the file cannot be read.
+        """
+        digest = hashlib.sha256(f"{self._config_hash}:{syntax}:".encode())
+
+        with open(fn, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    def get(self, fn, key):
+        """Get the cached result of a file.
+
+        Parameters
+        ----------
+        fn : string
+            Name of the file.
+        key : string
+            Cache key of the file.
+
+        Returns
+        -------
+        FileResult
+            The cached result, or ``None`` if there is no usable entry.
+        """
+        result = _recall(("result", key, fn))
+        if result is not None:
+            return result
+
+        path = self._path(key)
+
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        result = FileResult(
+            fn,
+            tuple(
+                Finding(
+                    fn,
+                    line,
+                    col,
+                    ClassNameResult(
+                        name,
+                        valid,
+                        identifier and _identifier(*identifier),
+                        loc,
+                        msg,
+                    ),
+                )
+                for line, col, name, valid, identifier, loc, msg in entries
+            ),
+        )
+        _remember(("result", key, fn), result)
+
+        return result
+
+    def put(self, key, result):
+        """Store the result of a file.
+
+        Results with errors are not stored.  Failures to write are
+        ignored; the cache is an optimization only.
+
+        Parameters
+        ----------
+        key : string
+            Cache key of the file.
+        result : FileResult
+            The result to store.
+        """
+        if result.error is not None:
+            return
+
+        _remember(("result", key, result.fn), result)
+        entries = [
+            [
+                f.line,
+                f.col,
+                f.result.name,
+                f.result.valid,
+                f.result.identifier and f.result.identifier[:5],
+                f.result.loc,
+                f.result.msg,
+            ]
+            for f in result.findings
+        ]
+
+        try:
+            _ensure_directory(self.directory)
+            fd, tmp = _mkstemp(self.directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entries, file, separators=(",", ":"))
+            os.replace(tmp, self._path(key))
+        except OSError:
+            pass
+
+    def prune(self):
+        """Evict least recently used entries until under ``max_size``."""
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(_ENTRY_SUFFIX)
+            ]
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+def _signature(fn):
+    """Get the modification time and size of a file, or ``None``."""
+    try:
+        stat = os.stat(fn)
+    except OSError:
+        return None
+
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class ConfigCache:
+    """On-disk cache of parsed configuration files.
+
+    Stores the options loaded from a configuration file, keyed by its
+    absolute path and validated by the modification time and size of
+    each file they were loaded from, so an unchanged ``pyproject.toml``
+    is not parsed again.  Files modified in the last two seconds are
+    not cached, as a change within the timestamp resolution of the
+    file system would go unnoticed.
+
+    Attributes
+    ----------
+    directory : string
+        The cache directory.
+    """
+
+    def __init__(self, directory=None):
+        """Create a ``ConfigCache()`` object.
+
+        Parameters
+        ----------
+        directory : string (optional)
+            The cache directory; default is ``DEFAULT_CACHE_DIR``.
+        """
+        self.directory = directory or DEFAULT_CACHE_DIR
+
+    def _path(self, fn):
+        digest = hashlib.sha256(os.path.abspath(fn).encode("utf-8")).hexdigest()
+
+        return os.path.join(self.directory, digest + _CONFIG_SUFFIX)
+
+    def get(self, fn, sources):
+        """Get the cached options of a configuration file.
+
+        Parameters
+        ----------
+        fn : string
+            Name of the configuration file.
+        sources : [string]
+            Names of the files the options are loaded from, such as
+            ``package.json`` as a fallback for ``pyproject.toml``.
+
+        Returns
+        -------
+        dict
+            The cached options, or ``None`` if there is no entry or any
+            source changed.
+        """
+        path = self._path(fn)
+        text = _recall(("config", path))
+
+        try:
+            if text is None:
+                with open(path, "r", encoding="utf-8") as file:
+                    text = file.read()
+            entry = json.loads(text)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("format") != CACHE_FORMAT or entry.get("signatures") != [
+            _signature(source) for source in sources
+        ]:
+            return None
+
+        _remember(("config", path), text)
+
+        return entry["options"]
+
+    def put(self, fn, sources, options):
+        """Store the options of a configuration file.
+
+        Failures to write are ignored; the cache is an optimization
+        only.
+
+        Parameters
+        ----------
+        fn : string
+            Name of the configuration file.
+        sources : [string]
+            Names of the files the options are loaded from.
+        options : dict
+            The loaded options.
+        """
+        signatures = [_signature(source) for source in sources]
+        now = time.time_ns()
+        if any(s is not None and now - s[0] < _RACY_NS for s in signatures):
+            return
+
+        try:
+            entry = json.dumps(
+                {"format": CACHE_FORMAT, "signatures": signatures, "options": options}
+            )
+        except (TypeError, ValueError):
+            return
+
+        _remember(("config", self._path(fn)), entry)
+
+        try:
+            _ensure_directory(self.directory)
+            fd, tmp = _mkstemp(self.directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(entry)
+            os.replace(tmp, self._path(fn))
+        except OSError:
+            pass
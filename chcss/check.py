@@ -0,0 +1,479 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""chcss file checking functions."""
+
+import glob
+import io
+import itertools
+import os
+import sys
+
+from .cache import ResultCache
+from .css import DEFAULT_CHUNK_SIZE
+from .css import DEFAULT_MMAP_THRESHOLD
+from .css import scan_css
+from .css import scan_css_file
+from .data import HTML_EXTENSIONS
+from .parser import _compile_validator
+from .parser import get_checker
+from .reporters import TextReporter
+from .result import FileResult
+from .result import Finding
+from .stats import Stats
+
+# Extensions of files checked when a directory is given.
+CHECKED_EXTENSIONS = frozenset((".css",)) | HTML_EXTENSIONS
+
+# Configuration, cache, statistics flag, and configuration resolver
+# of a worker process, set once by ``_init_worker()``.
+_worker_config = None
+_worker_cache = None
+_worker_stats = False
+_worker_resolver = None
+
+
+def _syntax(fn, config):
+    """Get the syntax of a file, from the configuration or its extension."""
+    if config.syntax is not None:
+        return config.syntax
+
+    if os.path.splitext(fn)[1].lower() in HTML_EXTENSIONS:
+        return "html"
+
+    return "css"
+
+
+def _within(names, lines):
+    """Filter names by line, stopping after the last of the line ranges."""
+    ranges = iter(lines)
+    current = next(ranges, None)
+
+    for name, line, col in names:
+        while current is not None and line > current[1]:
+            current = next(ranges, None)
+        if current is None:
+            return
+        if line >= current[0]:
+            yield name, line, col
+
+
+def check_stream(stream, config, fn="-", chunk_size=DEFAULT_CHUNK_SIZE, lines=None):
+    """Check the class identifiers of a CSS or HTML stream.
+
+    Class identifiers are validated as the scanner produces them, so
+    only one chunk of the stream is held in memory at a time.  The
+    syntax is ``config.syntax`` if set, otherwise HTML for names with
+    an extension in ``HTML_EXTENSIONS`` and CSS for anything else,
+    including ``STDIN``.
+
+    With ``lines``, only identifiers on those lines are validated, and
+    the stream is read no further than the last of them.  The stream
+    is scanned from its start, so that comments, rules, and tags
+    begun on earlier lines are still recognized.
+
+    Parameters
+    ----------
+    stream : file
+        A text stream of the stylesheet or document.
+    config : Config
+        The configuration providing the syntax, backend, and segment
+        vocabularies.
+    fn : string (optional)
+        Name of the file for the findings; default is ``-``.
+    chunk_size : int (optional)
+        Number of characters to read at a time.
+    lines : [(int, int)] (optional)
+        Sorted, disjoint ranges of line numbers, first and last
+        included, to check; default is all lines.
+
+    Yields
+    ------
+    Finding
+        Each class selector occurrence and its result, in order.
+    """
+    check = get_checker(config).check
+    scan = scan_css
+
+    if _syntax(fn, config) == "html":
+        from .markup import scan_html
+
+        scan = scan_html
+
+    names = scan(stream, chunk_size)
+    if lines is not None:
+        names = _within(names, lines)
+
+    for name, line, col in names:
+        yield Finding(fn, line, col, check(name))
+
+
+def check_file(
+    fn, config, chunk_size=DEFAULT_CHUNK_SIZE, mmap_threshold=DEFAULT_MMAP_THRESHOLD
+):
+    """Check the class identifiers of a CSS or HTML file.
+
+    The syntax is chosen as for ``check_stream()``.  Large stylesheets
+    are memory mapped rather than read; see ``scan_css_file()``.
+
+    Parameters
+    ----------
+    fn : string
+        Name of the file to be checked, or ``-`` for ``STDIN``.
+    config : Config
+        The configuration providing the syntax, backend, and segment
+        vocabularies.
+    chunk_size : int (optional)
+        Number of characters to read at a time.
+    mmap_threshold : int (optional)
+        Minimum size in bytes of a file to memory map; ``None``
+        disables memory mapping.
+
+    Yields
+    ------
+    Finding
+        Each class selector occurrence and its result, in order.
+
+    Raises
+    ------
+    FileNotFoundError
+        Raised if the file does not exist or is not readable.
+    """
+    check = get_checker(config).check
+
+    for name, line, col in _names(fn, config, chunk_size, mmap_threshold):
+        yield Finding(fn, line, col, check(name))
+
+
+def _names(
+    fn,
+    config,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    mmap_threshold=DEFAULT_MMAP_THRESHOLD,
+    wrap=None,
+):
+    """Scan a file as ``check_file()`` does, without validating.
+
+    ``wrap`` is applied to any text stream read, as by
+    ``scan_css_file()``.
+    """
+    syntax = _syntax(fn, config)
+    if syntax == "css" and fn != "-":
+        yield from scan_css_file(fn, chunk_size, mmap_threshold, wrap)
+        return
+
+    scan = scan_css
+    if syntax == "html":
+        from .markup import scan_html
+
+        scan = scan_html
+
+    if fn == "-":
+        yield from scan(sys.stdin if wrap is None else wrap(sys.stdin), chunk_size)
+        return
+
+    with open(fn, "r", encoding="utf-8", errors="replace") as stream:
+        yield from scan(stream if wrap is None else wrap(stream), chunk_size)
+
+
+def expand_paths(paths):
+    """Expand directories and glob patterns into file names.
+
+    Directories are searched recursively for files with an extension
+    in ``CHECKED_EXTENSIONS``; glob patterns may use ``**``.  File
+    names, including ``-`` for ``STDIN``, are kept as given.
+
+    Parameters
+    ----------
+    paths : [string]
+        Files, directories, or glob patterns.
+
+    Returns
+    -------
+    [string]
+        The file names, sorted within each directory or pattern and
+        without duplicates.
+    """
+    files = {}
+
+    for path in paths:
+        if path != "-" and glob.has_magic(path):
+            names = sorted(glob.glob(path, recursive=True))
+            expanded = []
+            for name in names:
+                if os.path.isdir(name):
+                    expanded.extend(expand_paths([name]))
+                else:
+                    expanded.append(name)
+        elif os.path.isdir(path):
+            expanded = []
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                expanded.extend(
+                    os.path.join(root, name)
+                    for name in sorted(names)
+                    if os.path.splitext(name)[1].lower() in CHECKED_EXTENSIONS
+                )
+        else:
+            expanded = [path]
+
+        files.update(dict.fromkeys(expanded))
+
+    return list(files)
+
+
+class _TimedStream(io.TextIOBase):
+    """Text stream timing its reads as the ``read`` phase."""
+
+    def __init__(self, stream, stats):
+        self._stream = stream
+        self._stats = stats
+
+    def read(self, size=-1):
+        """Read from the stream, timing the read."""
+        with self._stats.phase("read"):
+            return self._stream.read(size)
+
+
+def _check_timed(fn, config, stats, mmap_threshold=DEFAULT_MMAP_THRESHOLD):
+    """Check a file as ``check_file()`` does, timing each phase.
+
+    Reading the stream that ``_names()`` scans is timed as ``read``,
+    the rest of producing each name as ``extract``, and checking it as
+    ``validate``, each added to ``stats`` once per file.  Memory mapped
+    files are read as they are scanned, so in ``extract``.  Compiling
+    the validator is timed as ``compile`` if this call compiles it, as
+    the first call in a worker process does.
+    """
+    timings = Stats()
+    compiled = _compile_validator.cache_info().misses
+
+    with timings.phase("compile"):
+        checker = get_checker(config)
+    if _compile_validator.cache_info().misses == compiled:
+        del timings.phases["compile"]
+
+    hits = getattr(checker, "hits", 0)
+    misses = getattr(checker, "misses", 0)
+    check = checker.check
+
+    names = _names(
+        fn,
+        config,
+        mmap_threshold=mmap_threshold,
+        wrap=lambda stream: _TimedStream(stream, timings),
+    )
+    findings = []
+    while True:
+        with timings.phase("extract"):
+            item = next(names, None)
+        if item is None:
+            break
+        name, line, col = item
+        with timings.phase("validate"):
+            findings.append(Finding(fn, line, col, check(name)))
+
+    # Reads are timed within extraction.
+    read = timings.phases.get("read", (0.0, 0.0))
+    timings.phases["extract"][0] -= read[0]
+    timings.phases["extract"][1] -= read[1]
+    for phase, (wall, cpu, _) in timings.phases.items():
+        stats.add(phase, wall, cpu)
+
+    if hasattr(checker, "hits"):
+        stats.counters["verdict_cache_hits"] += checker.hits - hits
+        stats.counters["verdict_cache_misses"] += checker.misses - misses
+
+    return tuple(findings)
+
+
+def _stream(fn, config):
+    """Check a file lazily, failing at once if it cannot be read."""
+    findings = check_file(fn, config)
+    first = next(findings, None)
+    if first is None:
+        return ()
+
+    return itertools.chain((first,), findings)
+
+
+def _check(fn, config, cache=None, stats=None, stream=False):
+    """Check a file, collecting its findings or the reason for failure.
+
+    With ``stream``, the findings of a file that is not cached are
+    left unread, to be checked as they are consumed.
+    """
+    if stats is None:
+        check = check_file
+    else:
+
+        def check(fn, config):
+            return _check_timed(fn, config, stats)
+
+    try:
+        if cache is None or fn == "-":
+            if stream:
+                return FileResult(fn, _stream(fn, config))
+            return FileResult(fn, tuple(check(fn, config)))
+
+        key = cache.key(fn, _syntax(fn, config))
+        result = cache.get(fn, key)
+        if stats is not None:
+            stats.counters[
+                f"result_cache_{'misses' if result is None else 'hits'}"
+            ] += 1
+        if result is None:
+            result = FileResult(fn, tuple(check(fn, config)))
+            cache.put(key, result)
+
+        return result
+    except OSError as error:
+        return FileResult(fn, error=f"{error.strerror}: {error.filename}")
+
+
+def _resolve(fn, config, cache, resolver):
+    """Get the configuration and result cache of a file."""
+    if resolver is None:
+        return config, cache
+
+    return resolver.resolve(fn)
+
+
+def _init_worker(config, cache, stats=False, resolver=None):
+    """Initialize a worker process with its configuration.
+
+    The validator is compiled on first use, so a worker whose files
+    are all cached never compiles it.
+    """
+    global _worker_config, _worker_cache, _worker_stats, _worker_resolver
+
+    _worker_config = config
+    _worker_cache = cache
+    _worker_stats = stats
+    _worker_resolver = resolver
+
+
+def _check_worker(fn):
+    """Check a file in a worker process, with its statistics if collected."""
+    config, cache = _resolve(fn, _worker_config, _worker_cache, _worker_resolver)
+
+    if not _worker_stats:
+        return _check(fn, config, cache)
+
+    stats = Stats()
+
+    return _check(fn, config, cache, stats), stats
+
+
+def check_files(paths, config, jobs=None, stats=None, resolver=None, stream=False):
+    """Check files in parallel.
+
+    Files are checked in a pool of worker processes, each of which
+    receives the configuration and compiles its validator once.
+    Results are produced in the order of ``expand_paths(paths)``
+    regardless of which worker finishes first.
+
+    If ``config.cache`` is set, unchanged files are not checked again
+    but their results are read from a ``ResultCache()`` in
+    ``config.cache_dir``, which is pruned to ``config.cache_size``
+    after the last file.
+
+    With ``stream``, the findings of each file checked in this process
+    and not cached are an iterator, checking the file as it is read,
+    so that they are never held in memory.  They can be read only
+    once.  A file that cannot be opened has its ``error`` set as
+    usual, but a later error reading it is raised from its findings.
+
+    Parameters
+    ----------
+    paths : [string]
+        Files, directories, or glob patterns to be checked.
+    config : Config
+        The configuration providing the syntax, backend, and segment
+        vocabularies.
+    jobs : int (optional)
+        Number of worker processes; default is ``config.jobs`` or the
+        number of CPUs.  One checks the files in this process.
+    stats : Stats (optional)
+        Statistics to add the read, extract, and validate timings,
+        file and name counts, and cache hits to, including those of
+        the workers and the time they take to compile the validator;
+        default is none collected.
+    resolver : ConfigResolver (optional)
+        Resolver of the configuration of each file, in place of
+        ``config``; default is ``config`` for all files.
+    stream : boolean (optional)
+        Whether to stream the findings of files checked in this
+        process and not cached; default is False.  Ignored when
+        collecting statistics.
+
+    Yields
+    ------
+    FileResult
+        The results for each file.
+    """
+    files = expand_paths(paths)
+    jobs = jobs or config.jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(files))
+    cache = ResultCache(config) if config.cache else None
+
+    if jobs <= 1 or "-" in files:
+        for fn in files:
+            result = _check(
+                fn,
+                *_resolve(fn, config, cache, resolver),
+                stats,
+                stream and stats is None,
+            )
+            if stats is not None:
+                stats.count_result(result)
+            yield result
+    else:
+        import concurrent.futures
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(config, cache, stats is not None, resolver),
+        ) as executor:
+            chunksize = max(1, len(files) // (jobs * 4))
+            results = executor.map(_check_worker, files, chunksize=chunksize)
+            if stats is None:
+                yield from results
+            else:
+                for result, worker_stats in results:
+                    stats.merge(worker_stats)
+                    stats.count_result(result)
+                    yield result
+
+    if cache is not None:
+        cache.prune()
+
+
+def report(result, suggester=None):
+    """Print the diagnostics of a file result.
+
+    Parameters
+    ----------
+    result : FileResult
+        The result to report.
+    suggester : Suggester (optional)
+        Suggests a replacement for the first invalid segment of each
+        invalid identifier; default is no suggestions.
+
+    Returns
+    -------
+    boolean
+        True if the file could not be checked or has an invalid
+        identifier, False otherwise.
+    """
+    return TextReporter().report(result, suggester)
@@ -0,0 +1,186 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss command line interface.
+
+Imports only what the CLI needs on every run; the grammar backend,
+TOML parser, and optional features are imported on first use, so
+that ``--help`` and runs answered from the caches start quickly.  The
+checking modules are imported only once no daemon answered the run.
+"""
+
+import sys
+
+from .daemon import forward
+
+
+def _query(conf):
+    """Print the locations of the identifiers matching ``conf.query``."""
+    from .index import HierarchyIndex
+
+    if conf.index is None:
+        print("--query requires --index.", file=sys.stderr)
+        return 1
+
+    try:
+        index = HierarchyIndex.load(conf.index)
+    except FileNotFoundError as error:
+        print(f"{error.strerror}: {error.filename}", file=sys.stderr)
+        return 1
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    status = 1
+    for identifier in index.find(**conf.query):
+        fn, line, col = identifier.location
+        print(f"{fn}:{line}:{col}: {identifier}")
+        status = 0
+
+    return status
+
+
+def _validate(conf):
+    """Report invalid segments, or any collisions, returning False if invalid."""
+    from .config import _collision_warnings
+
+    try:
+        frozen = conf.freeze()
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return False
+
+    for warning in _collision_warnings(frozen):
+        print(warning, file=sys.stderr)
+
+    return True
+
+
+def main(args=None):
+    """Validate the CSS class hierarchy of files.
+
+    Scans the files (or ``STDIN``) for class identifiers, printing a
+    diagnostic for each invalid identifier.  With ``--staged``, checks
+    only the lines changed by the changes staged in git.  With
+    ``--watch``, keeps re-checking the files as they change until
+    interrupted.  With ``--index``, writes a ``HierarchyIndex()`` of the
+    valid identifiers, or with ``--query`` also, prints matching
+    locations from an existing index instead of checking.  With
+    ``--stats``, prints a ``Stats()`` report of the check to ``STDERR``.
+    With ``--format``, writes the diagnostics as JSON Lines or a SARIF
+    log instead of text; errors and configuration diagnostics are always
+    printed to ``STDERR``.  With ``--serve``, runs the daemon until
+    interrupted; otherwise, the run is forwarded to a running daemon, if
+    any.
+
+    Returns
+    -------
+    int
+        Exit status:  0 if all identifiers are valid (or a query has
+        matches), 1 otherwise.
+    """
+    status = forward(args)
+    if status is not None:
+        return status
+
+    from .check import check_files
+    from .config import Config
+    from .parser import get_checker
+    from .reporters import REPORTERS
+    from .stats import Stats
+    from .stats import phase
+    from .suggest import Suggester
+
+    stats = Stats()
+    conf = Config()
+    with stats.phase("config"):
+        conf.load(args, stats)
+
+    if conf.query is not None:
+        return _query(conf)
+
+    if not _validate(conf):
+        return 1
+
+    reporter = REPORTERS.get(conf.format)
+    if reporter is None:
+        print(f"Unknown format {conf.format!r}.", file=sys.stderr)
+        return 1
+
+    if conf.serve:
+        from .daemon import Server
+
+        return Server(conf.socket).serve_forever()
+
+    if conf.watch:
+        from .watch import Watcher
+
+        return Watcher(args).run()
+
+    if conf.stats is None:
+        stats = None
+    else:
+        with stats.phase("compile"):
+            get_checker(conf)
+
+    suggester = Suggester(conf)
+    index = None
+    if conf.index:
+        from .index import HierarchyIndex
+
+        index = HierarchyIndex()
+    status = 0
+
+    resolver = None
+    if conf.discover:
+        from .resolve import ConfigResolver
+
+        resolver = ConfigResolver(conf, args)
+
+    if conf.staged:
+        from .staged import check_staged
+
+        try:
+            results = list(
+                check_staged(
+                    conf, None if conf.paths == ["-"] else conf.paths, resolver
+                )
+            )
+        except OSError as error:
+            print(error, file=sys.stderr)
+            return 1
+    elif conf.dedup and resolver is None:
+        from .dedup import check_files_unique
+
+        results = check_files_unique(conf.paths, conf, stats=stats)
+    else:
+        # Findings are only needed after reporting by the index.
+        results = check_files(
+            conf.paths, conf, stats=stats, resolver=resolver, stream=index is None
+        )
+
+    with reporter() as reporter:
+        for result in results:
+            with phase(stats, "report"):
+                if reporter.report(result, suggester):
+                    status = 1
+            if index is not None:
+                index.update(result.findings)
+
+    if index is not None:
+        index.save(conf.index)
+
+    if stats is not None:
+        print(stats.format(conf.stats), file=sys.stderr)
+
+    return status
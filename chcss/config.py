@@ -12,20 +12,29 @@
 
 """chcss configuration functions."""
 
-
 import argparse
 import json
 import os
 import re
 import sys
 import textwrap
+from typing import NamedTuple
 
-import toml
-
+from .cache import DEFAULT_CACHE_DIR
+from .cache import DEFAULT_CACHE_SIZE
+from .cache import ConfigCache
 from .data import HTML5_ELEMENTS
+from .index import QUERY_KEYS
+from .stats import phase
 
 # from .data import HTML5_ELEMENTS_OBSOLETE
 
+# Separator of the segments of an identifier.
+SEPARATOR = "-"
+
+# Segment vocabularies of a configuration, in identifier order.
+VOCABULARIES = ("namespaces", "functions", "components", "elements", "modifiers")
+
 
 class Config:
     """Class for accessing and loading chcss configuration options.
@@ -36,8 +45,9 @@ class Config:
 
     Attributes
     ----------
-    fn : string
-        Name of file to be checked; default is ``STDIN``.
+    paths : [string]
+        Files, directories, or glob patterns to be checked; default is
+        ``["-"]`` for ``STDIN``.
     config_file : string
         Configuration file path; default is ``pyproject.toml``.
     namespaces : [string]
@@ -50,34 +60,173 @@ class Config:
         List of project elements; default is the list of HTML5 elements.
     modifiers : [string]
         List of project modifiers; default is ``[]``.
+    backend : string
+        Matching engine, ``pyparsing`` or ``dfa``; default is
+        ``pyparsing``.
+    syntax : string
+        Syntax of the checked files, ``css`` or ``html``; default is
+        ``None``, to choose by file extension.
+    jobs : int
+        Number of files to check in parallel; default is ``None``, for
+        the number of CPUs.
+    cache : boolean
+        Use the result cache; default is ``True``.
+    cache_dir : string
+        Result cache directory; default is ``.chcss_cache``.
+    cache_size : int
+        Maximum size of the result cache in MiB; default is ``64``.
+    watch : boolean
+        Re-check files as they change; default is ``False``.
+    interval : float
+        Seconds between checks for changes in watch mode; default is
+        ``1.0``.
+    verdict_cache_size : int
+        Maximum number of identifier results memoized during a run;
+        default is ``65536``.  0 disables memoization.
+    index : string
+        Hierarchy index file to write, or to query with ``query``;
+        default is ``None``.
+    query : dict
+        Segments to find in the hierarchy index, by kind, instead of
+        checking files; default is ``None``.
+    stats : string
+        Report run statistics, as ``text`` or ``json``; default is
+        ``None``, not reported.
+    serve : boolean
+        Run the daemon, answering runs forwarded by the CLI; default
+        is ``False``.
+    socket : string
+        Unix domain socket of the daemon; default is ``None``, for
+        ``chcss.daemon.socket_path()``.
+    daemon : boolean
+        Forward runs to a running daemon; default is ``True``.
+    staged : boolean
+        Check only the lines changed by the changes staged in git,
+        limited to ``paths`` unless it is ``["-"]``; default is
+        ``False``.
+    format : string
+        Format of the diagnostics, ``text``, ``jsonl``, or ``sarif``;
+        default is ``text``.
+    discover : boolean
+        Check each file with the configuration of the nearest of its
+        directories with a configuration file, as resolved by
+        ``chcss.resolve.ConfigResolver()``; default is ``False``.
+    dedup : boolean
+        Validate each distinct class name once, reporting after all
+        files are scanned, as ``chcss.dedup.check_files_unique()``;
+        default is ``False``.
     """
 
     def __init__(
         self,
-        fn="",
+        paths=("-",),
         config_file="./pyproject.toml",
-        namespaces=[],
-        functions=[],
-        components=[],
+        namespaces=(),
+        functions=(),
+        components=(),
         elements=HTML5_ELEMENTS,
-        modifiers=[],
+        modifiers=(),
+        backend="pyparsing",
+        syntax=None,
+        jobs=None,
+        cache=True,
+        cache_dir=DEFAULT_CACHE_DIR,
+        cache_size=DEFAULT_CACHE_SIZE,
+        watch=False,
+        interval=1.0,
+        verdict_cache_size=65536,
+        index=None,
+        query=None,
+        stats=None,
+        serve=False,
+        socket=None,
+        daemon=True,
+        staged=False,
+        format="text",
+        discover=False,
+        dedup=False,
     ):
         """Create a ``Config()`` object.
 
-        Create a default ``Config()`` object.
+        Create a default ``Config()`` object.  The paths and segment
+        vocabularies are copied, so objects never share them.
 
         Returns
         -------
         object
             A Config() object.
         """
-        self.fn = fn
+        self.paths = list(paths)
         self.config_file = config_file
-        self.namespaces = namespaces
-        self.functions = functions
-        self.components = components
-        self.elements = elements
-        self.modifiers = modifiers
+        self.namespaces = list(namespaces)
+        self.functions = list(functions)
+        self.components = list(components)
+        self.elements = list(elements)
+        self.modifiers = list(modifiers)
+        self.backend = backend
+        self.syntax = syntax
+        self.jobs = jobs
+        self.cache = cache
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.watch = watch
+        self.interval = interval
+        self.verdict_cache_size = verdict_cache_size
+        self.index = index
+        self.query = query
+        self.stats = stats
+        self.serve = serve
+        self.socket = socket
+        self.daemon = daemon
+        self.staged = staged
+        self.format = format
+        self.discover = discover
+        self.dedup = dedup
+
+    def freeze(self):
+        """Get the frozen, precompiled form of the configuration.
+
+        Checks the segment vocabularies once, when the configuration
+        is built, rather than on every parse.
+
+        Returns
+        -------
+        FrozenConfig
+            The immutable, hashable view of the options that determine
+            results.
+
+        Raises
+        ------
+        ValueError
+            Raised if a segment is empty or contains the separator, so
+            could never match.
+        """
+        vocabularies = {}
+
+        for kind in VOCABULARIES:
+            words = frozenset(getattr(self, kind))
+            for word in words:
+                if not isinstance(word, str) or not word or SEPARATOR in word:
+                    raise ValueError(
+                        f"Invalid {kind[:-1]} {word!r}:  segments must be"
+                        f" non-empty strings without {SEPARATOR!r}."
+                    )
+            vocabularies[kind] = words
+
+        # Components are matched greedily, so a word that is also an
+        # element can only ever match as a component.  Segments are
+        # matched whole, so a word that is a prefix of another, such as
+        # component ``tab`` and element ``table``, does not collide.
+        collisions = vocabularies["components"] & vocabularies["elements"]
+        vocabularies["elements"] -= collisions
+
+        return FrozenConfig(
+            backend=self.backend,
+            verdict_cache_size=self.verdict_cache_size,
+            separator=SEPARATOR,
+            collisions=collisions,
+            **vocabularies,
+        )
 
     def __str__(self):
         """Stringify a ``Config()`` object.
@@ -117,13 +266,32 @@ class Config:
     def __repr__(self):
         """Representation of a ``Config()`` object."""
         return (
-            f'Config(fn="{self.fn}", '
+            f"Config(paths={self.paths}, "
             f'config_file="{self.config_file}", '
             f"namespaces={self.namespaces}, "
             f"functions={self.functions}, "
             f"components={self.components}, "
             f"elements={self.elements}, "
             f"modifiers={self.modifiers}, "
+            f'backend="{self.backend}", '
+            f"syntax={self.syntax!r}, "
+            f"jobs={self.jobs}, "
+            f"cache={self.cache}, "
+            f'cache_dir="{self.cache_dir}", '
+            f"cache_size={self.cache_size}, "
+            f"watch={self.watch}, "
+            f"interval={self.interval}, "
+            f"verdict_cache_size={self.verdict_cache_size}, "
+            f"index={self.index!r}, "
+            f"query={self.query}, "
+            f"stats={self.stats!r}, "
+            f"serve={self.serve}, "
+            f"socket={self.socket!r}, "
+            f"daemon={self.daemon}, "
+            f"staged={self.staged}, "
+            f'format="{self.format}", '
+            f"discover={self.discover}, "
+            f"dedup={self.dedup})"
         )
 
     def update(self, *args, **kwargs):  # dead:  disable
@@ -169,7 +337,7 @@ class Config:
 
     #     return True
 
-    def load(self, argv=None):
+    def load(self, argv=None, stats=None):
         """Load configuration options.
 
         Load configuration options from defaults (class constructor),
@@ -179,8 +347,21 @@ class Config:
         Unset values are explicitly ``None`` at each level.
 
         Handles any ``FileNotFound``, ``JSONDecodeError``, or
-        ``TomlDecodeError`` exceptions that arise during loading of
-        configuration file by ignoring the file.
+        ``TOMLDecodeError`` exceptions that arise during loading of
+        configuration file by ignoring the file, with a diagnostic
+        printed to ``STDERR``.
+
+        Unless ``--no-cache`` is given, the options of an unchanged
+        configuration file are read from a ``ConfigCache()`` in
+        ``--cache-dir`` (not any ``cache_dir`` set by the file).
+
+        Parameters
+        ----------
+        argv : [string] (optional)
+            CLI arguments; default is ``sys.argv``.
+        stats : Stats (optional)
+            Statistics to add the time of loading the configuration
+            file to, as the ``config-file`` phase.
         """
         # Parse the CLI options to make configuration file path available.
         args = _create_argument_parser().parse_args(argv)
@@ -189,24 +370,34 @@ class Config:
         if args.config_file is not None:
             self.config_file = args.config_file
 
+        # Configuration cache, unless disabled on the CLI.
+        cache_dir = None
+        if args.cache is not False:
+            cache_dir = args.cache_dir or DEFAULT_CACHE_DIR
+
         try:
-            self.update(**_load_file(self.config_file))
+            with phase(stats, "config-file"):
+                options = _load_cached(self.config_file, cache_dir)
+            self.update(**options)
         except (FileNotFoundError,):
             print(
                 f"Unable to find configuration file {self.config_file},"
-                " using defaults and CLI options."
+                " using defaults and CLI options.",
+                file=sys.stderr,
             )
         except (json.JSONDecodeError,):
             print(
                 f"Unable to parse configuration file {self.config_file}"
                 " (default package.json), using defaults and CLI options.\n"
-                "Ensure that file format matches extension."
+                "Ensure that file format matches extension.",
+                file=sys.stderr,
             )
-        except (toml.TomlDecodeError,):
+        except _toml()[1]:
             print(
                 f"Unable to parse configuration file {self.config_file}"
                 " (default pyproject.toml), using defaults and CLI options."
-                "  Ensure that file format matches extension."
+                "  Ensure that file format matches extension.",
+                file=sys.stderr,
             )
 
         self.update(**vars(args))
@@ -214,6 +405,75 @@ class Config:
         return
 
 
+class FrozenConfig(NamedTuple):
+    """Frozen, precompiled form of a ``Config()``.
+
+    Holds the options that determine results, with the segment
+    vocabularies as ``frozenset`` objects for constant time lookups
+    independent of order or duplicates.  It is immutable and hashable,
+    so engines and caches can key on it directly, and is accepted
+    wherever a ``Config()`` is read for these options.  Create it with
+    ``Config.freeze()``.
+
+    Attributes
+    ----------
+    backend : string
+        Matching engine.
+    namespaces : frozenset
+        Allowable namespace segments.
+    functions : frozenset
+        Allowable function segments.
+    components : frozenset
+        Allowable component segments.
+    elements : frozenset
+        Allowable element segments, without any that are also
+        components.
+    modifiers : frozenset
+        Allowable modifier segments.
+    verdict_cache_size : int
+        Maximum number of memoized identifier results.
+    separator : string
+        Separator of the segments of an identifier.
+    collisions : frozenset
+        Words that are both components and elements, which are only
+        matched as components.
+    """
+
+    backend: str
+    namespaces: frozenset
+    functions: frozenset
+    components: frozenset
+    elements: frozenset
+    modifiers: frozenset
+    verdict_cache_size: int = 65536
+    separator: str = SEPARATOR
+    collisions: frozenset = frozenset()
+
+    def freeze(self):
+        """Get the frozen configuration, which is this object."""
+        return self
+
+
+def _collision_warnings(frozen):
+    """Describe the words that are both components and elements.
+
+    Parameters
+    ----------
+    frozen : FrozenConfig
+        The frozen configuration.
+
+    Returns
+    -------
+    [string]
+        A warning for each word in ``frozen.collisions``, in order.
+    """
+    return [
+        f"Warning:  {word!r} is both a component and an element, so is only"
+        " matched as a component."
+        for word in sorted(frozen.collisions)
+    ]
+
+
 def _load_file(filename="./pyproject.toml"):
     """Load a configuration file, using the ``[tool.chcss]`` section.
 
@@ -239,7 +499,7 @@ def _load_file(filename="./pyproject.toml"):
     JSONDecodeError
         Raised if there are problems decoding a JSON configuration
         file.
-    TomlDecodeError
+    TOMLDecodeError
         Raised if there are problems decoding a TOML configuration
         file.
     FileNotFoundError
@@ -253,8 +513,6 @@ def _load_file(filename="./pyproject.toml"):
         try:
             # Default to ``./pyproject.toml``.
             options = _load_toml_file(filename)
-        except toml.TomlDecodeError:
-            raise
         except FileNotFoundError:
             try:
                 # Then try ``./package.json``.
@@ -263,6 +521,8 @@ def _load_file(filename="./pyproject.toml"):
                 raise
             except FileNotFoundError:
                 raise
+        except _toml()[1]:
+            raise
     elif jsonRE.match(filename):
         try:
             # Well, if JSON is supplied, use it.
@@ -275,10 +535,48 @@ def _load_file(filename="./pyproject.toml"):
         try:
             # Last chance, parse filename as TOML.
             options = _load_toml_file(filename)
-        except toml.TomlDecodeError:
-            raise
         except FileNotFoundError:
             raise
+        except _toml()[1]:
+            raise
+
+    return options
+
+
+def _sources(filename):
+    """Get the files options may be loaded from for a configuration file."""
+    if os.path.abspath(filename) == os.path.abspath("./pyproject.toml"):
+        return [filename, "./package.json"]
+
+    return [filename]
+
+
+def _load_cached(filename="./pyproject.toml", directory=DEFAULT_CACHE_DIR):
+    """Load a configuration file as ``_load_file()``, through a cache.
+
+    Parameters
+    ----------
+    filename : string (optional)
+        Configuration file to load.
+    directory : string (optional)
+        Directory of the ``ConfigCache()``; ``None`` disables caching.
+
+    Returns
+    -------
+    dict
+       Configuration option keys and values, with unset values
+       explicitly set to ``None``.
+    """
+    if directory is None:
+        return _load_file(filename)
+
+    cache = ConfigCache(directory)
+    sources = _sources(filename)
+    options = cache.get(filename, sources)
+
+    if options is None:
+        options = _load_file(filename)
+        cache.put(filename, sources, options)
 
     return options
 
@@ -316,23 +614,43 @@ def _load_json_file(filename="./package.json"):
         lines = error.doc.split("\n")
         print(
             f"In configuration file {filename},"
-            f" line {error.lineno}, column {error.colno}:"
+            f" line {error.lineno}, column {error.colno}:",
+            file=sys.stderr,
         )
-        print(lines[error.lineno - 1])
-        print(error.msg)
+        print(lines[error.lineno - 1], file=sys.stderr)
+        print(error.msg, file=sys.stderr)
         raise
     except FileNotFoundError as error:
-        print(f"{error.strerror}: {error.filename}")
+        print(f"{error.strerror}: {error.filename}", file=sys.stderr)
         raise
 
     empty_options = {
-        "fn": None,
+        "paths": None,
         "config_file": None,
         "namespaces": None,
         "functions": None,
         "components": None,
         "elements": None,
         "modifiers": None,
+        "backend": None,
+        "syntax": None,
+        "jobs": None,
+        "cache": None,
+        "cache_dir": None,
+        "cache_size": None,
+        "watch": None,
+        "interval": None,
+        "verdict_cache_size": None,
+        "index": None,
+        "query": None,
+        "stats": None,
+        "serve": None,
+        "socket": None,
+        "daemon": None,
+        "staged": None,
+        "format": None,
+        "discover": None,
+        "dedup": None,
     }
 
     for k, v in config["chcss"].items():
@@ -341,11 +659,34 @@ def _load_json_file(filename="./package.json"):
     return empty_options
 
 
+def _toml():
+    """Import the TOML parser.
+
+    Imported on first use, as runs reading cached options or a JSON
+    configuration file do not need it.
+
+    Returns
+    -------
+    (module, tuple)
+        The standard library ``tomllib`` where available (Python 3.11
+        and later), otherwise ``toml``, and the exceptions it raises
+        for invalid TOML.
+    """
+    try:
+        import tomllib
+    except ModuleNotFoundError:  # Python < 3.11.
+        import toml
+
+        return toml, (toml.TomlDecodeError,)
+
+    return tomllib, (tomllib.TOMLDecodeError,)
+
+
 def _load_toml_file(filename="./pyproject.toml"):
     """Load a toml configuration file.
 
     Load a ``pyproject.toml`` configuration file, returning the
-    ``[tool.chcss]`` section.
+    ``[tool.chcss]`` section.  Uses the TOML parser of ``_toml()``.
 
     Parameters
     ----------
@@ -360,7 +701,7 @@ def _load_toml_file(filename="./pyproject.toml"):
 
     Raises
     ------
-    TomlDecodeError
+    TOMLDecodeError
         Raised if there are problems decoding a TOML configuration
         file.
     FileNotFoundError
@@ -368,30 +709,59 @@ def _load_toml_file(filename="./pyproject.toml"):
         readable.
     """
     try:
-        with open(filename, "r") as file:
-            config = toml.load(file)
-    except toml.TomlDecodeError as error:
-        lines = error.doc.split("\n")
-        print(
-            f"In configuration file {filename},"
-            f" line {error.lineno}, column {error.colno}:"
-        )
-        print(lines[error.lineno - 1])
-        print(error.msg)
-        raise
+        with open(filename, "r", encoding="utf-8") as file:
+            text = file.read()
     except FileNotFoundError as error:
-        print(f"{error.strerror}: {error.filename}")
-        print("trying package.json...")
+        print(f"{error.strerror}: {error.filename}", file=sys.stderr)
+        print("trying package.json...", file=sys.stderr)
+        raise
+
+    parser, errors = _toml()
+
+    try:
+        config = parser.loads(text)
+    except errors as error:
+        if getattr(error, "doc", None) is not None:
+            lines = error.doc.split("\n")
+            print(
+                f"In configuration file {filename},"
+                f" line {error.lineno}, column {error.colno}:",
+                file=sys.stderr,
+            )
+            print(lines[error.lineno - 1], file=sys.stderr)
+            print(error.msg, file=sys.stderr)
+        else:
+            print(f"In configuration file {filename}:", file=sys.stderr)
+            print(error, file=sys.stderr)
         raise
 
     empty_options = {
-        "fn": None,
+        "paths": None,
         "config_file": None,
         "namespaces": None,
         "functions": None,
         "components": None,
         "elements": None,
         "modifiers": None,
+        "backend": None,
+        "syntax": None,
+        "jobs": None,
+        "cache": None,
+        "cache_dir": None,
+        "cache_size": None,
+        "watch": None,
+        "interval": None,
+        "verdict_cache_size": None,
+        "index": None,
+        "query": None,
+        "stats": None,
+        "serve": None,
+        "socket": None,
+        "daemon": None,
+        "staged": None,
+        "format": None,
+        "discover": None,
+        "dedup": None,
     }
 
     for k, v in config["tool"]["chcss"].items():
@@ -426,11 +796,13 @@ to redistribute it under certain conditions; type ``chcss
     )
 
     parser.add_argument(
-        dest="fn",
+        dest="paths",
         type=str,
-        default="-",
-        nargs="?",
-        help="Name of file to be checked.",
+        default=["-"],
+        nargs="*",
+        metavar="path",
+        help="Files, directories, or glob patterns to be checked.  Default"
+        " is - for STDIN.",
     )
 
     parser.add_argument(
@@ -470,6 +842,181 @@ to redistribute it under certain conditions; type ``chcss
         " element segment of the identifier.  Default is the HTML5 tag list.",
     )
 
+    parser.add_argument(
+        "-b",
+        "--backend",
+        dest="backend",
+        default=None,
+        choices=["pyparsing", "dfa"],
+        help="Matching engine for identifiers.  Default is pyparsing.",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--syntax",
+        dest="syntax",
+        default=None,
+        choices=["css", "html"],
+        help="Syntax of the checked file.  Default is html for HTML and"
+        " template extensions, css otherwise (including STDIN).",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        default=None,
+        type=int,
+        help="Number of files to check in parallel.  Default is the number of CPUs.",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        default=None,
+        action="store_false",
+        help="Check all files and parse the configuration file, ignoring and"
+        " not updating the result and configuration caches.",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        default=None,
+        type=str,
+        help="Result and configuration cache directory.  Default is"
+        f" {DEFAULT_CACHE_DIR}.",
+    )
+
+    parser.add_argument(
+        "--cache-size",
+        dest="cache_size",
+        default=None,
+        type=int,
+        help="Maximum size of the result cache in MiB.  Default is"
+        f" {DEFAULT_CACHE_SIZE}.",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--watch",
+        dest="watch",
+        default=None,
+        action="store_true",
+        help="Re-check files as they or the configuration file change.",
+    )
+
+    parser.add_argument(
+        "--interval",
+        dest="interval",
+        default=None,
+        type=float,
+        help="Seconds between checks for changes in watch mode.  Default is 1.",
+    )
+
+    parser.add_argument(
+        "--verdict-cache-size",
+        dest="verdict_cache_size",
+        default=None,
+        type=int,
+        help="Maximum number of identifier results memoized during a run."
+        "  Default is 65536; 0 disables memoization.",
+    )
+
+    parser.add_argument(
+        "--index",
+        dest="index",
+        default=None,
+        type=str,
+        help="Write an index of the valid identifiers found to this file,"
+        " or read it with --query.",
+    )
+
+    parser.add_argument(
+        "--query",
+        dest="query",
+        default=None,
+        type=_query_handler,
+        help="Print the locations of the identifiers in the --index file"
+        " matching a comma delimited list of kind=segment pairs, such as"
+        " namespace=gf_news,component=navbar, instead of checking files.",
+    )
+
+    parser.add_argument(
+        "--stats",
+        dest="stats",
+        nargs="?",
+        const="text",
+        default=None,
+        choices=["text", "json"],
+        help="Print timings of each phase, counts of files and names, and"
+        " cache hit rates to STDERR, as text (the default) or JSON.",
+    )
+
+    parser.add_argument(
+        "--serve",
+        dest="serve",
+        default=None,
+        action="store_true",
+        help="Run a daemon answering runs of chcss over a Unix domain socket,"
+        " keeping configurations, validators, and results in memory.",
+    )
+
+    parser.add_argument(
+        "--socket",
+        dest="socket",
+        default=None,
+        type=str,
+        help="Unix domain socket of the daemon.  Default is chcss-UID.sock in"
+        " $XDG_RUNTIME_DIR, or daemon.sock in a private chcss-UID directory"
+        " in $TMPDIR or /tmp.",
+    )
+
+    parser.add_argument(
+        "--no-daemon",
+        dest="daemon",
+        default=None,
+        action="store_false",
+        help="Check in this process, even if a daemon is running.",
+    )
+
+    parser.add_argument(
+        "--staged",
+        dest="staged",
+        default=None,
+        action="store_true",
+        help="Check only the lines added or changed by the changes staged in"
+        " git, in the staged files, or those of them under the given paths.",
+    )
+
+    parser.add_argument(
+        "--format",
+        dest="format",
+        default=None,
+        choices=["text", "jsonl", "sarif"],
+        help="Format of the diagnostics:  text lines, JSON Lines, or a SARIF"
+        " log.  Default is text.",
+    )
+
+    parser.add_argument(
+        "--discover",
+        dest="discover",
+        default=None,
+        action="store_true",
+        help="Check each file with the configuration file of its nearest"
+        " directory with one:  a pyproject.toml with a [tool.chcss] section or"
+        " a package.json with a chcss entry.  CLI options still apply.",
+    )
+
+    parser.add_argument(
+        "--dedup",
+        dest="dedup",
+        default=None,
+        action="store_true",
+        help="Scan all files first, then validate each distinct class name"
+        " once and report.  Ignored with --staged and --discover.",
+    )
+
     return parser
 
 
@@ -513,3 +1060,19 @@ def _field_list_handler(s):
         return []
     else:
         return [item.strip() for item in s.split(",")]
+
+
+def _query_handler(s):
+    query = {}
+
+    for item in _field_list_handler(s):
+        kind, sep, segment = item.partition("=")
+        kind = kind.strip()
+        if not sep or kind not in QUERY_KEYS:
+            raise argparse.ArgumentTypeError(
+                f"invalid query term {item!r}; use kind=segment with kind one of"
+                f" {', '.join(QUERY_KEYS)}"
+            )
+        query[kind] = segment.strip()
+
+    return query
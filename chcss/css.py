@@ -0,0 +1,360 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""chcss CSS stylesheet scanner."""
+
+import io
+import mmap
+import os
+import re
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MMAP_THRESHOLD = 4 * 1024 * 1024
+
+# At-rules whose blocks contain rules rather than declarations.
+GROUP_RULES = frozenset(
+    (
+        "container",
+        "document",
+        "-moz-document",
+        "layer",
+        "media",
+        "scope",
+        "starting-style",
+        "supports",
+    )
+)
+
+# Only the tokens that matter for finding class selectors; everything
+# else is skipped by the search.  Comments, strings, and unquoted
+# ``url()`` tokens may be unterminated at the end of a chunk.
+_TOKEN_PATTERN = r"""
+    (?P<comment>/\*(?:[^*]|\*(?!/))*(?:\*/)?)
+    | (?P<string>"(?:[^"\\\n]|\\[\s\S])*"?|'(?:[^'\\\n]|\\[\s\S])*'?)
+    | (?P<url>url\((?!\s*["'])[^)]*\)?)
+    | (?P<open>\{)
+    | (?P<close>\})
+    | (?P<semicolon>;)
+    | @(?P<at>-?[-\w]+)
+    | \.(?P<cls>
+        (?:--|-?(?:[_a-zA-Z]|[^\x00-\x7f]|\\[^\n0-9a-fA-F\r\f]|\\[0-9a-fA-F]{1,6}\s?))
+        (?:[-\w]|[^\x00-\x7f]|\\[^\n0-9a-fA-F\r\f]|\\[0-9a-fA-F]{1,6}\s?)*
+      )
+    """
+
+_TOKENS = re.compile(_TOKEN_PATTERN, re.VERBOSE | re.IGNORECASE)
+_BINARY_TOKENS = re.compile(_TOKEN_PATTERN.encode(), re.VERBOSE | re.IGNORECASE)
+
+# Characters that cannot be inside a class selector, marking a safe
+# place to split the input.
+_DELIMITERS = (" ", "\n", "\t", "\r", "\f", "{", "}", ";")
+
+_ESCAPE = re.compile(r"\\(?:([0-9a-fA-F]{1,6})\s?|([^\n]))")
+
+
+def _unescape(name):
+    """Resolve CSS escapes in an identifier."""
+    if "\\" not in name:
+        return name
+
+    return _ESCAPE.sub(
+        lambda m: chr(int(m.group(1), 16)) if m.group(1) else m.group(2),
+        name,
+    )
+
+
+def _newlines(buffer, newline, start, end):
+    """Count the newlines in a slice of a buffer without copying it.
+
+    Returns
+    -------
+    (int, int)
+        The number of newlines and the position of the last one.
+    """
+    count = 0
+    last = -1
+    pos = buffer.find(newline, start, end)
+
+    while pos != -1:
+        count += 1
+        last = pos
+        pos = buffer.find(newline, pos + 1, end)
+
+    return count, last
+
+
+class CSSScanner:
+    """Incremental CSS class selector scanner.
+
+    Consumes a stylesheet in chunks of any size and produces the class
+    selectors from the preludes of style rules, including style rules
+    nested in conditional group at-rules such as ``@media``.
+    Comments, strings, ``url()`` tokens, declaration blocks, at-rule
+    preludes, and the blocks of other at-rules (``@font-face``,
+    ``@keyframes``, ...) are skipped.
+
+    Only the unfinished tail of the previous chunk is retained between
+    calls to ``feed()``, so memory use is bounded by the chunk size
+    and the longest token rather than the size of the stylesheet.
+
+    A binary scanner consumes UTF-8 encoded bytes instead of strings
+    and decodes only the class selectors it produces, and the text of
+    each line up to them to count its column in code points, so that
+    both scanners produce the same columns.
+
+    Attributes
+    ----------
+    line : int
+        Line number of the start of the retained input.
+    binary : boolean
+        True if the scanner consumes bytes.
+    """
+
+    def __init__(self, binary=False):
+        """Create a ``CSSScanner()`` object.
+
+        Parameters
+        ----------
+        binary : boolean (optional)
+            True to scan bytes-like input; default is False.
+        """
+        self.line = 1
+        self.binary = binary
+        self._line_start = 0
+        self._columns = (0, 0)
+        self._base = 0
+        self._skip = 0
+        self._at_rule = None
+
+        if binary:
+            self._buffer = b""
+            self._tokens = _BINARY_TOKENS
+            self._newline = b"\n"
+            self._delimiters = tuple(d.encode() for d in _DELIMITERS)
+            self._comment_end = b"*/"
+            self._url_end = b")"
+        else:
+            self._buffer = ""
+            self._tokens = _TOKENS
+            self._newline = "\n"
+            self._delimiters = _DELIMITERS
+            self._comment_end = "*/"
+            self._url_end = ")"
+
+    def feed(self, data, final=False):
+        """Scan the next chunk of a stylesheet.
+
+        Parameters
+        ----------
+        data : string or bytes
+            The next chunk of the stylesheet.
+        final : boolean (optional)
+            True if ``data`` is the last chunk.
+
+        Returns
+        -------
+        [(string, int, int)]
+            Class selectors completed by ``data``, with their line and
+            column numbers.
+        """
+        return list(self._scan(self._buffer + data, final))
+
+    def scan(self, buffer):
+        """Scan a complete stylesheet in place.
+
+        The buffer is searched directly rather than copied, so a
+        binary scanner may be given a ``mmap`` of a file.
+
+        Parameters
+        ----------
+        buffer : string or bytes-like
+            The whole stylesheet, or its remainder if chunks have not
+            been fed.
+
+        Returns
+        -------
+        [(string, int, int)]
+            Class selectors in ``buffer``, with their line and column
+            numbers.
+        """
+        if self._buffer:
+            raise ValueError("Cannot scan a buffer after a partial feed.")
+
+        return list(self._scan(buffer, True))
+
+    def _column(self, buffer, base, pos):
+        """Count the code points of the current line before a position.
+
+        Counting resumes from the previous position on the same line,
+        so each byte of a long line is decoded once.
+        """
+        offset, count = self._columns
+        if offset < self._line_start:
+            offset, count = self._line_start, 0
+
+        count += len(
+            bytes(buffer[offset - base : pos - base]).decode("utf-8", "replace")
+        )
+        self._columns = (pos, count)
+
+        return count
+
+    def _scan(self, buffer, final):
+        """Scan a buffer lazily, retaining any unfinished tail."""
+        base = self._base
+        newline = self._newline
+
+        if final:
+            end = len(buffer)
+        else:
+            end = max(buffer.rfind(d) for d in self._delimiters) + 1
+
+        counted = 0
+        carry = end
+
+        for m in self._tokens.finditer(buffer, 0, end):
+            kind = m.lastgroup
+
+            if not final and m.end() == end:
+                # Only an escape in an identifier can swallow the
+                # whitespace delimiter at the split point.
+                token = m.group()
+                if (
+                    kind == "cls"
+                    or (kind == "comment" and not token.endswith(self._comment_end))
+                    or (kind == "string" and (len(token) < 2 or token[-1] != token[0]))
+                    or (kind == "url" and not token.endswith(self._url_end))
+                ):
+                    carry = m.start()
+                    break
+
+            if self._skip:
+                if kind == "open":
+                    self._skip += 1
+                elif kind == "close":
+                    self._skip -= 1
+            elif kind == "cls":
+                if self._at_rule is None:
+                    start = m.start()
+                    count, last = _newlines(buffer, newline, counted, start)
+                    if count:
+                        self.line += count
+                        self._line_start = base + last + 1
+                    counted = start
+
+                    name = m.group(kind)
+                    if self.binary:
+                        name = name.decode("utf-8", "replace")
+
+                    if self.binary:
+                        col = self._column(buffer, base, base + start) + 1
+                    else:
+                        col = base + start - self._line_start + 1
+
+                    yield _unescape(name), self.line, col
+            elif kind == "at":
+                at_rule = m.group(kind).lower()
+                if self.binary:
+                    at_rule = at_rule.decode("utf-8", "replace")
+                self._at_rule = at_rule
+            elif kind == "open":
+                if self._at_rule not in GROUP_RULES:
+                    self._skip = 1
+                self._at_rule = None
+            elif kind in ("close", "semicolon"):
+                self._at_rule = None
+
+        count, last = _newlines(buffer, newline, counted, carry)
+        if count:
+            self.line += count
+            self._line_start = base + last + 1
+
+        if self.binary:
+            # The retained tail starts at a delimiter or token, never
+            # within a character, and the rest is discarded.
+            self._column(buffer, base, base + carry)
+
+        self._buffer = buffer[carry:]
+        self._base = base + carry
+
+
+def scan_css(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Scan a CSS stylesheet stream for class selectors.
+
+    Parameters
+    ----------
+    stream : file
+        A text or binary stream of the stylesheet.
+    chunk_size : int (optional)
+        Number of characters (or bytes) to read at a time.
+
+    Yields
+    ------
+    (string, int, int)
+        Each class selector, with its line and column numbers.
+    """
+    scanner = CSSScanner(binary=not isinstance(stream, io.TextIOBase))
+
+    while True:
+        chunk = stream.read(chunk_size)
+        yield from scanner.feed(chunk, final=not chunk)
+
+        if not chunk:
+            return
+
+
+def scan_css_file(
+    fn, chunk_size=DEFAULT_CHUNK_SIZE, mmap_threshold=DEFAULT_MMAP_THRESHOLD, wrap=None
+):
+    """Scan a CSS stylesheet file for class selectors.
+
+    Files of at least ``mmap_threshold`` bytes, such as minified
+    bundles that are a single multi-megabyte line, are memory mapped
+    and scanned in place, decoding only the class selectors found.
+    Smaller files are read as text in chunks.
+
+    Parameters
+    ----------
+    fn : string
+        Name of the stylesheet file.
+    chunk_size : int (optional)
+        Number of characters to read at a time from smaller files.
+    mmap_threshold : int (optional)
+        Minimum size in bytes of a file to memory map; ``None``
+        disables memory mapping.
+    wrap : callable (optional)
+        Called with the text stream of a file that is read rather
+        than mapped, returning the stream to scan, such as to time its
+        reads; default is to scan the stream itself.
+
+    Yields
+    ------
+    (string, int, int)
+        Each class selector, with its line and column numbers.
+
+    Raises
+    ------
+    FileNotFoundError
+        Raised if the file does not exist or is not readable.
+    """
+    with open(fn, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+
+        if mmap_threshold is not None and 0 < mmap_threshold <= size:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                # Scanned lazily, so that the names are never all held.
+                yield from CSSScanner(binary=True)._scan(buffer, True)
+        else:
+            stream = io.TextIOWrapper(file, encoding="utf-8", errors="replace")
+            if wrap is not None:
+                stream = wrap(stream)
+            yield from scan_css(stream, chunk_size)
@@ -0,0 +1,357 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss daemon and its client.
+
+The daemon answers runs of the CLI forwarded over a Unix domain
+socket, so that they do not pay for starting Python, compiling the
+validator, or loading the configuration and results again.  One
+request is answered at a time.
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import stat
+import sys
+
+# Bump when requests or responses change.
+PROTOCOL = 2
+
+_BUFFER_SIZE = 64 * 1024
+
+# Seconds to wait on the peer before giving up on a connection.
+TIMEOUT = 60.0
+
+
+def socket_path():
+    """Get the default socket of the daemon.
+
+    Returns
+    -------
+    string
+        ``chcss-UID.sock`` in ``$XDG_RUNTIME_DIR``, or else
+        ``daemon.sock`` in a ``chcss-UID`` directory, private to the
+        user, in ``$TMPDIR`` or ``/tmp``, so that each user has their
+        own daemon and no other user can take its place.
+    """
+    uid = os.getuid()
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, f"chcss-{uid}.sock")
+
+    directory = os.environ.get("TMPDIR") or "/tmp"
+
+    return os.path.join(directory, f"chcss-{uid}", "daemon.sock")
+
+
+def _trusted(path):
+    """Check that a socket belongs to this user and is private to them."""
+    try:
+        status = os.lstat(path)
+    except OSError:
+        return False
+
+    return (
+        stat.S_ISSOCK(status.st_mode)
+        and status.st_uid == os.getuid()
+        and not status.st_mode & 0o077
+    )
+
+
+def _peer_trusted(connection):
+    """Check that the peer of a connection runs as this user, if known."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+
+    import struct
+
+    credentials = connection.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _, uid, _ = struct.unpack("3i", credentials)
+
+    return uid == os.getuid()
+
+
+def _receive(connection):
+    """Read a JSON message until the peer shuts down writing."""
+    chunks = []
+
+    while True:
+        chunk = connection.recv(_BUFFER_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+
+    return json.loads(b"".join(chunks))
+
+
+def _send(connection, message):
+    """Write a JSON message and shut down writing."""
+    connection.sendall(json.dumps(message).encode("utf-8"))
+    connection.shutdown(socket.SHUT_WR)
+
+
+class Server:
+    """Daemon answering forwarded runs of the CLI.
+
+    Each request holds the arguments, working directory, ``STDIN``, and
+    git environment variables of a run, which is answered by
+    ``main()`` in this process with its output captured, and never
+    forwarded again.  Validators and their verdict caches are kept by
+    ``get_checker()`` for each configuration, and configuration
+    options and results are kept in memory by the caches, so a run
+    repeating an earlier one reads nothing but the checked files.
+    Files are checked in this process, unless a run sets ``--jobs``.
+
+    The socket is only accessible by the user running the daemon.
+    A client that sends nothing for ``timeout`` seconds is dropped, so
+    it cannot hold up the runs waiting behind it.
+
+    Attributes
+    ----------
+    path : string
+        The socket of the daemon.
+    timeout : float
+        Seconds to wait on a client.
+    """
+
+    def __init__(self, path=None, timeout=None):
+        """Create a ``Server()`` object.
+
+        Parameters
+        ----------
+        path : string (optional)
+            The socket of the daemon; default is ``socket_path()``.
+        timeout : float (optional)
+            Seconds to wait on a client; default is ``TIMEOUT``.
+        """
+        self.path = path or socket_path()
+        self.timeout = TIMEOUT if timeout is None else timeout
+
+    def _bind(self):
+        """Bind the socket, replacing one left by a daemon that died."""
+        with socket.socket(socket.AF_UNIX) as probe:
+            try:
+                probe.connect(self.path)
+            except OSError:
+                pass
+            else:
+                message = f"A daemon is already listening on {self.path}."
+                raise FileExistsError(message)
+
+        # Create the private directory of the default socket, and never
+        # use a directory created by another user.
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        status = os.lstat(directory)
+        owned = status.st_uid in (os.getuid(), 0)
+        if not stat.S_ISDIR(status.st_mode) or not owned:
+            raise PermissionError(f"{directory} does not belong to this user.")
+
+        # Only ever remove a socket, never a file given by mistake.
+        with contextlib.suppress(FileNotFoundError):
+            if stat.S_ISSOCK(os.stat(self.path).st_mode):
+                os.remove(self.path)
+
+        listener = socket.socket(socket.AF_UNIX)
+        umask = os.umask(0o177)
+        try:
+            listener.bind(self.path)
+        finally:
+            os.umask(umask)
+        listener.listen()
+
+        return listener
+
+    def handle(self, request):
+        """Answer a forwarded run.
+
+        Parameters
+        ----------
+        request : dict
+            The ``args``, ``cwd``, ``stdin``, and git environment
+            variables (``env``) of the run.
+
+        Returns
+        -------
+        dict
+            The exit ``status`` of the run and its ``stdout`` and
+            ``stderr``, or an ``error`` if the request cannot be
+            answered.
+        """
+        from .cli import main
+
+        if request.get("protocol") != PROTOCOL:
+            return {"error": f"Unsupported protocol {request.get('protocol')}."}
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        stdin = sys.stdin
+        cwd = os.getcwd()
+        environ = dict(os.environ)
+
+        try:
+            os.chdir(request["cwd"])
+            sys.stdin = io.StringIO(request.get("stdin") or "")
+            # Git variables select the repository and index, as in hooks.
+            for name in [name for name in os.environ if name.startswith("GIT_")]:
+                del os.environ[name]
+            os.environ.update(request.get("env") or {})
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    status = main(["--no-daemon", "--jobs", "1", *request["args"]])
+                except SystemExit as error:
+                    status = error.code if isinstance(error.code, int) else 1
+        except Exception as error:
+            # The client runs the request itself, reporting any error.
+            return {"error": repr(error)}
+        finally:
+            sys.stdin = stdin
+            os.chdir(cwd)
+            os.environ.clear()
+            os.environ.update(environ)
+
+        return {
+            "status": status,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    def serve_forever(self):
+        """Answer forwarded runs until interrupted.
+
+        Returns
+        -------
+        int
+            Exit status:  0 when interrupted, 1 if another daemon is
+            listening on the socket.
+        """
+        from .cache import keep_in_memory
+
+        try:
+            listener = self._bind()
+        except OSError as error:
+            print(error, file=sys.stderr)
+            return 1
+
+        keep_in_memory()
+        print(f"Listening on {self.path}.", flush=True)
+
+        try:
+            with listener:
+                while True:
+                    connection, _ = listener.accept()
+                    with connection:
+                        connection.settimeout(self.timeout)
+                        try:
+                            response = self.handle(_receive(connection))
+                        except ValueError as error:
+                            response = {"error": f"Invalid request: {error}"}
+                        except OSError:
+                            # Timed out or reset; there is no one to answer.
+                            continue
+                        with contextlib.suppress(OSError):
+                            _send(connection, response)
+        except KeyboardInterrupt:
+            return 0
+        finally:
+            keep_in_memory(0)
+            with contextlib.suppress(OSError):
+                os.remove(self.path)
+
+
+def forward(argv=None):
+    """Run the CLI in a running daemon, if any.
+
+    Runs with ``--serve``, ``--watch``, or ``--no-daemon`` are not
+    forwarded.  As the daemon is looked for before the configuration
+    file is read, only ``--socket`` on the command line selects it.
+    Runs are only forwarded to a socket owned by this user, accessible
+    only by them, and, where the peer can be identified, served by a
+    process of theirs, so another user cannot receive them or decide
+    their outcome.  A daemon that does not answer within ``TIMEOUT``
+    seconds is treated as no daemon.
+
+    Parameters
+    ----------
+    argv : [string] (optional)
+        CLI arguments; default is ``sys.argv``.
+
+    Returns
+    -------
+    int
+        Exit status of the run, with its output printed, or ``None`` if
+        no daemon answered and the run is left to this process.
+    """
+    from .config import _create_argument_parser
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    args = _create_argument_parser().parse_args(argv)
+    if args.serve or args.watch or args.daemon is False:
+        return None
+
+    try:
+        connection = socket.socket(socket.AF_UNIX)
+    except OSError:
+        return None
+
+    path = args.socket or socket_path()
+    if not _trusted(path):
+        connection.close()
+        return None
+
+    with connection:
+        connection.settimeout(TIMEOUT)
+        try:
+            connection.connect(path)
+            if not _peer_trusted(connection):
+                return None
+        except OSError:
+            return None
+
+        stdin = None
+        if "-" in args.paths and args.query is None:
+            stdin = sys.stdin.read()
+        request = {
+            "protocol": PROTOCOL,
+            "args": sys.argv[1:] if argv is None else list(argv),
+            "cwd": os.getcwd(),
+            "stdin": stdin,
+            "env": {
+                name: value
+                for name, value in os.environ.items()
+                if name.startswith("GIT_")
+            },
+        }
+
+        try:
+            _send(connection, request)
+            response = _receive(connection)
+        except (OSError, ValueError):
+            response = {}
+
+    if "status" not in response:
+        if stdin is not None:
+            sys.stdin = io.StringIO(stdin)
+        return None
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+
+    return response["status"]
@@ -12,6 +12,20 @@
 
 """chcss element data."""
 
+# Extensions of files scanned as HTML or HTML templates.
+HTML_EXTENSIONS = frozenset(
+    (
+        ".djhtml",
+        ".htm",
+        ".html",
+        ".j2",
+        ".jinja",
+        ".jinja2",
+        ".njk",
+        ".xhtml",
+    )
+)
+
 # https://developer.mozilla.org/en-US/docs/Web/HTML/Element
 HTML5_ELEMENTS = [
     "html",
@@ -0,0 +1,331 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss deduplicated checking of many files."""
+
+import array
+import os
+
+from .cache import ResultCache
+from .check import _names
+from .check import _syntax
+from .check import expand_paths
+from .parser import get_checker
+from .result import FileResult
+from .result import Finding
+from .stats import phase
+
+# Configuration and cache of a worker process, set once by
+# ``_init_worker()``.
+_worker_config = None
+_worker_cache = None
+
+
+class OccurrenceTable:
+    """Unique class names and their occurrences.
+
+    Each distinct name is stored once, with its occurrences as a flat
+    ``array`` of file number, ordinal within the file, line, and
+    column quadruples, and file names are stored once, so that the
+    names of a whole tree can be validated once each and the results
+    fanned back out to every occurrence, in file order, by
+    ``results()``.
+
+    Attributes
+    ----------
+    files : [string]
+        Names of the scanned files, by file number.
+    names : [string]
+        The distinct class names, in order of first occurrence.
+    errors : dict
+        Reasons the files that could not be scanned failed, by file
+        number.
+    """
+
+    def __init__(self):
+        """Create an empty ``OccurrenceTable()`` object."""
+        self.files = []
+        self.names = []
+        self.errors = {}
+        self._name_numbers = {}
+        self._occurrences = []
+        self._counts = array.array("I")
+
+    def __len__(self):
+        """Get the number of occurrences."""
+        return sum(self._counts)
+
+    def _name_number(self, name):
+        try:
+            return self._name_numbers[name]
+        except KeyError:
+            number = self._name_numbers[name] = len(self.names)
+            self.names.append(name)
+            self._occurrences.append(array.array("I"))
+            return number
+
+    def add(self, fn, names=(), error=None):
+        """Add the class names of a file to the table.
+
+        Parameters
+        ----------
+        fn : string
+            Name of the file.
+        names : iterable (optional)
+            Each class name of the file, with its line and column
+            numbers, in order.
+        error : string (optional)
+            Reason the file could not be scanned.
+
+        Returns
+        -------
+        int
+            The file number.
+        """
+        number = len(self.files)
+        self.files.append(fn)
+        if error is not None:
+            self.errors[number] = error
+
+        count = 0
+        for count, (name, line, col) in enumerate(names, 1):
+            self._occurrences[self._name_number(name)].extend(
+                (number, count - 1, line, col)
+            )
+        self._counts.append(count)
+
+        return number
+
+    def update(self, other):
+        """Add the files of another table, such as that of a worker.
+
+        Parameters
+        ----------
+        other : OccurrenceTable
+            The table to add, after the files of this one.
+        """
+        offset = len(self.files)
+        self.files.extend(other.files)
+        self._counts.extend(other._counts)
+        self.errors.update((offset + k, v) for k, v in other.errors.items())
+
+        for name, occurrences in zip(other.names, other._occurrences):
+            if offset:
+                occurrences = array.array("I", occurrences)
+                occurrences[0::4] = array.array(
+                    "I", (number + offset for number in occurrences[0::4])
+                )
+            self._occurrences[self._name_number(name)].extend(occurrences)
+
+    def occurrences(self, name):
+        """Get the occurrences of a class name.
+
+        Parameters
+        ----------
+        name : string
+            The class name.
+
+        Yields
+        ------
+        (string, int, int)
+            The file name, line, and column of each occurrence, in
+            file order.
+        """
+        number = self._name_numbers.get(name)
+        if number is None:
+            return
+
+        occurrences = self._occurrences[number]
+        for i in range(0, len(occurrences), 4):
+            yield self.files[occurrences[i]], occurrences[i + 2], occurrences[i + 3]
+
+    def results(self, verdicts):
+        """Fan the results of the distinct names out to their files.
+
+        Parameters
+        ----------
+        verdicts : [ClassNameResult]
+            The result of each name of ``names``, in order.
+
+        Returns
+        -------
+        [FileResult]
+            The result of each file, by file number.
+        """
+        findings = [[None] * count for count in self._counts]
+        files = self.files
+
+        for verdict, occurrences in zip(verdicts, self._occurrences):
+            for i in range(0, len(occurrences), 4):
+                number = occurrences[i]
+                findings[number][occurrences[i + 1]] = Finding(
+                    files[number], occurrences[i + 2], occurrences[i + 3], verdict
+                )
+
+        return [
+            FileResult(fn, tuple(file_findings), self.errors.get(number))
+            for number, (fn, file_findings) in enumerate(zip(files, findings))
+        ]
+
+
+def _scan(fn, config, cache=None):
+    """Scan a file into a table, or get its cached result.
+
+    Returns
+    -------
+    (OccurrenceTable, string) or FileResult
+        The table of the file and its cache key, or its cached result.
+    """
+    table = OccurrenceTable()
+    key = None
+
+    try:
+        if cache is not None and fn != "-":
+            key = cache.key(fn, _syntax(fn, config))
+            result = cache.get(fn, key)
+            if result is not None:
+                return result
+        table.add(fn, _names(fn, config))
+    except OSError as error:
+        table = OccurrenceTable()
+        table.add(fn, error=f"{error.strerror}: {error.filename}")
+
+    return table, key
+
+
+def _validate(names, config):
+    """Validate a batch of distinct class names."""
+    return list(map(get_checker(config).check, names))
+
+
+def _init_worker(config, cache):
+    """Initialize a worker process with its configuration."""
+    global _worker_config, _worker_cache
+
+    _worker_config = config
+    _worker_cache = cache
+
+
+def _scan_worker(fn):
+    """Scan a file in a worker process."""
+    return _scan(fn, _worker_config, _worker_cache)
+
+
+def _validate_worker(names):
+    """Validate a batch of distinct class names in a worker process."""
+    return _validate(names, _worker_config)
+
+
+def _batches(items, count):
+    """Split a list into at most ``count`` contiguous batches."""
+    size = max(1, -(-len(items) // count))
+
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def check_files_unique(paths, config, jobs=None, stats=None):
+    """Check files, validating each distinct class name once.
+
+    Checks the same files as ``check_files()``, with the same results,
+    in three stages:  every file is scanned into an
+    ``OccurrenceTable()`` of the distinct class names and their
+    occurrences, each distinct name is validated once, and the results
+    are fanned back out to the occurrences.  Across a large tree, most
+    occurrences repeat a few thousand names, so this validates a small
+    fraction of them, but no result is produced until every file is
+    scanned and the results of all files are held in memory.
+
+    Files are scanned, and names validated, in a pool of worker
+    processes.  Cached results are used, and new ones stored, as by
+    ``check_files()``.
+
+    Parameters
+    ----------
+    paths : [string]
+        Files, directories, or glob patterns to be checked.
+    config : Config
+        The configuration providing the syntax, backend, and segment
+        vocabularies.
+    jobs : int (optional)
+        Number of worker processes; default is ``config.jobs`` or the
+        number of CPUs.  One checks the files in this process.
+    stats : Stats (optional)
+        Statistics to add the ``extract`` (including reading) and
+        ``validate`` timings of the stages, and the file and name
+        counts, to; default is none collected.
+
+    Yields
+    ------
+    FileResult
+        The results for each file, in the order of
+        ``expand_paths(paths)``.
+    """
+    files = expand_paths(paths)
+    jobs = jobs or config.jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(files))
+    cache = ResultCache(config) if config.cache else None
+    executor = None
+
+    if jobs > 1 and "-" not in files:
+        import concurrent.futures
+
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(config, cache)
+        )
+
+    try:
+        with phase(stats, "extract"):
+            if executor is None:
+                scanned = [_scan(fn, config, cache) for fn in files]
+            else:
+                chunksize = max(1, len(files) // (jobs * 4))
+                scanned = list(executor.map(_scan_worker, files, chunksize=chunksize))
+
+            # Merge the tables of the files, keeping only their cache
+            # keys.
+            table = OccurrenceTable()
+            for i, item in enumerate(scanned):
+                if not isinstance(item, FileResult):
+                    table.update(item[0])
+                    scanned[i] = (None, item[1])
+
+        with phase(stats, "validate"):
+            if executor is None:
+                verdicts = _validate(table.names, config)
+            else:
+                verdicts = [
+                    verdict
+                    for batch in executor.map(
+                        _validate_worker, _batches(table.names, jobs * 4)
+                    )
+                    for verdict in batch
+                ]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    results = iter(table.results(verdicts))
+
+    for item in scanned:
+        if isinstance(item, FileResult):
+            result = item
+        else:
+            result = next(results)
+            if item[1] is not None:
+                cache.put(item[1], result)
+        if stats is not None:
+            stats.count_result(result)
+        yield result
+
+    if cache is not None:
+        cache.prune()
@@ -0,0 +1,172 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""chcss segment DFA matching engine."""
+
+from .result import ClassNameResult
+from .result import Identifier
+
+# DFA states, named for the segment expected next.
+_NAMESPACE = 0
+_FUNCTION = 1
+_COMPONENT = 2
+_COMPONENT_OR_ELEMENT = 3
+_MODIFIER = 4
+
+_ACCEPTING = frozenset((_COMPONENT, _COMPONENT_OR_ELEMENT, _MODIFIER))
+
+
+def _alternatives(words):
+    """Describe the words a segment may be, for failure messages."""
+    return " | ".join(repr(w) for w in sorted(words)) or "nothing"
+
+
+class DFAValidator:
+    """Segment DFA CSS class identifier validator.
+
+    Compiles the segment vocabularies into a deterministic finite
+    automaton over the hyphen separated segments of an identifier,
+    with one transition table per state mapping a segment to the next
+    state.  Matching a name is a split and one dictionary lookup per
+    segment, with no backtracking.
+
+    Accepts the same language as the reference pyparsing grammar in
+    ``Validator()``, including its greedy matching of components:  a
+    segment that is both a component and an element is always taken
+    as a component.  Failures are reported as the grammar reports
+    them, at the same location and with the same message:  the
+    namespace or function alternatives expected, or ``Expected end
+    of text`` at the end of the longest valid identifier the name
+    starts with.
+
+    Attributes
+    ----------
+    transitions : tuple
+        Transition tables, indexed by state, mapping a segment to a
+        tuple of the segment kind and the next state.
+    """
+
+    def __init__(self, namespaces, functions, components, elements, modifiers):
+        """Compile the segment DFA.
+
+        Parameters
+        ----------
+        namespaces : [string]
+            Allowable namespace segments.
+        functions : [string]
+            Allowable function segments.
+        components : [string]
+            Allowable component segments.
+        elements : [string]
+            Allowable element segments.
+        modifiers : [string]
+            Allowable modifier segments.
+        """
+        component_or_element = {w: ("element", _MODIFIER) for w in elements}
+        component_or_element.update(
+            {w: ("component", _COMPONENT_OR_ELEMENT) for w in components}
+        )
+
+        self._expected = (_alternatives(namespaces), _alternatives(functions))
+        self.transitions = (
+            {w: ("namespace", _FUNCTION) for w in namespaces},
+            {w: ("function", _COMPONENT) for w in functions},
+            {w: ("component", _COMPONENT_OR_ELEMENT) for w in components},
+            component_or_element,
+            {w: ("modifier", _MODIFIER) for w in modifiers},
+        )
+
+    def parse(self, name):
+        """Parse a CSS class identifier.
+
+        Parameters
+        ----------
+        name : string
+            The identifier to be parsed.
+
+        Returns
+        -------
+        [string]
+            The segments of ``name``.
+
+        Raises
+        ------
+        ParseException
+            Indicate a ``name`` that is not parseable in the current
+            configuration.
+        """
+        result = self.check(name)
+
+        if not result.valid:
+            from pyparsing import ParseException
+
+            raise ParseException(name, result.loc, result.msg)
+
+        return list(result.identifier.segments)
+
+    def _failure(self, name, state, loc):
+        """Describe a failure at the segment starting at ``loc``."""
+        if state in _ACCEPTING:
+            # The name starts with a valid identifier, ending before
+            # the separator of the segment.
+            return ClassNameResult(name, False, loc=loc - 1, msg="Expected end of text")
+
+        return ClassNameResult(
+            name, False, loc=loc, msg=f"Expected {self._expected[state]}"
+        )
+
+    def check(self, name):
+        """Check a CSS class identifier.
+
+        Parameters
+        ----------
+        name : string
+            The identifier to be checked.
+
+        Returns
+        -------
+        ClassNameResult
+            The parsed ``name``, or the position and reason of the
+            failure.
+        """
+        transitions = self.transitions
+        state = _NAMESPACE
+        loc = 0
+        components = 0
+        segments = name.split("-")
+
+        for segment in segments:
+            try:
+                kind, state = transitions[state][segment]
+                if kind == "component":
+                    components += 1
+            except KeyError:
+                return self._failure(name, state, loc)
+            loc += len(segment) + 1
+
+        if state not in _ACCEPTING:
+            # Only a namespace.
+            return ClassNameResult(name, False, loc=len(name), msg="Expected '-'")
+
+        end = 2 + components
+
+        return ClassNameResult(
+            name,
+            True,
+            Identifier(
+                segments[0],
+                segments[1],
+                tuple(segments[2:end]),
+                segments[end] if len(segments) > end else None,
+                tuple(segments[end + 1 :]),
+            ),
+        )
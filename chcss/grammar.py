@@ -0,0 +1,152 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss pyparsing backend."""
+
+import re
+
+import pyparsing as pp
+
+from .dfa import _alternatives
+from .result import ClassNameResult
+from .result import Identifier
+
+
+def _segment(words):
+    """Match one of the words as a whole segment.
+
+    Each word must end at a separator or the end of the name, as
+    pyparsing does not backtrack into an alternative that matched a
+    prefix of a longer segment, such as component ``tab`` in
+    ``gf_news-c-tab-table``.
+    """
+    if not words:
+        return pp.NoMatch().set_name(_alternatives(words))
+
+    pattern = "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+    return pp.Regex(f"(?:{pattern})(?![^-])").set_name(_alternatives(words))
+
+
+class Validator:
+    """Compiled CSS class identifier validator.
+
+    Holds the identifier grammar compiled from a set of segment
+    vocabularies so that it can be reused for every name checked
+    against the same configuration.  Use ``get_validator()`` to obtain
+    a cached instance for a ``Config()``.
+
+    namespace-function((-component)+(-element(-modifier)*)?)?
+
+    BNF for Identifier::
+
+        namespace:: ( 'user defined word' )
+        function:: ( 'user defined function' )
+        component:: ( 'user defined component' )
+        element:: ( 'HTML element' )
+        modifier:: ( 'user defined modifier' )
+        identifier:: namespace-function((-component)+(-element(-modifier)*)?)?
+
+    Attributes
+    ----------
+    identifier : pyparsing.ParserElement
+        The compiled identifier grammar.
+    """
+
+    def __init__(self, namespaces, functions, components, elements, modifiers):
+        """Compile the identifier grammar.
+
+        Parameters
+        ----------
+        namespaces : [string]
+            Allowable namespace segments.
+        functions : [string]
+            Allowable function segments.
+        components : [string]
+            Allowable component segments.
+        elements : [string]
+            Allowable element segments.
+        modifiers : [string]
+            Allowable modifier segments.
+        """
+        namespace = _segment(namespaces)("namespace")
+        function = _segment(functions)("function")
+        component = _segment(components).set_results_name(
+            "components", list_all_matches=True
+        )
+        element = _segment(elements)("element")
+        modifier = _segment(modifiers).set_results_name(
+            "modifiers", list_all_matches=True
+        )
+
+        self.identifier = pp.Group(
+            namespace
+            + "-"
+            + function
+            + pp.Optional(
+                pp.OneOrMore("-" + component)
+                + pp.Optional("-" + element + pp.ZeroOrMore("-" + modifier))
+            )
+        ).leave_whitespace()
+
+    def parse(self, name):
+        """Parse a CSS class identifier.
+
+        Parameters
+        ----------
+        name : string
+            The identifier to be parsed.
+
+        Returns
+        -------
+        pyparsing.ParseResults
+            Data returned from parsing.
+
+        Raises
+        ------
+        ParseException
+            Indicate a ``name`` that is not parseable in the current
+            configuration.
+        """
+        return self.identifier.parse_string(name, parse_all=True)
+
+    def check(self, name):
+        """Check a CSS class identifier.
+
+        Parameters
+        ----------
+        name : string
+            The identifier to be checked.
+
+        Returns
+        -------
+        ClassNameResult
+            The parsed ``name``, or the position and reason of the
+            failure.
+        """
+        try:
+            tokens = self.identifier.parse_string(name, parse_all=True)[0]
+        except pp.ParseException as error:
+            return ClassNameResult(name, False, loc=error.loc, msg=error.msg)
+
+        return ClassNameResult(
+            name,
+            True,
+            Identifier(
+                tokens["namespace"],
+                tokens["function"],
+                tuple(tokens.get("components", ())),
+                tokens.get("element"),
+                tuple(tokens.get("modifiers", ())),
+            ),
+        )
@@ -0,0 +1,331 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""chcss class hierarchy index."""
+
+import array
+import json
+import sys
+
+from .result import Identifier
+
+# Bump when the stored format changes.
+INDEX_FORMAT = 2
+
+QUERY_KEYS = ("namespace", "function", "component", "element", "modifier")
+
+
+class _Node:
+    """A segment in the hierarchy, with the occurrences ending there."""
+
+    __slots__ = ("children", "occurrences")
+
+    def __init__(self):
+        self.children = {}
+        self.occurrences = None
+
+
+class HierarchyIndex:
+    """Index of identifier occurrences by hierarchy.
+
+    Occurrences are stored in a tree of the segments of the
+    identifier grammar, namespace, then function, then components,
+    element, and modifiers, so that all occurrences under a prefix of
+    the hierarchy share the nodes of that prefix.  Each node is keyed
+    by the kind and interned text of its segment, and holds the
+    locations of the identifiers ending there as a flat ``array`` of
+    file number, line, and column triples, with file names stored
+    once.
+
+    Attributes
+    ----------
+    files : [string]
+        Names of the indexed files, by file number.
+    """
+
+    def __init__(self):
+        """Create an empty ``HierarchyIndex()`` object."""
+        self.files = []
+        self._file_numbers = {}
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self):
+        """Get the number of indexed occurrences."""
+        return self._size
+
+    def add(self, identifier):
+        """Add an identifier occurrence to the index.
+
+        Parameters
+        ----------
+        identifier : Identifier
+            The parsed identifier, with its location.
+        """
+        fn, line, col = identifier.location
+
+        try:
+            number = self._file_numbers[fn]
+        except KeyError:
+            number = self._file_numbers[fn] = len(self.files)
+            self.files.append(fn)
+
+        node = self._root
+        for key in _keys(identifier):
+            try:
+                node = node.children[key]
+            except KeyError:
+                child = node.children[(key[0], sys.intern(key[1]))] = _Node()
+                node = child
+
+        if node.occurrences is None:
+            node.occurrences = array.array("I")
+        node.occurrences.extend((number, line, col))
+        self._size += 1
+
+    def update(self, findings):
+        """Add the valid identifiers of findings to the index.
+
+        Parameters
+        ----------
+        findings : iterable
+            ``Finding()`` objects; invalid ones are ignored.
+        """
+        for finding in findings:
+            if finding.result.valid:
+                self.add(finding.identifier)
+
+    def find(
+        self,
+        namespace=None,
+        function=None,
+        component=None,
+        element=None,
+        modifier=None,
+    ):
+        """Find identifier occurrences by segment.
+
+        Each argument that is not ``None`` must match:  ``component``
+        and ``modifier`` match any of the components or modifiers of
+        an identifier.
+
+        Parameters
+        ----------
+        namespace : string (optional)
+            Namespace segment to match.
+        function : string (optional)
+            Function segment to match.
+        component : string (optional)
+            Component segment to match.
+        element : string (optional)
+            Element segment to match.
+        modifier : string (optional)
+            Modifier segment to match.
+
+        Yields
+        ------
+        Identifier
+            Each matching occurrence, with its location.
+        """
+        wanted = {
+            kind: value
+            for kind, value in zip(
+                QUERY_KEYS, (namespace, function, component, element, modifier)
+            )
+            if value is not None
+        }
+
+        yield from self._find(self._root, [], wanted, len(wanted) == 0)
+
+    def _find(self, node, path, wanted, matched):
+        if matched and node.occurrences is not None:
+            identifier = _identifier(path)
+            files = self.files
+            occurrences = node.occurrences
+            for i in range(0, len(occurrences), 3):
+                yield identifier._replace(
+                    location=(
+                        files[occurrences[i]],
+                        occurrences[i + 1],
+                        occurrences[i + 2],
+                    )
+                )
+
+        for key, child in node.children.items():
+            kind, segment = key
+            if kind in wanted and not matched:
+                if wanted[kind] == segment:
+                    rest = {k: v for k, v in wanted.items() if k != kind}
+                    path.append(key)
+                    yield from self._find(child, path, rest, not rest)
+                    path.pop()
+                    continue
+                if kind in ("namespace", "function", "element"):
+                    continue
+
+            path.append(key)
+            yield from self._find(child, path, wanted, matched)
+            path.pop()
+
+    def save(self, fn):
+        """Write the index to a file.
+
+        The index is written as JSON data:  the file names, and the
+        tree as nested lists of the occurrences and children of each
+        node, with each child keyed by the position of its kind in
+        ``QUERY_KEYS`` and its segment.
+
+        Parameters
+        ----------
+        fn : string
+            Name of the index file.
+        """
+        with open(fn, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "format": INDEX_FORMAT,
+                    "files": self.files,
+                    "root": _dump(self._root),
+                },
+                file,
+                separators=(",", ":"),
+            )
+
+    @classmethod
+    def load(cls, fn):
+        """Read an index written by ``save()``.
+
+        The file is read as data and validated, so an index from an
+        untrusted source can be queried safely.
+
+        Parameters
+        ----------
+        fn : string
+            Name of the index file.
+
+        Returns
+        -------
+        HierarchyIndex
+            The index.
+
+        Raises
+        ------
+        ValueError
+            Raised if the file is not a chcss index of this format.
+        FileNotFoundError
+            Raised if the file does not exist or is not readable.
+        """
+        with open(fn, "r", encoding="utf-8", errors="replace") as file:
+            try:
+                data = json.load(file)
+            except (ValueError, RecursionError) as error:
+                raise ValueError(f"{fn} is not a chcss index.") from error
+
+        if not isinstance(data, dict) or data.get("format") != INDEX_FORMAT:
+            raise ValueError(f"{fn} is not a chcss index of format {INDEX_FORMAT}.")
+
+        index = cls()
+
+        try:
+            files = data["files"]
+            if not all(isinstance(name, str) for name in files):
+                raise TypeError("File names must be strings.")
+            index.files = list(files)
+            index._root = _load(data["root"], len(files))
+        except (
+            KeyError,
+            IndexError,
+            TypeError,
+            ValueError,
+            OverflowError,
+            RecursionError,
+        ) as error:
+            raise ValueError(f"{fn} is not a valid chcss index.") from error
+
+        index._file_numbers = {fn: i for i, fn in enumerate(index.files)}
+        index._size = sum(len(node.occurrences) // 3 for node in _nodes(index._root))
+
+        return index
+
+
+def _dump(node):
+    """Convert a tree node to nested lists."""
+    return [
+        list(node.occurrences or ()),
+        [
+            [QUERY_KEYS.index(kind), segment, _dump(child)]
+            for (kind, segment), child in node.children.items()
+        ],
+    ]
+
+
+def _load(data, files):
+    """Rebuild a tree node from nested lists, validating them."""
+    occurrences, children = data
+    node = _Node()
+
+    if occurrences:
+        node.occurrences = array.array("I", occurrences)
+        if len(node.occurrences) % 3 or max(node.occurrences[0::3]) >= files:
+            raise ValueError("Invalid occurrences.")
+
+    for kind, segment, child in children:
+        if type(kind) is not int or not 0 <= kind < len(QUERY_KEYS):
+            raise ValueError(f"Invalid segment kind {kind!r}.")
+        node.children[(QUERY_KEYS[kind], sys.intern(segment))] = _load(child, files)
+
+    return node
+
+
+def _nodes(node):
+    """Get the nodes of a tree, with occurrences."""
+    stack = [node]
+
+    while stack:
+        node = stack.pop()
+        stack.extend(node.children.values())
+        if node.occurrences is not None:
+            yield node
+
+
+def _keys(identifier):
+    """Get the tree keys of the segments of an identifier."""
+    yield ("namespace", identifier.namespace)
+    yield ("function", identifier.function)
+
+    for component in identifier.components:
+        yield ("component", component)
+
+    if identifier.element is not None:
+        yield ("element", identifier.element)
+
+    for modifier in identifier.modifiers:
+        yield ("modifier", modifier)
+
+
+def _identifier(path):
+    """Rebuild an ``Identifier()`` from a tree path."""
+    segments = {"component": [], "modifier": []}
+
+    for kind, segment in path:
+        if kind in segments:
+            segments[kind].append(segment)
+        else:
+            segments[kind] = segment
+
+    return Identifier(
+        segments["namespace"],
+        segments["function"],
+        tuple(segments["component"]),
+        segments.get("element"),
+        tuple(segments["modifier"]),
+    )
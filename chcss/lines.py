@@ -0,0 +1,99 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss line index."""
+
+import bisect
+
+
+class LineIndex:
+    """Index of the line starts of a text, for locating positions.
+
+    Built in one pass over a whole text, or over chunks as they are
+    read, and queried by bisection, so that locating each of many
+    positions takes logarithmic time instead of counting newlines
+    from the start of the text again.  Columns count code points.
+
+    Attributes
+    ----------
+    starts : [int]
+        Position of the start of each line, the first line first.
+    line : int
+        Line number of the first line.
+    column : int
+        Column number of the start of the first line.
+    """
+
+    def __init__(self, data=None, line=1, column=1):
+        """Create a ``LineIndex()`` object.
+
+        Parameters
+        ----------
+        data : string (optional)
+            The text, or its first chunk, to index.
+        line : int (optional)
+            Line number of the first line, for a text starting within
+            a larger one; default is 1.
+        column : int (optional)
+            Column number of the start of the text; default is 1.
+        """
+        self.starts = [0]
+        self.line = line
+        self.column = column
+        self._size = 0
+
+        if data is not None:
+            self.feed(data)
+
+    def __len__(self):
+        """Get the number of lines indexed."""
+        return len(self.starts)
+
+    def feed(self, data):
+        """Index the next chunk of the text.
+
+        Parameters
+        ----------
+        data : string
+            The next chunk, positions in which follow those of the
+            previous chunks.
+        """
+        starts = self.starts
+        base = self._size
+        pos = data.find("\n")
+
+        while pos != -1:
+            starts.append(base + pos + 1)
+            pos = data.find("\n", pos + 1)
+
+        self._size = base + len(data)
+
+    def locate(self, pos):
+        """Get the line and column numbers of a position.
+
+        Parameters
+        ----------
+        pos : int
+            Position in the text, counting from 0.
+
+        Returns
+        -------
+        (int, int)
+            The line and column numbers of ``pos``.
+        """
+        i = bisect.bisect_right(self.starts, pos) - 1
+
+        if i == 0:
+            return self.line, self.column + pos
+
+        return self.line + i, pos - self.starts[i] + 1
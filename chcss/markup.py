@@ -0,0 +1,166 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""chcss HTML and template class attribute scanner."""
+
+import re
+from html.parser import HTMLParser
+
+from .css import DEFAULT_CHUNK_SIZE
+from .lines import LineIndex
+
+# Jinja/Django statements and comments render to nothing or select
+# between literal text, so they separate class tokens; expressions
+# produce text, so a token touching one is dynamic.
+_TEMPLATE_TAGS = re.compile(r"\{%.*?%\}|\{#.*?#\}|(\{\{.*?\}\})", re.DOTALL)
+_TEMPLATE_OPEN = re.compile(r"\{[%#{]|\{\Z")
+_DYNAMIC = "\x1a"
+_MAX_TEMPLATE_TAG = 64 * 1024
+
+# Tag name and attributes of a start tag, as matched by ``HTMLParser``.
+_TAG_NAME = re.compile(r"<[a-zA-Z][^\t\n\r\f />\x00]*")
+_ATTRIBUTE = re.compile(
+    r"""((?<=['"\s/])[^\s/>][^\s/=>]*)"""
+    r"""(\s*=+\s*('[^']*'|"[^"]*"|(?!['"])[^>\s]*))?(?:\s|/(?!>))*"""
+)
+_TOKEN = re.compile(r"\S+")
+
+
+def _mask(match):
+    """Blank a template tag, keeping its length and newlines."""
+    fill = _DYNAMIC if match.group(1) else " "
+
+    return "".join(c if c == "\n" else fill for c in match.group())
+
+
+class HTMLClassScanner(HTMLParser):
+    """Incremental HTML class attribute scanner.
+
+    Consumes HTML, or Jinja/Django HTML templates, in chunks of any
+    size and produces the tokens of ``class`` attributes with their
+    line and column numbers.  Built on the incremental feed model of
+    ``html.parser.HTMLParser``, which retains only unfinished markup
+    between calls to ``feed()``.
+
+    Template tags are blanked before parsing, with their lengths and
+    newlines kept, so they may appear anywhere, including inside
+    quoted attribute values.  Tokens built from template expressions,
+    such as ``btn-{{ size }}``, cannot be checked and are skipped.
+    """
+
+    def __init__(self):
+        """Create a ``HTMLClassScanner()`` object."""
+        super().__init__(convert_charrefs=True)
+        self._pending = ""
+        self._found = []
+
+    def feed(self, data, final=False):
+        """Scan the next chunk of a document.
+
+        Parameters
+        ----------
+        data : string
+            The next chunk of the document.
+        final : boolean (optional)
+            True if ``data`` is the last chunk.
+
+        Returns
+        -------
+        [(string, int, int)]
+            Class tokens completed by ``data``, with their line and
+            column numbers.
+        """
+        data = self._pending + data
+        parts = []
+        pos = 0
+
+        for m in _TEMPLATE_TAGS.finditer(data):
+            parts.append(data[pos : m.start()])
+            parts.append(_mask(m))
+            pos = m.end()
+
+        end = len(data)
+
+        if not final:
+            # Hold back a template tag that may continue in the next
+            # chunk, unless it is too long to be one.
+            tail = _TEMPLATE_OPEN.search(data, pos)
+            if tail and end - tail.start() <= _MAX_TEMPLATE_TAG:
+                end = tail.start()
+
+        parts.append(data[pos:end])
+        self._pending = data[end:]
+        super().feed("".join(parts))
+
+        if final:
+            self.close()
+
+        found = self._found
+        self._found = []
+
+        return found
+
+    def handle_starttag(self, tag, attrs):
+        """Collect the tokens of a ``class`` attribute."""
+        if not any(name.strip(_DYNAMIC) == "class" for name, value in attrs):
+            return
+
+        line, offset = self.getpos()
+        text = self.get_starttag_text()
+        tag_name = _TAG_NAME.match(text)
+        index = None
+
+        for m in _ATTRIBUTE.finditer(text, tag_name.end()):
+            if m.group(1).strip(_DYNAMIC).lower() != "class" or not m.group(3):
+                continue
+
+            start = m.start(3)
+            value = m.group(3)
+            if value[:1] in ("'", '"'):
+                value = value[1:-1]
+                start += 1
+
+            for token in _TOKEN.finditer(value):
+                if _DYNAMIC in token.group():
+                    continue
+
+                if index is None:
+                    index = LineIndex(text, line, offset + 1)
+                self._found.append(
+                    (token.group(), *index.locate(start + token.start()))
+                )
+
+
+def scan_html(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Scan an HTML document or template stream for class tokens.
+
+    Parameters
+    ----------
+    stream : file
+        A text stream of the document.
+    chunk_size : int (optional)
+        Number of characters to read at a time.
+
+    Yields
+    ------
+    (string, int, int)
+        Each ``class`` attribute token, with its line and column
+        numbers.
+    """
+    scanner = HTMLClassScanner()
+
+    while True:
+        chunk = stream.read(chunk_size)
+        yield from scanner.feed(chunk, final=not chunk)
+
+        if not chunk:
+            return
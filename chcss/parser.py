@@ -12,94 +12,248 @@
 
 """chcss parser functions and classes."""
 
-import pyparsing as pp
+import collections
+import functools
+import importlib
+import sys
 
 from .config import Config
 
+# Modules and names of the validator classes, by backend name.
+# Backends are imported on first use, so that runs which do not
+# validate, such as those answered from the result cache, do not
+# import pyparsing.
+BACKENDS = {
+    "pyparsing": ("grammar", "Validator"),
+    "dfa": ("dfa", "DFAValidator"),
+}
 
-def parse_class_name(name):
-    """Parse a CSS class identifier.
 
-    Parse a CSS class identifier for generation of the CSS class
-    identifier hierarchy.
+@functools.lru_cache(maxsize=32)
+def _compile_validator(backend, namespaces, functions, components, elements, modifiers):
+    """Compile and cache a validator for a backend and vocabularies."""
+    module, name = BACKENDS[backend]
+    validator = getattr(importlib.import_module(f".{module}", __package__), name)
+
+    return validator(
+        *(
+            tuple(sorted(words))
+            for words in (namespaces, functions, components, elements, modifiers)
+        )
+    )
 
-    namespace-function((-component)+(-element(-modifier)*)?)?
 
-    BNF for Identifier::
+def get_validator(config):
+    """Get the compiled validator for a configuration.
 
-        namespace:: ( 'user defined word' )
-        function:: ( 'user defined function' )
-        component:: ( 'user defined component' )
-        element:: ( 'HTML element' )
-        modifier:: ( 'user defined modifier' )
-        identifier:: namespace-function((-component)+(-element(-modifier)*)?)?
+    Validators are cached by backend and the contents of the
+    configuration's segment vocabularies, as frozen by
+    ``Config.freeze()``, so configurations with the same vocabularies
+    in any order share a single compiled grammar.
 
     Parameters
     ----------
-    name : string
-        The identifier to be parsed.
+    config : Config or FrozenConfig
+        The configuration providing the backend and the segment
+        vocabularies.
 
     Returns
     -------
-    dict
-        Data returned from parsing.
+    Validator or DFAValidator
+        The compiled validator.
 
     Raises
     ------
-    ParseException
-        Indicate a ``name`` that is not parseable in the current
-        configuration.
+    ValueError
+        Indicate an unknown backend or an invalid segment.
     """
-    # Basic temporary configuration.
-    namespaces = [
-        "gf_accounts",
-        "gf_blog",
-        "gf_content",
-        "gf_news",
-    ]
-    functions = [
-        "c",
-        "l",
-    ]
-    components = [
-        "navbar",
-        "footer",
-        "list",
-    ]
-    elements = [
-        "a",
-        "ul",
-        "li",
-    ]
-    modifiers = [
-        "reverse",
-    ]
-
-    namespace = pp.oneOf(namespaces)
-    function = pp.oneOf(functions)
-    component = pp.oneOf(components)
-    element = pp.oneOf(elements)
-    modifier = pp.oneOf(modifiers)
-
-    identifier = pp.Group(
-        namespace
-        + "-"
-        + function
-        + pp.Optional(
-            pp.OneOrMore("-" + component)
-            + pp.Optional("-" + element + pp.ZeroOrMore("-" + modifier))
-        )
+    if config.backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {config.backend}.")
+
+    frozen = config.freeze()
+
+    return _compile_validator(
+        frozen.backend,
+        frozen.namespaces,
+        frozen.functions,
+        frozen.components,
+        frozen.elements,
+        frozen.modifiers,
     )
 
+
+class VerdictCache:
+    """Bounded LRU memo of validator results.
+
+    Sits in front of a compiled validator so that a name seen before
+    costs a dictionary lookup instead of a parse.  A ``VerdictCache()``
+    belongs to a single validator, so its entries are keyed by name
+    and the identity of the compiled configuration.  Use
+    ``get_checker()`` to obtain the shared instance for a ``Config()``.
+
+    A ``VerdictCache()`` may be shared by threads, as by
+    ``check_files_async()``; the counters are then approximate.
+
+    Attributes
+    ----------
+    validator : Validator or DFAValidator
+        The validator whose results are cached.
+    maxsize : int
+        Maximum number of cached results.
+    hits : int
+        Number of results served from the cache.
+    misses : int
+        Number of results computed by the validator.
+    """
+
+    def __init__(self, validator, maxsize):
+        """Create a ``VerdictCache()`` object.
+
+        Parameters
+        ----------
+        validator : Validator or DFAValidator
+            The validator whose results are cached.
+        maxsize : int
+            Maximum number of cached results.
+        """
+        self.validator = validator
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = collections.OrderedDict()
+
+    def __len__(self):
+        """Get the number of cached results."""
+        return len(self._results)
+
+    def check(self, name):
+        """Check a CSS class identifier, using a cached result if any.
+
+        Parameters
+        ----------
+        name : string
+            The identifier to be checked.
+
+        Returns
+        -------
+        ClassNameResult
+            The result for ``name``.
+        """
+        results = self._results
+
+        try:
+            result = results[name]
+        except KeyError:
+            self.misses += 1
+            result = results[name] = self.validator.check(name)
+            if len(results) > self.maxsize:
+                try:
+                    results.popitem(last=False)
+                except KeyError:
+                    # Emptied by another thread.
+                    pass
+            return result
+
+        self.hits += 1
+        try:
+            results.move_to_end(name)
+        except KeyError:
+            # Evicted by another thread.
+            pass
+
+        return result
+
+    def clear(self):
+        """Discard all cached results and reset the counters."""
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+@functools.lru_cache(maxsize=32)
+def _verdict_cache(validator, maxsize):
+    """Create and cache the ``VerdictCache()`` of a validator."""
+    return VerdictCache(validator, maxsize)
+
+
+def get_checker(config):
+    """Get the memoized validator for a configuration.
+
+    Parameters
+    ----------
+    config : Config or FrozenConfig
+        The configuration providing the backend, the segment
+        vocabularies, and the verdict cache size.
+
+    Returns
+    -------
+    VerdictCache, Validator, or DFAValidator
+        The shared ``VerdictCache()`` of the compiled validator, or
+        the validator itself if ``config.verdict_cache_size`` is 0.
+    """
+    validator = get_validator(config)
+
+    if not config.verdict_cache_size:
+        return validator
+
+    return _verdict_cache(validator, config.verdict_cache_size)
+
+
+def parse_class_name(name, config=None):
+    """Parse a CSS class identifier.
+
+    Parse a CSS class identifier for generation of the CSS class
+    identifier hierarchy, using the grammar compiled from the segment
+    vocabularies of ``config``.  The parse, or the parse error, is
+    printed to ``STDERR``.
+
+    Parameters
+    ----------
+    name : string
+        The identifier to be parsed.
+    config : Config (optional)
+        The configuration providing the backend and the segment
+        vocabularies; default is ``Config()``.
+
+    Returns
+    -------
+    boolean
+        True if ``name`` is a valid identifier, False otherwise.
+    """
+    if config is None:
+        config = Config()
+
+    from pyparsing import ParseException
+
     try:
-        print(name, identifier.parseString(name, parseAll=True))
+        print(name, get_validator(config).parse(name), file=sys.stderr)
         return True
-    except pp.ParseException as error:
-        print(error)
+    except ParseException as error:
+        print(error, file=sys.stderr)
         return False
 
 
-def main(args=None):
-    """Validate the CSS class hierarchy of a file."""
-    conf = Config()
-    conf.load(args)
+def parse_class_names(names, config=None):
+    """Check an iterable of CSS class identifiers.
+
+    The memoized validator is obtained once for the whole batch and
+    nothing is printed; the caller decides what to do with each
+    result.
+
+    Parameters
+    ----------
+    names : iterable
+        The identifiers to be checked; may be a generator.
+    config : Config (optional)
+        The configuration providing the backend and the segment
+        vocabularies; default is ``Config()``.
+
+    Yields
+    ------
+    ClassNameResult
+        The result for each identifier, in order.
+    """
+    if config is None:
+        config = Config()
+
+    yield from map(get_checker(config).check, names)
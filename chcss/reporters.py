@@ -0,0 +1,280 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss reporters.
+
+A reporter writes the diagnostics of each file result as it is
+checked, so that no report is held in memory, whatever the number of
+findings.
+"""
+
+import abc
+import json
+import os
+import sys
+
+# SARIF rule of each kind of diagnostic.
+_RULES = (
+    {
+        "id": "invalid-identifier",
+        "shortDescription": {
+            "text": "Class identifier outside the configured hierarchy."
+        },
+    },
+    {
+        "id": "unchecked-file",
+        "shortDescription": {"text": "File could not be checked."},
+    },
+)
+
+_SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+class Reporter(abc.ABC):
+    """Abstract base class of reporters.
+
+    Reporters are context managers, writing any header on entry and
+    any trailer on exit, and write the diagnostics of each result
+    passed to ``report()`` immediately, reading its findings once.
+    Subclasses implement ``error()`` and ``finding()`` and may extend
+    ``start()`` and ``finish()``.
+
+    Attributes
+    ----------
+    stream : file
+        The text stream written to.
+    """
+
+    def __init__(self, stream=None):
+        """Create a ``Reporter()`` object.
+
+        Parameters
+        ----------
+        stream : file (optional)
+            The text stream to write to; default is ``sys.stdout``.
+        """
+        self.stream = stream or sys.stdout
+
+    def __enter__(self):
+        """Start the report."""
+        self.start()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        """Finish the report, even if checking failed."""
+        self.finish()
+
+    def start(self):
+        """Write the header of the report, if any."""
+
+    def finish(self):
+        """Write the trailer of the report, if any."""
+
+    def report(self, result, suggester=None):
+        """Write the diagnostics of a file result.
+
+        Parameters
+        ----------
+        result : FileResult
+            The result to report.
+        suggester : Suggester (optional)
+            Suggests a replacement for the first invalid segment of
+            each invalid identifier; default is no suggestions.
+
+        Returns
+        -------
+        boolean
+            True if the file could not be checked or has an invalid
+            identifier, False otherwise.
+        """
+        failed = False
+
+        if result.error is not None:
+            self.error(result)
+            failed = True
+
+        for finding in result.findings:
+            if not finding.result.valid:
+                suggestion = suggester and suggester.suggest(finding.result.name)
+                self.finding(finding, suggestion and suggestion[1])
+                failed = True
+
+        return failed
+
+    @abc.abstractmethod
+    def error(self, result):
+        """Write the diagnostic of a file that could not be checked.
+
+        Parameters
+        ----------
+        result : FileResult
+            The result, with its ``error``.
+        """
+
+    @abc.abstractmethod
+    def finding(self, finding, suggestion=None):
+        """Write the diagnostic of an invalid identifier.
+
+        Parameters
+        ----------
+        finding : Finding
+            The occurrence of the invalid identifier.
+        suggestion : string (optional)
+            Replacement for its first invalid segment, if any.
+        """
+
+
+class TextReporter(Reporter):
+    """Reporter writing one ``file:line:col:`` diagnostic per line."""
+
+    def error(self, result):
+        """Write the reason a file could not be checked."""
+        self.stream.write(f"{result.error}\n")
+
+    def finding(self, finding, suggestion=None):
+        """Write an invalid identifier, with any suggestion."""
+        if suggestion:
+            self.stream.write(f"{finding}; did you mean {suggestion!r}?\n")
+        else:
+            self.stream.write(f"{finding}\n")
+
+
+class JSONLinesReporter(Reporter):
+    """Reporter writing one JSON object per diagnostic per line.
+
+    Invalid identifiers are written as objects with ``file``,
+    ``line``, ``column``, ``name``, ``message``, and ``suggestion``
+    members, and files that could not be checked with ``file`` and
+    ``error`` members.
+    """
+
+    def _write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def error(self, result):
+        """Write the reason a file could not be checked."""
+        self._write({"file": result.fn, "error": result.error})
+
+    def finding(self, finding, suggestion=None):
+        """Write an invalid identifier, with any suggestion."""
+        self._write(
+            {
+                "file": finding.fn,
+                "line": finding.line,
+                "column": finding.col,
+                "name": finding.result.name,
+                "message": f"{finding.result.msg} (at char {finding.result.loc})",
+                "suggestion": suggestion,
+            }
+        )
+
+
+class SARIFReporter(Reporter):
+    """Reporter writing a SARIF 2.1.0 log.
+
+    The log has a single run whose results are written as they are
+    reported, between a header written by ``start()`` and a trailer
+    written by ``finish()``, so the log is never held in memory.
+    Columns count Unicode code points.
+    """
+
+    def __init__(self, stream=None):
+        """Create a ``SARIFReporter()`` object.
+
+        Parameters
+        ----------
+        stream : file (optional)
+            The text stream to write to; default is ``sys.stdout``.
+        """
+        super().__init__(stream)
+        self._separator = ""
+
+    def start(self):
+        """Write the log up to the results of the run."""
+        tool = {
+            "driver": {
+                "name": "chcss",
+                "informationUri": "https://github.com/jeremyagray/chcss",
+                "rules": _RULES,
+            }
+        }
+        # Every scanner counts columns in code points, including over
+        # memory mapped files.
+        header = json.dumps(
+            {
+                "$schema": _SARIF_SCHEMA,
+                "version": "2.1.0",
+                "runs": [{"tool": tool, "columnKind": "unicodeCodePoints"}],
+            }
+        )
+        # Reopen the run to append its results.
+        self.stream.write(header[: -len("}]}")] + ', "results": [\n')
+        self._separator = ""
+
+    def finish(self):
+        """Write the end of the results and of the log."""
+        self.stream.write("\n]}]}\n")
+
+    def _write(self, rule, fn, text, region=None):
+        location = {"artifactLocation": {"uri": _uri(fn)}}
+        if region is not None:
+            location["region"] = region
+        self.stream.write(
+            self._separator
+            + json.dumps(
+                {
+                    "ruleId": _RULES[rule]["id"],
+                    "ruleIndex": rule,
+                    "level": "error",
+                    "message": {"text": text},
+                    "locations": [{"physicalLocation": location}],
+                },
+                ensure_ascii=False,
+            )
+        )
+        self._separator = ",\n"
+
+    def error(self, result):
+        """Write the reason a file could not be checked."""
+        self._write(1, result.fn, result.error)
+
+    def finding(self, finding, suggestion=None):
+        """Write an invalid identifier, with any suggestion."""
+        text = (
+            f"{finding.result.name}: {finding.result.msg}"
+            f" (at char {finding.result.loc})"
+        )
+        if suggestion:
+            text += f"; did you mean {suggestion!r}?"
+        self._write(
+            0,
+            finding.fn,
+            text,
+            {"startLine": finding.line, "startColumn": finding.col},
+        )
+
+
+def _uri(fn):
+    """Convert a file name to a relative URI reference."""
+    from urllib.parse import quote
+
+    return quote(fn.replace(os.sep, "/"))
+
+
+# Reporters by ``--format`` name.
+REPORTERS = {
+    "text": TextReporter,
+    "jsonl": JSONLinesReporter,
+    "sarif": SARIFReporter,
+}
@@ -0,0 +1,193 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss per-directory configuration resolution."""
+
+import copy
+import os
+import re
+import sys
+
+from .cache import DEFAULT_CACHE_DIR
+from .cache import ResultCache
+from .config import _collision_warnings
+from .config import _create_argument_parser
+from .config import _load_cached
+
+# Options that may differ between the configuration files of a tree;
+# the others apply to the whole run.
+FILE_OPTIONS = (
+    "namespaces",
+    "functions",
+    "components",
+    "elements",
+    "modifiers",
+    "backend",
+    "syntax",
+    "verdict_cache_size",
+)
+
+_TOML_SECTION = re.compile(r"^\s*\[\s*tool\s*\.\s*chcss\s*[\].]", re.MULTILINE)
+
+
+def _config_file(directory):
+    """Get the configuration file of a directory, or ``None``.
+
+    A ``pyproject.toml`` with a ``[tool.chcss]`` section, or else a
+    ``package.json`` with a ``chcss`` entry, found without parsing
+    either.
+    """
+    for name, pattern in (
+        ("pyproject.toml", _TOML_SECTION),
+        ("package.json", re.compile(r'"chcss"\s*:')),
+    ):
+        fn = os.path.join(directory, name)
+        try:
+            with open(fn, "r", encoding="utf-8", errors="replace") as file:
+                if pattern.search(file.read()):
+                    return fn
+        except OSError:
+            pass
+
+    return None
+
+
+class ConfigResolver:
+    """Resolve the configuration of each checked file.
+
+    The configuration of a file is that of the nearest of its
+    directories, or their ancestors, with a configuration file: a
+    ``pyproject.toml`` with a ``[tool.chcss]`` section or a
+    ``package.json`` with a ``chcss`` entry.  The ``FILE_OPTIONS`` it
+    sets replace those of the configuration of the run, and options
+    given on the command line replace both.  Files with no configuration
+    file above them use the configuration of the run.
+
+    Resolutions are memoized by directory, and the configuration and
+    its result cache by configuration file, so configuration files
+    are read once and all the files under one share a configuration
+    and, through ``get_checker()``, its compiled validator.
+
+    Attributes
+    ----------
+    config : Config
+        The configuration of the run.
+    """
+
+    def __init__(self, config, args=None):
+        """Create a ``ConfigResolver()`` object.
+
+        Parameters
+        ----------
+        config : Config
+            The configuration of the run.
+        args : [string] (optional)
+            CLI arguments of the run, whose ``FILE_OPTIONS`` replace
+            those of every configuration file; default is
+            ``sys.argv``.
+        """
+        self.config = config
+        cli = vars(_create_argument_parser().parse_args(args))
+        self._overrides = {k: cli[k] for k in FILE_OPTIONS if cli.get(k) is not None}
+        self._cache_dir = None
+        if cli.get("cache") is not False:
+            self._cache_dir = cli.get("cache_dir") or DEFAULT_CACHE_DIR
+        self._directories = {}
+        self._files = {}
+        self._default = None
+
+    def __getstate__(self):
+        """Pickle without the memos, which workers build for themselves."""
+        state = dict(self.__dict__)
+        state.update(_directories={}, _files={}, _default=None)
+
+        return state
+
+    def _resolved(self, config):
+        """Pair a configuration with its result cache."""
+        return config, ResultCache(config) if config.cache else None
+
+    def _load(self, fn):
+        """Resolve the configuration of a configuration file."""
+        try:
+            options = _load_cached(fn, self._cache_dir)
+            config = copy.copy(self.config)
+            config.update(**{k: options.get(k) for k in FILE_OPTIONS})
+            config.update(**self._overrides)
+            frozen = config.freeze()
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            print(
+                f"Unable to use configuration file {fn} ({error!r}),"
+                " using the configuration of the run.",
+                file=sys.stderr,
+            )
+            return self.resolve_default()
+
+        for warning in _collision_warnings(frozen):
+            print(f"{fn}:  {warning}", file=sys.stderr)
+
+        return self._resolved(config)
+
+    def resolve_default(self):
+        """Get the resolution of files without a configuration file.
+
+        Returns
+        -------
+        (Config, ResultCache)
+            The configuration of the run and its result cache, or
+            ``None`` if results are not cached.
+        """
+        if self._default is None:
+            self._default = self._resolved(self.config)
+
+        return self._default
+
+    def resolve(self, fn):
+        """Get the configuration of a file.
+
+        Parameters
+        ----------
+        fn : string
+            Name of the file, or ``-`` for ``STDIN``, resolved from the
+            current directory.
+
+        Returns
+        -------
+        (Config, ResultCache)
+            The configuration of the file and its result cache, or
+            ``None`` if results are not cached.
+        """
+        directory = os.path.dirname(os.path.abspath(fn))
+        visited = []
+
+        while directory not in self._directories:
+            visited.append(directory)
+            found = _config_file(directory)
+            if found is not None:
+                if found not in self._files:
+                    self._files[found] = self._load(found)
+                resolved = self._files[found]
+                break
+
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                resolved = self.resolve_default()
+                break
+            directory = parent
+        else:
+            resolved = self._directories[directory]
+
+        for directory in visited:
+            self._directories[directory] = resolved
+
+        return resolved
@@ -0,0 +1,144 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""chcss result types."""
+
+from typing import NamedTuple
+
+
+class Identifier(NamedTuple):
+    """A parsed CSS class identifier.
+
+    An immutable tuple without a per-instance ``__dict__``, so it is
+    cheap to create in bulk, hashable, and pickles compactly for
+    transfer between worker processes.
+
+    Attributes
+    ----------
+    namespace : string
+        The namespace segment.
+    function : string
+        The function segment.
+    components : (string)
+        The component segments, if any.
+    element : string
+        The element segment; ``None`` if absent.
+    modifiers : (string)
+        The modifier segments, if any.
+    location : (string, int, int)
+        File name, line, and column of the occurrence; ``None`` if
+        not from a file.
+    """
+
+    namespace: str
+    function: str
+    components: tuple = ()
+    element: str = None
+    modifiers: tuple = ()
+    location: tuple = None
+
+    @property
+    def segments(self):
+        """Get the segments of the identifier, in order."""
+        segments = (self.namespace, self.function) + self.components
+
+        if self.element is not None:
+            segments += (self.element,)
+
+        return segments + self.modifiers
+
+    def __str__(self):
+        """Format an ``Identifier()`` as a class name."""
+        return "-".join(self.segments)
+
+
+class ClassNameResult(NamedTuple):
+    """Result of validating a CSS class identifier.
+
+    Attributes
+    ----------
+    name : string
+        The identifier checked.
+    valid : boolean
+        True if ``name`` is a valid identifier, False otherwise.
+    identifier : Identifier
+        The parsed ``name``; ``None`` if invalid.
+    loc : int
+        Position in ``name`` of the failure; ``None`` if valid.
+    msg : string
+        Reason for the failure; ``None`` if valid.
+    """
+
+    name: str
+    valid: bool
+    identifier: Identifier = None
+    loc: int = None
+    msg: str = None
+
+
+class Finding(NamedTuple):
+    """An occurrence of a CSS class identifier in a file.
+
+    Attributes
+    ----------
+    fn : string
+        Name of the file.
+    line : int
+        Line number of the occurrence.
+    col : int
+        Column number of the occurrence.
+    result : ClassNameResult
+        Result of validating the identifier.
+    """
+
+    fn: str
+    line: int
+    col: int
+    result: ClassNameResult
+
+    @property
+    def identifier(self):
+        """Get the parsed identifier with its location; ``None`` if invalid."""
+        if self.result.identifier is None:
+            return None
+
+        return self.result.identifier._replace(location=(self.fn, self.line, self.col))
+
+    def __str__(self):
+        """Format a ``Finding()`` as a diagnostic."""
+        if self.result.valid:
+            return f"{self.fn}:{self.line}:{self.col}: {self.result.name}"
+
+        return (
+            f"{self.fn}:{self.line}:{self.col}: {self.result.name}:"
+            f" {self.result.msg} (at char {self.result.loc})"
+        )
+
+
+class FileResult(NamedTuple):
+    """Results of checking a file.
+
+    Attributes
+    ----------
+    fn : string
+        Name of the file.
+    findings : (Finding)
+        Each class identifier occurrence in the file and its result,
+        in order; an iterator read once if streamed by
+        ``check_files()``.
+    error : string
+        Reason the file could not be checked; ``None`` if checked.
+    """
+
+    fn: str
+    findings: tuple = ()
+    error: str = None
@@ -0,0 +1,228 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss staged changes mode."""
+
+import codecs
+import io
+import os
+import re
+import subprocess  # nosec B404
+
+from .check import CHECKED_EXTENSIONS
+from .check import check_stream
+from .check import expand_paths
+from .result import FileResult
+
+# New side of a hunk header, ``@@ -a,b +c,d @@``.
+_HUNK = re.compile(r"^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def _git(args, cwd=None, input=None):
+    """Run git, returning its output.
+
+    Raises
+    ------
+    OSError
+        Raised if git cannot be run or fails.
+    """
+    process = subprocess.run(  # nosec B603 B607
+        ["git", "-c", "core.quotepath=off", *args],
+        cwd=cwd,
+        input=input,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    if process.returncode != 0:
+        message = process.stderr.decode("utf-8", errors="replace").strip()
+        raise OSError(f"git {args[0]} failed: {message}")
+
+    return process.stdout
+
+
+def _unquote(path):
+    """Decode a path quoted by git for special characters."""
+    if not path.startswith('"'):
+        return path
+
+    return codecs.escape_decode(path[1:-1].encode("utf-8"))[0].decode(
+        "utf-8", errors="replace"
+    )
+
+
+def parse_diff(diff):
+    """Get the changed lines of each file from a unified diff.
+
+    Parameters
+    ----------
+    diff : string
+        Output of ``git diff --unified=0``.  File headers are only
+        recognized between a ``diff --git`` line and the first hunk,
+        and hunks are consumed by their line counts, so added lines
+        that look like headers are not mistaken for them.
+
+    Returns
+    -------
+    dict
+        Sorted ranges of the added or changed lines of the new side,
+        first and last line included, by file name relative to the
+        repository.  Files with only deleted lines are omitted.
+    """
+    changes = {}
+    fn = None
+    header = False
+    old = new = 0
+
+    for line in diff.split("\n"):
+        if old > 0 or new > 0:
+            # Lines of the current hunk, whatever they contain.
+            if line.startswith("-"):
+                old -= 1
+            elif line.startswith("+"):
+                new -= 1
+            elif line.startswith(" "):
+                old -= 1
+                new -= 1
+            continue
+
+        if line.startswith("diff --git "):
+            fn = None
+            header = True
+            continue
+
+        if header and line.startswith("+++ "):
+            path = _unquote(line[4:].rstrip("\t"))
+            fn = path[2:] if path.startswith("b/") else None
+            continue
+
+        match = _HUNK.match(line)
+        if match is None:
+            continue
+
+        header = False
+        old = 1 if match.group(1) is None else int(match.group(1))
+        start = int(match.group(2))
+        new = 1 if match.group(3) is None else int(match.group(3))
+        if new and fn is not None:
+            changes.setdefault(fn, []).append((start, start + new - 1))
+
+    for ranges in changes.values():
+        ranges.sort()
+
+    return changes
+
+
+def _read_staged(names, root):
+    """Read the staged contents of files, by name."""
+    output = io.BytesIO(
+        _git(
+            ["cat-file", "--batch"],
+            cwd=root,
+            input="".join(f":{name}\n" for name in names).encode("utf-8"),
+        )
+    )
+    contents = {}
+
+    for name in names:
+        header = output.readline().split()
+        if len(header) != 3:
+            # Missing.
+            continue
+        data = output.read(int(header[2]))
+        output.readline()
+        if header[1] == b"blob":
+            contents[name] = data
+
+    return contents
+
+
+def check_staged(config, paths=None, resolver=None):
+    """Check the changed lines of the files staged for commit.
+
+    Runs ``git diff --cached`` in the current directory, without
+    contacting any remote, and validates only the class identifiers on
+    the lines it adds or changes, with their locations in the staged
+    file.  The staged contents are checked, not the working tree, so
+    changes not staged do not affect the results.  Each file is
+    scanned from its start, so that comments, rules, and tags begun on
+    earlier lines are recognized, but no further than its last changed
+    line.
+
+    Parameters
+    ----------
+    config : Config
+        The configuration providing the syntax, backend, and segment
+        vocabularies.
+    paths : [string] (optional)
+        Files, directories, or glob patterns to limit the files to, as
+        for ``expand_paths()``; default is all staged files with an
+        extension in ``CHECKED_EXTENSIONS``.
+    resolver : ConfigResolver (optional)
+        Resolver of the configuration of each file, in place of
+        ``config``, from the configuration files of the working tree;
+        default is ``config`` for all files.
+
+    Yields
+    ------
+    FileResult
+        The results for each changed file, by name relative to the
+        current directory, in name order.
+
+    Raises
+    ------
+    OSError
+        Raised if git cannot be run or fails, as outside a repository.
+    """
+    root = _git(["rev-parse", "--show-toplevel"]).decode("utf-8").rstrip("\n")
+    diff = _git(
+        [
+            "diff",
+            "--cached",
+            "--unified=0",
+            "--no-color",
+            "--no-ext-diff",
+            "--diff-filter=d",
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+        ]
+    ).decode("utf-8", errors="replace")
+
+    selected = None
+    if paths:
+        selected = {os.path.normpath(fn) for fn in expand_paths(paths)}
+
+    changes = {}
+
+    for name, lines in parse_diff(diff).items():
+        fn = os.path.relpath(os.path.join(root, name))
+        if selected is None:
+            if os.path.splitext(fn)[1].lower() not in CHECKED_EXTENSIONS:
+                continue
+        elif fn not in selected:
+            continue
+        changes[fn] = (name, lines)
+
+    if not changes:
+        return
+
+    contents = _read_staged([name for name, _ in changes.values()], root)
+
+    for fn in sorted(changes):
+        name, lines = changes[fn]
+        if name not in contents:
+            continue
+
+        conf = config if resolver is None else resolver.resolve(fn)[0]
+        stream = io.StringIO(contents[name].decode("utf-8", errors="replace"))
+        yield FileResult(fn, tuple(check_stream(stream, conf, fn, lines=lines)))
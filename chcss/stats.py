@@ -0,0 +1,217 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss run statistics."""
+
+import collections
+import contextlib
+import json
+import time
+
+# Phases in reporting order; ``config-file`` is part of ``config``.
+PHASES = (
+    "config",
+    "config-file",
+    "compile",
+    "read",
+    "extract",
+    "validate",
+    "report",
+)
+
+
+class Stats:
+    """Per-phase timings and counters of a run.
+
+    Phases accumulate wall and CPU time over any number of calls, so a
+    phase timed once per file reports totals for the run.  Phases
+    timed in worker processes are merged into the parent, so their
+    wall times are summed over workers and may exceed the run time.
+
+    Attributes
+    ----------
+    phases : dict
+        ``[wall, cpu, calls]`` of each phase, by name, in seconds.
+    counters : collections.Counter
+        Event counts, by name.
+    names : set
+        Distinct class names seen.
+    """
+
+    def __init__(self):
+        """Create an empty ``Stats()`` object."""
+        self.phases = {}
+        self.counters = collections.Counter()
+        self.names = set()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a phase.
+
+        Parameters
+        ----------
+        name : string
+            Name of the phase.
+        """
+        wall = time.perf_counter()
+        cpu = time.process_time()
+
+        try:
+            yield self
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def add(self, name, wall, cpu, calls=1):
+        """Add timings to a phase.
+
+        Parameters
+        ----------
+        name : string
+            Name of the phase.
+        wall : float
+            Wall time in seconds.
+        cpu : float
+            CPU time in seconds.
+        calls : int (optional)
+            Number of calls timed.
+        """
+        totals = self.phases.setdefault(name, [0.0, 0.0, 0])
+        totals[0] += wall
+        totals[1] += cpu
+        totals[2] += calls
+
+    def merge(self, other):
+        """Add the timings and counters of another ``Stats()`` object.
+
+        Parameters
+        ----------
+        other : Stats
+            The statistics to add, such as those of a worker.
+        """
+        for name, (wall, cpu, calls) in other.phases.items():
+            self.add(name, wall, cpu, calls)
+
+        self.counters.update(other.counters)
+        self.names.update(other.names)
+
+    def count_result(self, result):
+        """Count the files, names, and failures of a file result.
+
+        Parameters
+        ----------
+        result : FileResult
+            The result to count.
+        """
+        counters = self.counters
+        counters["files"] += 1
+        counters["names"] += len(result.findings)
+
+        invalid = sum(not finding.result.valid for finding in result.findings)
+        counters["invalid_names"] += invalid
+        if result.error is not None or invalid:
+            counters["failed_files"] += 1
+
+        self.names.update(finding.result.name for finding in result.findings)
+
+    def as_dict(self):
+        """Get the statistics as a JSON serializable ``dict``.
+
+        Returns
+        -------
+        dict
+            Phase timings, counters, and cache hit rates.
+        """
+        counters = dict(self.counters)
+        counters["unique_names"] = len(self.names)
+
+        rates = {}
+        for cache in ("result_cache", "verdict_cache"):
+            hits = counters.get(f"{cache}_hits", 0)
+            total = hits + counters.get(f"{cache}_misses", 0)
+            if total:
+                rates[cache] = hits / total
+
+        return {
+            "phases": {
+                name: {"wall": wall, "cpu": cpu, "calls": calls}
+                for name, (wall, cpu, calls) in sorted(
+                    self.phases.items(), key=_phase_order
+                )
+            },
+            "counters": counters,
+            "hit_rates": rates,
+        }
+
+    def format(self, style="text"):
+        """Format the statistics for display.
+
+        Parameters
+        ----------
+        style : string (optional)
+            ``text`` for a table, or ``json``.
+
+        Returns
+        -------
+        string
+            The formatted statistics.
+        """
+        stats = self.as_dict()
+
+        if style == "json":
+            return json.dumps(stats, indent=2)
+
+        lines = [f"{'phase':<12} {'wall (s)':>10} {'cpu (s)':>10} {'calls':>8}"]
+        for name, phase in stats["phases"].items():
+            lines.append(
+                f"{name:<12} {phase['wall']:>10.4f} {phase['cpu']:>10.4f}"
+                f" {phase['calls']:>8}"
+            )
+
+        lines.append("")
+        for name, count in sorted(stats["counters"].items()):
+            lines.append(f"{name.replace('_', ' ')}: {count}")
+        for name, rate in stats["hit_rates"].items():
+            lines.append(f"{name.replace('_', ' ')} hit rate: {rate:.1%}")
+
+        return "\n".join(lines)
+
+
+def _phase_order(item):
+    """Sort known phases in ``PHASES`` order, then others by name."""
+    name = item[0]
+
+    if name in PHASES:
+        return (PHASES.index(name), name)
+
+    return (len(PHASES), name)
+
+
+def phase(stats, name):
+    """Time a phase if collecting statistics.
+
+    Parameters
+    ----------
+    stats : Stats
+        The statistics, or ``None``.
+    name : string
+        Name of the phase.
+
+    Returns
+    -------
+    context manager
+        ``stats.phase(name)``, or a no-op if ``stats`` is ``None``.
+    """
+    if stats is None:
+        return contextlib.nullcontext()
+
+    return stats.phase(name)
@@ -0,0 +1,247 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""chcss segment suggestions."""
+
+# Segment kinds expected in each state of a walk of an identifier,
+# with the next state of a match of each kind; as in the backends,
+# components match before elements.
+_NAMESPACE = 0
+_FUNCTION = 1
+_COMPONENT = 2
+_COMPONENT_OR_ELEMENT = 3
+_MODIFIER = 4
+
+_TRANSITIONS = {
+    _NAMESPACE: (("namespaces", _FUNCTION),),
+    _FUNCTION: (("functions", _COMPONENT),),
+    _COMPONENT: (("components", _COMPONENT_OR_ELEMENT),),
+    _COMPONENT_OR_ELEMENT: (
+        ("components", _COMPONENT_OR_ELEMENT),
+        ("elements", _MODIFIER),
+    ),
+    _MODIFIER: (("modifiers", _MODIFIER),),
+}
+
+
+def distance(a, b):
+    """Compute the Levenshtein distance of two strings.
+
+    Parameters
+    ----------
+    a : string
+        The first string.
+    b : string
+        The second string.
+
+    Returns
+    -------
+    int
+        The minimum number of insertions, deletions, and substitutions
+        turning ``a`` into ``b``.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+
+    previous = list(range(len(b) + 1))
+
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ca != cb),
+                )
+            )
+        previous = current
+
+    return previous[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree of words under edit distance.
+
+    Each child of a node is keyed by its distance to the node, so by
+    the triangle inequality a search within ``max_distance`` of a word
+    only descends into children keyed within ``max_distance`` of the
+    word's distance to the node, visiting a fraction of the words.
+    """
+
+    def __init__(self, words=()):
+        """Create a ``BKTree()`` object.
+
+        Parameters
+        ----------
+        words : iterable (optional)
+            Words to add.
+        """
+        self._root = None
+        self._size = 0
+
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        """Get the number of words."""
+        return self._size
+
+    def add(self, word):
+        """Add a word.
+
+        Parameters
+        ----------
+        word : string
+            The word to add; duplicates are ignored.
+        """
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return
+
+        node = self._root
+        while True:
+            d = distance(word, node[0])
+            if d == 0:
+                return
+
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = (word, {})
+                self._size += 1
+                return
+
+            node = child
+
+    def search(self, word, max_distance):
+        """Find the words within a distance of a word.
+
+        Parameters
+        ----------
+        word : string
+            The word to search for.
+        max_distance : int
+            The maximum distance of the words found.
+
+        Returns
+        -------
+        [(int, string)]
+            The words found with their distances, closest first, then
+            alphabetically.
+        """
+        found = []
+        stack = [self._root] if self._root is not None else []
+
+        while stack:
+            node, children = stack.pop()
+            d = distance(word, node)
+            if d <= max_distance:
+                found.append((d, node))
+
+            for k in range(max(1, d - max_distance), d + max_distance + 1):
+                child = children.get(k)
+                if child is not None:
+                    stack.append(child)
+
+        return sorted(found)
+
+
+class Suggester:
+    """Suggest the closest valid segment for an invalid identifier.
+
+    Walks an identifier as the backends do to find the first segment
+    that does not match, then searches a ``BKTree()`` of each
+    vocabulary expected there.  Trees are built on the first
+    suggestion for each vocabulary, so runs without failures never
+    build them, and suggestions are memoized by segment.
+
+    Attributes
+    ----------
+    config : FrozenConfig
+        The frozen configuration providing the vocabularies.
+    """
+
+    def __init__(self, config):
+        """Create a ``Suggester()`` object.
+
+        Parameters
+        ----------
+        config : Config or FrozenConfig
+            The configuration providing the segment vocabularies.
+        """
+        self.config = config.freeze()
+        self._trees = {}
+        self._suggestions = {}
+
+    def _tree(self, kind):
+        try:
+            return self._trees[kind]
+        except KeyError:
+            tree = self._trees[kind] = BKTree(sorted(getattr(self.config, kind)))
+            return tree
+
+    def _failure(self, name):
+        """Get the first invalid segment of a name and the kinds expected."""
+        config = self.config
+        state = _NAMESPACE
+
+        for segment in name.split(config.separator):
+            for kind, next_state in _TRANSITIONS[state]:
+                if segment in getattr(config, kind):
+                    state = next_state
+                    break
+            else:
+                return segment, tuple(kind for kind, _ in _TRANSITIONS[state])
+
+        return None, ()
+
+    def suggest(self, name, max_distance=None):
+        """Suggest a replacement for the first invalid segment of a name.
+
+        Parameters
+        ----------
+        name : string
+            The invalid identifier.
+        max_distance : int (optional)
+            Maximum edit distance of a suggestion; default is a third
+            of the length of the segment, and at least 1.
+
+        Returns
+        -------
+        (string, string)
+            The invalid segment and the closest valid segment expected
+            in its place, or ``None`` if there is none close enough or
+            the name is incomplete rather than misspelled.
+        """
+        segment, kinds = self._failure(name)
+        if not segment:
+            return None
+
+        if max_distance is None:
+            max_distance = max(1, len(segment) // 3)
+
+        key = (segment, kinds, max_distance)
+        try:
+            return self._suggestions[key]
+        except KeyError:
+            pass
+
+        found = []
+        for kind in kinds:
+            found.extend(self._tree(kind).search(segment, max_distance))
+
+        suggestion = (segment, min(found)[1]) if found else None
+        self._suggestions[key] = suggestion
+
+        return suggestion
@@ -0,0 +1,147 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""chcss watch mode."""
+
+import os
+import time
+
+from .check import _check
+from .check import expand_paths
+from .check import report
+from .config import Config
+from .parser import get_checker
+from .suggest import Suggester
+
+
+def _signature(fn):
+    """Get the modification time and size of a file, or ``None``."""
+    try:
+        stat = os.stat(fn)
+    except OSError:
+        return None
+
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class Watcher:
+    """Re-check files as they change.
+
+    Keeps the configuration, its compiled validator, and the result of
+    every watched file in memory.  Each ``poll()`` expands the watched
+    paths again, so new files are picked up, and re-checks only files
+    whose modification time or size changed.  If the configuration
+    file changes, the configuration is reloaded and every file is
+    re-checked.
+
+    Attributes
+    ----------
+    config : Config
+        The current configuration.
+    suggester : Suggester
+        Suggestions for invalid identifiers under the current
+        configuration.
+    results : dict
+        The latest ``FileResult()`` of each watched file, by name.
+    """
+
+    def __init__(self, args=None):
+        """Create a ``Watcher()`` object.
+
+        Parameters
+        ----------
+        args : [string] (optional)
+            CLI arguments, reapplied whenever the configuration is
+            reloaded; default is ``sys.argv``.
+        """
+        self._args = args
+        self._signatures = {}
+        self._config_signatures = None
+        self.config = None
+        self.suggester = None
+        self.results = {}
+
+    def _config_files(self):
+        return [self.config.config_file, "./package.json"]
+
+    def _reload(self):
+        """Reload the configuration if it changed, returning True if so."""
+        if self.config is not None:
+            signatures = [_signature(fn) for fn in self._config_files()]
+            if signatures == self._config_signatures:
+                return False
+
+        self.config = Config()
+        self.config.load(self._args)
+        get_checker(self.config)
+        self.suggester = Suggester(self.config)
+        self._config_signatures = [_signature(fn) for fn in self._config_files()]
+
+        return True
+
+    def poll(self):
+        """Check new and changed files.
+
+        Returns
+        -------
+        [FileResult]
+            The results of the files checked, in path order.
+        """
+        if self._reload():
+            self._signatures = {}
+
+        checked = []
+        signatures = {}
+
+        for fn in expand_paths(self.config.paths):
+            if fn == "-":
+                continue
+
+            signature = _signature(fn)
+            signatures[fn] = signature
+
+            if fn in self._signatures and self._signatures[fn] == signature:
+                continue
+
+            result = _check(fn, self.config)
+            self.results[fn] = result
+            checked.append(result)
+
+        for fn in self._signatures.keys() - signatures.keys():
+            self.results.pop(fn, None)
+
+        self._signatures = signatures
+
+        return checked
+
+    def run(self, interval=None):
+        """Poll and report changes until interrupted.
+
+        Parameters
+        ----------
+        interval : float (optional)
+            Seconds between polls; default is ``config.interval``.
+
+        Returns
+        -------
+        int
+            Exit status:  0 when interrupted.
+        """
+        try:
+            while True:
+                checked = self.poll()
+                if checked:
+                    failed = sum(report(result, self.suggester) for result in checked)
+                    print(f"Checked {len(checked)} files, {failed} failed.")
+                time.sleep(interval or self.config.interval)
+        except KeyboardInterrupt:
+            return 0
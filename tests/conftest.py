@@ -0,0 +1,31 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Shared test fixtures."""
+
+import os
+import sys
+
+import pytest
+
+# The benchmark suite is imported from the repository, as it is not
+# installed; appended so that an installed chcss is still tested.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+
+@pytest.fixture(autouse=True)
+def no_daemon(tmp_path, monkeypatch):
+    """Keep runs of the CLI from any daemon of the user running the tests."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
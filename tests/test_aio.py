@@ -0,0 +1,144 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Asyncio interface unit tests."""
+
+import asyncio
+import threading
+
+import chcss
+import chcss.aio
+
+config = chcss.Config(
+    namespaces=["gf_news"],
+    functions=["c"],
+    components=["navbar"],
+    elements=["ul", "li"],
+    modifiers=["reverse"],
+    cache=False,
+)
+
+
+def _write(tmp_path, count):
+    """Write stylesheets alternating valid and invalid identifiers."""
+    for i in range(count):
+        name = "gf_news-c-navbar" if i % 2 else "gf_news-c-navbr"
+        (tmp_path / f"{i:03}.css").write_text(f".{name} {{ }}\n")
+
+
+async def _collect(*args, **kwargs):
+    return [result async for result in chcss.check_files_async(*args, **kwargs)]
+
+
+def test_check_file_async(tmp_path):
+    """Test check_file_async()."""
+    _write(tmp_path, 1)
+
+    result = asyncio.run(chcss.check_file_async(str(tmp_path / "000.css"), config))
+    assert [f.result.valid for f in result.findings] == [False]
+
+    result = asyncio.run(chcss.check_file_async(str(tmp_path / "x.css"), config))
+    assert result.findings == ()
+    assert result.error.startswith("No such file or directory")
+
+
+def test_check_files_async(tmp_path):
+    """Test check_files_async() results and their order."""
+    _write(tmp_path, 20)
+
+    expected = list(chcss.check_files([str(tmp_path)], config, jobs=1))
+
+    for jobs, limit in [(1, None), (4, None), (4, 1), (3, 50)]:
+        actual = asyncio.run(_collect([str(tmp_path)], config, jobs, limit))
+        assert actual == expected
+
+    assert asyncio.run(_collect([str(tmp_path / "*.scss")], config)) == []
+
+
+def test_check_files_async_backpressure(tmp_path, monkeypatch):
+    """Test that check_files_async() bounds the files in flight."""
+    _write(tmp_path, 20)
+    started = []
+    check = chcss.aio._check
+
+    def _check(fn, *args):
+        started.append(fn)
+        return check(fn, *args)
+
+    monkeypatch.setattr(chcss.aio, "_check", _check)
+
+    async def consume():
+        results = chcss.check_files_async([str(tmp_path)], config, jobs=2, limit=3)
+        seen = []
+        async for result in results:
+            seen.append(result.fn)
+            await asyncio.sleep(0.01)
+            # Consumed results plus at most ``limit`` in flight.
+            assert len(started) <= len(seen) + 3
+        return seen
+
+    assert len(asyncio.run(consume())) == 20
+
+
+def test_check_files_async_cancel(tmp_path, monkeypatch):
+    """Test cancelling a consumer of check_files_async()."""
+    _write(tmp_path, 20)
+    started = []
+    release = threading.Event()
+    check = chcss.aio._check
+
+    def _check(fn, *args):
+        started.append(fn)
+        release.wait(5)
+        return check(fn, *args)
+
+    monkeypatch.setattr(chcss.aio, "_check", _check)
+
+    async def consume():
+        task = asyncio.create_task(_collect([str(tmp_path)], config, jobs=2, limit=4))
+        while len(started) < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        finally:
+            release.set()
+
+    assert asyncio.run(consume())
+    # Files queued behind the running ones were never started.
+    assert len(started) == 2
+
+
+def test_verdict_cache_threads():
+    """Test sharing a VerdictCache() between threads."""
+    cache = chcss.VerdictCache(chcss.get_validator(config), 4)
+    names = [f"gf_news-c-navbar{'-li' * (i % 7)}" for i in range(2000)]
+    errors = []
+
+    def check():
+        try:
+            for name in names:
+                assert cache.check(name).name == name
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=check) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache) <= 4
@@ -0,0 +1,73 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Benchmark suite unit tests."""
+
+import json
+import random
+
+import chcss
+from benchmarks import corpus
+from benchmarks import run
+
+
+def test_corpus_names():
+    """Test that generated names are valid or invalid as labelled."""
+    config = corpus.vocabulary(chcss.Config(), 20)
+    validator = chcss.get_validator(config)
+    names = corpus.names(config, 500, 0.3, random.Random(3))
+
+    assert len(config.namespaces) == len(config.components) == 20
+    assert len(config.functions) == 2
+    assert 0 < sum(not valid for _, valid in names) < 500
+    for name, valid in names:
+        assert validator.check(name).valid is valid
+
+
+def test_write_corpus(tmp_path):
+    """Test that corpora are reproducible."""
+    config = corpus.vocabulary(chcss.Config(), 5)
+    first = corpus.write_corpus(tmp_path / "a", config, 6, 20, 0.2, 0.5, seed=7)
+    second = corpus.write_corpus(tmp_path / "b", config, 6, 20, 0.2, 0.5, seed=7)
+
+    assert first["names"] == 120
+    assert first["invalid"] == second["invalid"]
+    assert first["bytes"] == second["bytes"]
+
+    conf = chcss.Config(**{**vars(config), "cache": False, "jobs": 1})
+    invalid = sum(
+        not finding.result.valid
+        for result in chcss.check_files(first["paths"], conf)
+        for finding in result.findings
+    )
+    assert invalid == first["invalid"]
+
+
+def test_run(tmp_path, capsys):
+    """Test a minimal benchmark run."""
+    output = tmp_path / "results.json"
+    args = ["--files", "2", "--names-per-file", "5", "--names", "20"]
+    args += ["--repeat", "1", "--no-cli", "--output", str(output)]
+
+    assert run.main(args) == 0
+
+    results = json.loads(output.read_text())
+    assert results["format"] == run.RESULTS_FORMAT
+    assert results["parameters"]["corpus"]["names"] == 10
+    assert {result["benchmark"] for result in results["results"]} == {
+        "names",
+        "names-memoized",
+        "parse_class_name",
+        "files",
+    }
+    assert all(result["seconds"] > 0 for result in results["results"])
@@ -0,0 +1,183 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""Result cache unit tests."""
+
+import os
+
+import chcss
+import chcss.check
+
+
+def _config(tmp_path, **kwargs):
+    options = {
+        "namespaces": ["gf_news"],
+        "functions": ["c"],
+        "components": ["navbar"],
+        "cache_dir": str(tmp_path / "cache"),
+        "jobs": 1,
+    }
+    options.update(kwargs)
+
+    return chcss.Config(**options)
+
+
+def _counting(monkeypatch):
+    calls = []
+    check_file = chcss.check.check_file
+
+    def counting_check_file(fn, config):
+        calls.append(fn)
+        return check_file(fn, config)
+
+    monkeypatch.setattr(chcss.check, "check_file", counting_check_file)
+
+    return calls
+
+
+def test_result_cache(tmp_path, monkeypatch):
+    """Test that unchanged files are read from the cache."""
+    calls = _counting(monkeypatch)
+    fn = tmp_path / "a.css"
+    fn.write_text(".gf_news-c-navbar {}\n.gf_news-c-navbr {}\n")
+    config = _config(tmp_path)
+
+    first = list(chcss.check_files([str(fn)], config))
+    second = list(chcss.check_files([str(fn)], config))
+
+    assert first == second
+    assert calls == [str(fn)]
+    assert os.path.isfile(tmp_path / "cache" / ".gitignore")
+
+    # Changing the file invalidates its entry.
+    fn.write_text(".gf_news-c-navbar {}\n")
+    third = list(chcss.check_files([str(fn)], config))
+
+    assert calls == [str(fn), str(fn)]
+    assert len(third[0].findings) == 1
+
+    # Changing the vocabulary invalidates all entries.
+    list(chcss.check_files([str(fn)], _config(tmp_path, components=["list"])))
+
+    assert len(calls) == 3
+
+
+def test_result_cache_disabled(tmp_path, monkeypatch):
+    """Test checking without the cache."""
+    calls = _counting(monkeypatch)
+    fn = tmp_path / "a.css"
+    fn.write_text(".gf_news-c-navbar {}\n")
+    config = _config(tmp_path, cache=False)
+
+    list(chcss.check_files([str(fn)], config))
+    list(chcss.check_files([str(fn)], config))
+
+    assert len(calls) == 2
+    assert not os.path.exists(tmp_path / "cache")
+
+
+def test_result_cache_prune(tmp_path):
+    """Test eviction of the least recently used entries."""
+    config = _config(tmp_path)
+    cache = chcss.ResultCache(config)
+    result = chcss.FileResult("a.css")
+
+    for i, key in enumerate(["old", "new"]):
+        cache.put(key, result)
+        os.utime(cache._path(key), (i, i))
+
+    cache.max_size = os.path.getsize(cache._path("new"))
+    cache.prune()
+
+    assert cache.get("a.css", "old") is None
+    assert cache.get("a.css", "new") == result
+
+
+def test_config_cache(tmp_path, monkeypatch):
+    """Test that unchanged configuration files are not parsed again."""
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    load_file = chcss.config._load_file
+
+    def counting_load_file(fn):
+        calls.append(fn)
+        return load_file(fn)
+
+    monkeypatch.setattr(chcss.config, "_load_file", counting_load_file)
+    cfg = tmp_path / "pyproject.toml"
+    cfg.write_text('[tool.chcss]\nnamespaces = ["gf_news"]\n')
+    cli = ["--cache-dir", str(tmp_path / "cache")]
+
+    def load(args=cli):
+        conf = chcss.Config()
+        conf.load(args)
+        return conf
+
+    # Recently modified files are not cached.
+    assert load().namespaces == ["gf_news"]
+    assert load().namespaces == ["gf_news"]
+    assert len(calls) == 2
+
+    os.utime(cfg, (0, 0))
+    load()
+    assert load().namespaces == ["gf_news"]
+    assert len(calls) == 3
+
+    # Changing the file invalidates its entry.
+    cfg.write_text('[tool.chcss]\nnamespaces = ["gf_accounts"]\n')
+    os.utime(cfg, (0, 0))
+    assert load().namespaces == ["gf_accounts"]
+    assert len(calls) == 4
+
+    # So does adding the package.json fallback.
+    (tmp_path / "package.json").write_text("{}")
+    load()
+    assert len(calls) == 5
+
+    load(cli + ["--no-cache"])
+    assert len(calls) == 6
+
+
+def test_keep_in_memory(tmp_path, monkeypatch):
+    """Test cache entries kept in memory."""
+    monkeypatch.chdir(tmp_path)
+    fn = tmp_path / "a.css"
+    fn.write_text(".gf_news-c-navbar {}\n")
+    cfg = tmp_path / "pyproject.toml"
+    cfg.write_text('[tool.chcss]\nnamespaces = ["gf_news"]\n')
+    os.utime(cfg, (0, 0))
+    config = _config(tmp_path)
+    cli = ["--cache-dir", str(tmp_path / "cache")]
+
+    chcss.cache.keep_in_memory(2)
+    try:
+        first = list(chcss.check_files([str(fn)], config))
+        chcss.Config().load(cli)
+
+        # Entries are served without the cache directory...
+        for entry in os.scandir(tmp_path / "cache"):
+            os.remove(entry.path)
+        assert list(chcss.check_files([str(fn)], config)) == first
+        conf = chcss.Config()
+        conf.load(cli)
+        assert conf.namespaces == ["gf_news"]
+
+        # ...and validated as they are on disk.
+        cfg.write_text('[tool.chcss]\nnamespaces = ["gf_accounts"]\n')
+        os.utime(cfg, (0, 0))
+        conf.load(cli)
+        assert conf.namespaces == ["gf_accounts"]
+        assert len(chcss.cache._memory) == 2
+    finally:
+        chcss.cache.keep_in_memory(0)
+
+    assert chcss.cache._memory is None
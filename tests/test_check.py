@@ -0,0 +1,187 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""File checking unit tests."""
+
+import io
+
+import chcss
+
+config = chcss.Config(
+    namespaces=["gf_news"],
+    functions=["c"],
+    components=["navbar"],
+    elements=["ul", "li"],
+    modifiers=["reverse"],
+    cache=False,
+)
+
+stylesheet = """\
+.gf_news-c-navbar { }
+.gf_news-c-navbr,
+.gf_news-c-navbar-li-reverse { }
+"""
+
+cli = [
+    "--namespaces",
+    "gf_news",
+    "--functions",
+    "c",
+    "--components",
+    "navbar",
+    "--elements",
+    "ul,li",
+    "--modifiers",
+    "reverse",
+    "--no-cache",
+]
+
+
+def test_check_stream():
+    """Test check_stream()."""
+    actual = list(chcss.check_stream(io.StringIO(stylesheet), config, "a.css"))
+
+    assert [(f.fn, f.line, f.col) for f in actual] == [
+        ("a.css", 1, 1),
+        ("a.css", 2, 1),
+        ("a.css", 3, 1),
+    ]
+    assert [f.result.valid for f in actual] == [True, False, True]
+
+
+def test_check_stream_lines():
+    """Test check_stream() limited to line ranges."""
+
+    def names(lines):
+        stream = io.StringIO(stylesheet * 3)
+        return [
+            (f.line, f.result.name)
+            for f in chcss.check_stream(stream, config, "a.css", lines=lines)
+        ]
+
+    assert names([(2, 2)]) == [(2, "gf_news-c-navbr")]
+    assert names([(3, 4), (6, 8)]) == [
+        (3, "gf_news-c-navbar-li-reverse"),
+        (4, "gf_news-c-navbar"),
+        (6, "gf_news-c-navbar-li-reverse"),
+        (7, "gf_news-c-navbar"),
+        (8, "gf_news-c-navbr"),
+    ]
+    assert names([(10, 20)]) == []
+    assert names([]) == []
+
+
+def test_check_file(tmp_path):
+    """Test check_file()."""
+    fn = tmp_path / "a.css"
+    fn.write_text(stylesheet)
+
+    actual = list(chcss.check_file(str(fn), config))
+
+    assert [f.result.name for f in actual] == [
+        "gf_news-c-navbar",
+        "gf_news-c-navbr",
+        "gf_news-c-navbar-li-reverse",
+    ]
+
+
+def test_main(tmp_path, capsys):
+    """Test main() exit status and diagnostics."""
+    good = tmp_path / "good.css"
+    good.write_text(".gf_news-c-navbar-ul { }\n")
+    bad = tmp_path / "bad.css"
+    bad.write_text(stylesheet)
+
+    assert chcss.main([str(good)] + cli) == 0
+    capsys.readouterr()
+
+    assert chcss.main([str(bad)] + cli) == 1
+    assert capsys.readouterr().out.startswith(f"{bad}:2:1: gf_news-c-navbr:")
+
+    assert chcss.main([str(tmp_path / "missing.css")] + cli) == 1
+
+
+def _tree(tmp_path):
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "z.css").write_text(stylesheet)
+    (tmp_path / "b" / "a.html").write_text('<p class="gf_news-c-navbr">\n')
+    (tmp_path / "b" / "notes.txt").write_text(".gf_news-c-x {}\n")
+    (tmp_path / "a.css").write_text(".gf_news-c-navbar-ul { }\n")
+
+
+def test_expand_paths(tmp_path):
+    """Test expand_paths()."""
+    _tree(tmp_path)
+
+    actual = chcss.expand_paths(
+        [str(tmp_path / "b"), str(tmp_path / "*.css"), str(tmp_path / "b" / "z.css")]
+    )
+
+    assert actual == [
+        str(tmp_path / "b" / "a.html"),
+        str(tmp_path / "b" / "z.css"),
+        str(tmp_path / "a.css"),
+    ]
+    assert chcss.expand_paths([str(tmp_path / "**" / "*.html")]) == [
+        str(tmp_path / "b" / "a.html"),
+    ]
+
+
+def test_check_files(tmp_path):
+    """Test check_files() in parallel and serially."""
+    _tree(tmp_path)
+    paths = [str(tmp_path), str(tmp_path / "missing.css")]
+
+    parallel = list(chcss.check_files(paths, config, jobs=2))
+    serial = list(chcss.check_files(paths, config, jobs=1))
+
+    assert parallel == serial
+    assert [r.fn for r in parallel] == [
+        str(tmp_path / "a.css"),
+        str(tmp_path / "b" / "a.html"),
+        str(tmp_path / "b" / "z.css"),
+        str(tmp_path / "missing.css"),
+    ]
+    assert [len(r.findings) for r in parallel] == [1, 1, 3, 0]
+    assert parallel[-1].error.endswith("missing.css")
+
+
+def test_check_files_stream(tmp_path):
+    """Test check_files() streaming findings."""
+    _tree(tmp_path)
+    paths = [str(tmp_path), str(tmp_path / "missing.css")]
+    expected = list(chcss.check_files(paths, config, jobs=1))
+
+    streamed = list(chcss.check_files(paths, config, jobs=1, stream=True))
+
+    assert not isinstance(streamed[-2].findings, tuple)
+    assert [r._replace(findings=tuple(r.findings)) for r in streamed] == expected
+
+    # Statistics are counted from collected findings.
+    stats = chcss.Stats()
+    for result in chcss.check_files(paths, config, 1, stats, stream=True):
+        assert isinstance(result.findings, tuple)
+    assert stats.counters["names"] == 5
+
+
+def test_main_paths(tmp_path, capsys):
+    """Test main() with several paths."""
+    _tree(tmp_path)
+
+    assert chcss.main([str(tmp_path / "a.css"), "--jobs", "2"] + cli) == 0
+    assert chcss.main([str(tmp_path), "-j", "2"] + cli) == 1
+    assert capsys.readouterr().out.splitlines()[-2:] == [
+        f"{tmp_path / 'b' / 'a.html'}:1:11: gf_news-c-navbr:"
+        " Expected end of text (at char 9); did you mean 'navbar'?",
+        f"{tmp_path / 'b' / 'z.css'}:2:1: gf_news-c-navbr:"
+        " Expected end of text (at char 9); did you mean 'navbar'?",
+    ]
@@ -64,3 +64,96 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
         actual = capsys.readouterr().out
 
         assert actual == expected
+
+
+def test_load_toml_error(tmp_path, capsys):
+    """Test that an invalid TOML file is reported and ignored."""
+    cfg = tmp_path / "chcss.toml"
+    cfg.write_text('[tool.chcss]\nnamespaces = ["gf_news"\n')
+    conf = chcss.Config()
+    conf.load(["-o", str(cfg), "--no-cache"])
+
+    assert conf.namespaces == []
+    assert f"In configuration file {cfg}" in capsys.readouterr().err
+
+
+def test_config_defaults_not_shared():
+    """Test that configurations do not share their default lists."""
+    conf = chcss.Config()
+    conf.namespaces.append("gf_news")
+    conf.elements.append("x-widget")
+
+    assert chcss.Config().namespaces == []
+    assert "x-widget" not in chcss.Config().elements
+
+
+def test_freeze():
+    """Test Config.freeze()."""
+    conf = chcss.Config(
+        namespaces=["gf_news", "gf_blog", "gf_news"],
+        functions=["c"],
+        components=["navbar", "footer"],
+        modifiers=["reverse"],
+    )
+    frozen = conf.freeze()
+    other = chcss.Config(
+        namespaces=["gf_blog", "gf_news"],
+        functions=["c"],
+        components=["footer", "navbar"],
+        modifiers=["reverse"],
+    ).freeze()
+
+    assert isinstance(frozen, chcss.FrozenConfig)
+    assert frozen == other
+    assert hash(frozen) == hash(other)
+    assert frozen.freeze() is frozen
+    assert frozen.namespaces == frozenset(["gf_news", "gf_blog"])
+    assert frozen.collisions == frozenset(["footer"])
+    assert "footer" not in frozen.elements
+    assert "ul" in frozen.elements
+    assert frozen.separator == "-"
+
+    # Words that are prefixes of others do not collide.
+    prefixes = chcss.Config(
+        namespaces=["gf_news"], functions=["c"], components=["tab", "sect"]
+    )
+    assert prefixes.freeze().collisions == frozenset()
+
+    for backend in ["pyparsing", "dfa"]:
+        conf.backend = backend
+        assert chcss.get_validator(conf) is chcss.get_validator(conf.freeze())
+        assert chcss.get_validator(conf.freeze()).check("gf_news-c-footer").valid
+        prefixes.backend = backend
+        assert chcss.get_validator(prefixes).check("gf_news-c-tab-table").valid
+        assert chcss.get_validator(prefixes).check("gf_news-c-sect-section").valid
+
+
+@pytest.mark.parametrize("word", ["", "nav-bar", 3])
+def test_freeze_invalid(word):
+    """Test that invalid segments are rejected when freezing."""
+    conf = chcss.Config(components=["navbar", word])
+
+    with pytest.raises(ValueError):
+        conf.freeze()
+
+
+def test_main_invalid_segment(tmp_path, monkeypatch, capsys):
+    """Test that the CLI reports invalid segments before checking."""
+    monkeypatch.chdir(tmp_path)
+
+    assert chcss.main(["--components", "nav-bar", "--no-cache"]) == 1
+    assert "Invalid component 'nav-bar'" in capsys.readouterr().err
+
+
+def test_main_collisions(tmp_path, monkeypatch, capsys):
+    """Test that the CLI warns of words both components and elements."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.css").write_text(".gf_news-c-nav-list {}\n")
+    cli = ["--namespaces", "gf_news", "--functions", "c", "--no-cache"]
+    cli += ["--components", "nav,list", "--elements", "list,li", "a.css"]
+
+    assert chcss.main(cli) == 0
+    assert capsys.readouterr().err.endswith(
+        "Warning:  'list' is both a component and an element, so is only"
+        " matched as a component.\n"
+    )
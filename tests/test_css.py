@@ -0,0 +1,121 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""CSS scanner unit tests."""
+
+import io
+
+import pytest
+
+import chcss
+
+stylesheet = """\
+@charset "utf-8";
+@import url(theme.min.css) screen;
+/* .commented { color: red; } */
+.gf_news-c-navbar, div.gf_news-c-footer > a:not(.gf_news-c-list) {
+  background: url(img/sprite.png);
+  content: ".quoted";
+}
+@media (min-width: 1.5em) {
+  .gf_news-c-navbar-ul { margin: 0; }
+}
+@font-face { font-family: "x"; src: url(x.woff); }
+@keyframes spin { 0.5% { opacity: 0; } to { opacity: 1; } }
+a[title='.attr'] .gf_news-c-navbar-li-reverse { }
+.md\\:flex, .\\31 0col {}
+"""
+
+expected = [
+    ("gf_news-c-navbar", 4, 1),
+    ("gf_news-c-footer", 4, 23),
+    ("gf_news-c-list", 4, 49),
+    ("gf_news-c-navbar-ul", 9, 3),
+    ("gf_news-c-navbar-li-reverse", 13, 18),
+    ("md:flex", 14, 1),
+    ("10col", 14, 12),
+]
+
+
+def test_scan_css():
+    """Test scan_css()."""
+    assert list(chcss.scan_css(io.StringIO(stylesheet))) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 11, 64])
+def test_scan_css_chunked(chunk_size):
+    """Test scan_css() with chunks splitting tokens."""
+    actual = list(chcss.scan_css(io.StringIO(stylesheet), chunk_size))
+
+    assert actual == expected
+
+
+def test_css_scanner_unterminated():
+    """Test CSSScanner() with unterminated comments and strings."""
+    scanner = chcss.CSSScanner()
+
+    assert scanner.feed(".a {} /* .b ") == [("a", 1, 1)]
+    assert scanner.feed("*/ .c {} ") == [("c", 1, 16)]
+    assert scanner.feed("[x='.d ") == []
+    assert scanner.feed("'] .e {}", final=True) == [("e", 1, 32)]
+
+
+@pytest.mark.parametrize("mmap_threshold", [None, 1])
+def test_scan_css_file(tmp_path, mmap_threshold):
+    """Test scan_css_file() with stream and memory mapped input."""
+    fn = tmp_path / "a.css"
+    fn.write_text(stylesheet)
+
+    actual = list(chcss.scan_css_file(str(fn), mmap_threshold=mmap_threshold))
+
+    assert actual == expected
+
+
+def test_scan_css_file_minified(tmp_path):
+    """Test scan_css_file() with a minified memory mapped file."""
+    fn = tmp_path / "a.min.css"
+    fn.write_bytes(".\xe9t\xe9{color:red}.b{x:y}@media print{.c{}}".encode())
+
+    actual = list(chcss.scan_css_file(str(fn), mmap_threshold=1))
+
+    # Columns count code points, as for smaller files.
+    assert actual == [("\xe9t\xe9", 1, 1), ("b", 1, 16), ("c", 1, 36)]
+    assert list(chcss.scan_css_file(str(fn), mmap_threshold=None)) == actual
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_css_scanner_binary_columns(chunk_size):
+    """Test that binary and text scanners count the same columns."""
+    text = "/* \xe9 */ .gf_news-c-x{}\n.a{} /* \u65e5\u672c */ .b{}\n" * 2
+    data = text.encode()
+    scanner = chcss.CSSScanner(binary=True)
+    actual = []
+
+    for i in range(0, len(data), chunk_size):
+        actual.extend(scanner.feed(data[i : i + chunk_size]))
+    actual.extend(scanner.feed(b"", final=True))
+
+    assert actual[:3] == [("gf_news-c-x", 1, 9), ("a", 2, 1), ("b", 2, 15)]
+    assert actual == chcss.CSSScanner().scan(text)
+
+
+def test_css_scanner_binary_chunked():
+    """Test a binary CSSScanner() fed in chunks."""
+    data = stylesheet.encode()
+    scanner = chcss.CSSScanner(binary=True)
+    actual = []
+
+    for i in range(0, len(data), 3):
+        actual.extend(scanner.feed(data[i : i + 3]))
+    actual.extend(scanner.feed(b"", final=True))
+
+    assert actual == expected
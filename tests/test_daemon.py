@@ -0,0 +1,231 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Daemon unit tests."""
+
+import io
+import os
+import signal
+import subprocess
+import sys
+
+import pytest
+
+import chcss
+from chcss import daemon
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(daemon.socket, "AF_UNIX"), reason="Unix domain sockets only."
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(chcss.__file__)))
+
+cli = ["--namespaces", "gf_news", "--functions", "c", "--components", "navbar"]
+
+pyproject = """\
+[tool.chcss]
+namespaces = ["gf_news"]
+"""
+
+stylesheet = """\
+.gf_news-c-navbar { }
+.gf_news-c-navbr { }
+"""
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Run a daemon in a subprocess, yielding its socket."""
+    path = str(tmp_path / "chcss.sock")
+    (tmp_path / "pyproject.toml").write_text(pyproject)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (ROOT, env.get("PYTHONPATH")) if path
+    )
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys, chcss; sys.exit(chcss.main(sys.argv[1:]))",
+            "--serve",
+            "--socket",
+            path,
+        ],
+        cwd=tmp_path,
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+    # The daemon is listening once it says so.
+    assert process.stdout.readline() == f"Listening on {path}.\n"
+
+    yield path
+
+    process.send_signal(signal.SIGINT)
+    assert process.wait(10) == 0
+    assert process.stdout.read() == ""
+    assert not os.path.exists(path)
+
+
+def test_forward(server, tmp_path, monkeypatch, capsys):
+    """Test runs forwarded to a daemon."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.css").write_text(stylesheet)
+    args = [*cli, "--no-cache", "a.css"]
+
+    assert chcss.main([*args, "--no-daemon"]) == 1
+    expected = capsys.readouterr()
+
+    for _ in range(2):
+        assert daemon.forward([*args, "--socket", server]) == 1
+        assert capsys.readouterr() == expected
+
+    # STDIN is sent with the run.
+    monkeypatch.setattr(sys, "stdin", io.StringIO(".gf_news-c-navbar { }\n"))
+    assert daemon.forward([*cli, "--no-cache", "--socket", server]) == 0
+    assert capsys.readouterr().out == ""
+
+    # A socket accessible by other users is not trusted.
+    os.chmod(server, 0o666)
+    assert daemon.forward([*args, "--socket", server]) is None
+    os.chmod(server, 0o600)
+
+    # A second daemon refuses the socket.
+    assert chcss.main(["--serve", "--socket", server]) == 1
+    assert capsys.readouterr().err == f"A daemon is already listening on {server}.\n"
+
+
+def test_forward_fallback(tmp_path, monkeypatch, capsys):
+    """Test runs checked in process without a daemon."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text(pyproject)
+    (tmp_path / "a.css").write_text(stylesheet)
+    path = str(tmp_path / "chcss.sock")
+
+    assert daemon.forward([*cli, "--socket", path, "a.css"]) is None
+    assert daemon.forward([*cli, "--socket", path, "--no-daemon", "a.css"]) is None
+    assert chcss.main([*cli, "--no-cache", "--socket", path, "a.css"]) == 1
+    assert "did you mean 'navbar'?" in capsys.readouterr().out
+
+    # Files in the way of the socket are kept.
+    (tmp_path / "chcss.sock").write_text("")
+    assert chcss.main(["--serve", "--socket", path]) == 1
+    assert os.path.exists(path)
+
+
+def test_forward_timeout(tmp_path, monkeypatch, capsys):
+    """Test runs checked in process when the daemon does not answer."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(daemon, "TIMEOUT", 0.1)
+    monkeypatch.setattr(sys, "stdin", io.StringIO(".gf_news-c-navbr { }\n"))
+    path = str(tmp_path / "chcss.sock")
+
+    # A socket that accepts connections but never answers.
+    with daemon.Server(path)._bind():
+        assert daemon.forward([*cli, "--socket", path]) is None
+
+    # STDIN is left for the run in this process.
+    assert chcss.main([*cli, "--no-cache", "--no-daemon"]) == 1
+    assert "did you mean 'navbar'?" in capsys.readouterr().out
+
+
+def test_stalled_client(tmp_path, monkeypatch, capsys):
+    """Test clients that never finish their request are dropped."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text(pyproject)
+    (tmp_path / "a.css").write_text(stylesheet)
+    path = str(tmp_path / "chcss.sock")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (ROOT, env.get("PYTHONPATH")) if path
+    )
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from chcss import daemon; "
+            "sys.exit(daemon.Server(sys.argv[1], timeout=0.5).serve_forever())",
+            path,
+        ],
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stdout.readline() == f"Listening on {path}.\n"
+
+    try:
+        with daemon.socket.socket(daemon.socket.AF_UNIX) as stalled:
+            stalled.connect(path)
+            stalled.sendall(b"{")
+            # The run behind the stalled client is still answered.
+            args = [*cli, "--no-cache", "--socket", path, "a.css"]
+            assert daemon.forward(args) == 1
+            assert "did you mean 'navbar'?" in capsys.readouterr().out
+    finally:
+        process.send_signal(signal.SIGINT)
+        assert process.wait(10) == 0
+
+
+def test_socket_path(tmp_path, monkeypatch):
+    """Test the default socket of the daemon."""
+    uid = os.getuid()
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert daemon.socket_path() == str(tmp_path / f"chcss-{uid}.sock")
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    path = daemon.socket_path()
+    assert path == str(tmp_path / f"chcss-{uid}" / "daemon.sock")
+
+    # The daemon creates the directory, private to its user.
+    with daemon.Server()._bind():
+        assert daemon._trusted(path)
+    assert os.stat(os.path.dirname(path)).st_mode & 0o777 == 0o700
+
+    # Other files are not trusted.
+    (tmp_path / "other.sock").write_text("")
+    os.chmod(tmp_path / "other.sock", 0o600)
+    assert not daemon._trusted(str(tmp_path / "other.sock"))
+    assert not daemon._trusted(str(tmp_path / "missing.sock"))
+
+
+def test_handle(tmp_path):
+    """Test Server() requests."""
+    (tmp_path / "pyproject.toml").write_text(pyproject)
+    (tmp_path / "a.css").write_text(stylesheet)
+    server = daemon.Server(str(tmp_path / "chcss.sock"))
+    cwd = os.getcwd()
+
+    response = server.handle(
+        {
+            "protocol": daemon.PROTOCOL,
+            "args": [*cli, "--no-cache", "-"],
+            "cwd": str(tmp_path),
+            "stdin": stylesheet,
+        }
+    )
+    assert response["status"] == 1
+    assert response["stdout"].startswith("-:2:1: gf_news-c-navbr:")
+    assert response["stderr"] == ""
+    assert os.getcwd() == cwd
+
+    response = server.handle(
+        {"protocol": daemon.PROTOCOL, "args": ["--help"], "cwd": str(tmp_path)}
+    )
+    assert response["status"] == 0
+    assert response["stdout"].startswith("usage:")
+
+    assert "error" in server.handle({"protocol": 0})
+    assert "error" in server.handle({"protocol": daemon.PROTOCOL, "args": []})
+    assert os.getcwd() == cwd
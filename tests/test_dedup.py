@@ -0,0 +1,110 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""Deduplicated checking unit tests."""
+
+import chcss
+
+config = chcss.Config(
+    namespaces=["gf_news"],
+    functions=["c"],
+    components=["navbar", "list"],
+    cache=False,
+)
+
+
+def _tree(root):
+    """Create stylesheets and documents repeating a few names."""
+    for i in range(6):
+        (root / f"f{i}.css").write_text(
+            ".gf_news-c-navbar {}\n.gf_news-c-navbr .x {}\n" * (i + 1)
+        )
+    (root / "a.html").write_text(
+        '<p class="gf_news-c-navbar x">\n<b class="gf_news-c-list">'
+    )
+
+
+def test_occurrence_table():
+    """Test OccurrenceTable() interning, merging, and fan out."""
+    table = chcss.OccurrenceTable()
+    table.add("a.css", [("x", 1, 1), ("y", 1, 5), ("x", 2, 1)])
+    table.add("b.css", error="No such file or directory: b.css")
+
+    other = chcss.OccurrenceTable()
+    other.add("c.css", [("y", 3, 2), ("z", 4, 1)])
+    table.update(other)
+
+    assert table.files == ["a.css", "b.css", "c.css"]
+    assert table.names == ["x", "y", "z"]
+    assert len(table) == 5
+    assert list(table.occurrences("y")) == [("a.css", 1, 5), ("c.css", 3, 2)]
+    assert list(table.occurrences("w")) == []
+
+    verdicts = [chcss.ClassNameResult(name, name != "y") for name in table.names]
+    results = table.results(verdicts)
+
+    assert [(f.line, f.col, f.result.name) for f in results[0].findings] == [
+        (1, 1, "x"),
+        (1, 5, "y"),
+        (2, 1, "x"),
+    ]
+    assert results[0].findings[0].result is results[0].findings[2].result
+    assert results[1] == chcss.FileResult(
+        "b.css", (), "No such file or directory: b.css"
+    )
+    assert [f.fn for f in results[2].findings] == ["c.css", "c.css"]
+
+
+def test_check_files_unique(tmp_path, monkeypatch):
+    """Test that results match those of check_files()."""
+    _tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    paths = [".", "missing.css"]
+    expected = list(chcss.check_files(paths, config, 1))
+
+    for jobs in (1, 3):
+        stats = chcss.Stats()
+        assert list(chcss.check_files_unique(paths, config, jobs, stats)) == expected
+        assert stats.counters["files"] == 8
+        assert len(stats.names) == 4
+
+
+def test_check_files_unique_cache(tmp_path, monkeypatch):
+    """Test reading and storing cached results."""
+    _tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    conf = chcss.Config(**{**vars(config), "cache": True})
+    expected = list(chcss.check_files(["."], config, 1))
+
+    assert list(chcss.check_files_unique(["."], conf, 1)) == expected
+    stats = chcss.Stats()
+    assert list(chcss.check_files(["."], conf, 1, stats)) == expected
+    assert stats.counters["result_cache_hits"] == 7
+
+    (tmp_path / "f0.css").write_text(".gf_news-c-list {}\n")
+    results = {r.fn: r for r in chcss.check_files_unique(["."], conf, 1)}
+    changed = results.pop("./f0.css")
+    assert list(results.values()) == [r for r in expected if r.fn != "./f0.css"]
+    assert [f.result.valid for f in changed.findings] == [True]
+
+
+def test_main_dedup(tmp_path, monkeypatch, capsys):
+    """Test the --dedup option."""
+    _tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    args = ["--namespaces", "gf_news", "--functions", "c", "--components", "navbar"]
+    args += ["--no-cache", "--no-daemon", "--jobs", "1", "."]
+
+    assert chcss.main(args) == 1
+    expected = capsys.readouterr().out
+    assert chcss.main(["--dedup", *args]) == 1
+    assert capsys.readouterr().out == expected
@@ -0,0 +1,145 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""DFA backend unit tests."""
+
+import pyparsing as pp
+import pytest
+
+import chcss
+
+config = chcss.Config(
+    namespaces=["gf_accounts", "gf_blog", "gf_content", "gf_news"],
+    functions=["c", "l"],
+    components=["navbar", "footer", "list"],
+    elements=["a", "ul", "li", "footer"],
+    modifiers=["reverse"],
+)
+
+frozen = config.freeze()
+vocabularies = (
+    frozen.namespaces,
+    frozen.functions,
+    frozen.components,
+    frozen.elements,
+    frozen.modifiers,
+)
+
+names = [
+    "gf_news",
+    "gf_news-",
+    "gf_news-c",
+    "gf_news--c",
+    "gfnews-c",
+    "gf_news-d",
+    "gf_news-c-navbar",
+    "gf_news-c-form",
+    "gf_news-c-navbar-list",
+    "gf_news-c-list-navbar",
+    "gf_news-c-navbar-ul",
+    "gf_news-c-navbar-ul-li",
+    "gf_news-c-navbar-ul-reverse",
+    "gf_news-c-navbar-ul-reverse-reverse",
+    "gf_news-c-navbar-ul-inverse",
+    "gf_news-c-navbar-footer",
+    "gf_news-c-navbar-footer-reverse",
+    "gf_news-c-navbar-ul-reverse-double",
+    "gf_news-c-navbar-",
+    "",
+]
+
+
+# Vocabularies with words that are prefixes of others, of the same and
+# of following segments.
+prefixes = (
+    ("gf", "gf_news"),
+    ("c",),
+    ("nav", "tab"),
+    ("navbar", "table", "a", "ab"),
+    ("a", "ab"),
+)
+
+prefix_names = [
+    "gf_news-c-tab-table",
+    "gf_news-c-nav-navbar",
+    "gf-c-nav-navbar-ab",
+    "gf-c-nav-navbar-a-ab",
+    "gf-c-tab-tabl",
+    "gf-c-navbar",
+    "gf_new-c",
+    "gf_news",
+    "gf_news-",
+    "gf_news-cc",
+    " gf-c",
+    "gf- c",
+]
+
+
+@pytest.mark.parametrize(
+    "vocabulary,name",
+    [(vocabularies, name) for name in names]
+    + [(prefixes, name) for name in prefix_names],
+)
+def test_dfa_matches_reference(vocabulary, name):
+    """Test that the DFA backend accepts the reference language.
+
+    Both backends also report failures at the same location with the
+    same message.
+    """
+    expected = chcss.Validator(*vocabulary).check(name)
+    actual = chcss.DFAValidator(*vocabulary).check(name)
+
+    assert actual == expected
+
+
+def test_dfa_segments():
+    """Test the segments returned by the DFA backend."""
+    dfa = chcss.DFAValidator(*vocabularies)
+
+    assert dfa.parse("gf_news-c-navbar-ul-reverse") == [
+        "gf_news",
+        "c",
+        "navbar",
+        "ul",
+        "reverse",
+    ]
+
+
+def test_dfa_failure_location():
+    """Test the failure location reported by the DFA backend."""
+    dfa = chcss.DFAValidator(*vocabularies)
+
+    with pytest.raises(pp.ParseException) as error:
+        dfa.parse("gf_news-c-navbr")
+
+    assert error.value.loc == 9
+    assert error.value.msg == "Expected end of text"
+
+    with pytest.raises(pp.ParseException) as error:
+        dfa.parse("gf_news-d")
+
+    assert error.value.loc == 8
+    assert error.value.msg == "Expected 'c' | 'l'"
+
+
+def test_backend_option():
+    """Test selection of the backend through the configuration."""
+    conf = chcss.Config()
+    conf.load(["--backend", "dfa", "--no-cache"])
+
+    assert conf.backend == "dfa"
+    assert isinstance(chcss.get_validator(conf), chcss.DFAValidator)
+
+    conf.backend = "unknown"
+
+    with pytest.raises(ValueError):
+        chcss.get_validator(conf)
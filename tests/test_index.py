@@ -0,0 +1,134 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""Hierarchy index unit tests."""
+
+import json
+import pickle
+
+import pytest
+
+import chcss
+
+
+def _index():
+    index = chcss.HierarchyIndex()
+    identifiers = [
+        (chcss.Identifier("gf_news", "c", ("navbar",)), ("a.css", 1, 1)),
+        (chcss.Identifier("gf_news", "c", ("navbar", "list"), "li"), ("a.css", 2, 1)),
+        (
+            chcss.Identifier("gf_news", "l", ("list",), "ul", ("reverse",)),
+            ("b.css", 3, 5),
+        ),
+        (chcss.Identifier("gf_blog", "c", ("navbar",), "a"), ("b.css", 4, 1)),
+        (chcss.Identifier("gf_news", "c", ("navbar",)), ("b.css", 5, 1)),
+    ]
+
+    for identifier, location in identifiers:
+        index.add(identifier._replace(location=location))
+
+    return index
+
+
+def _locations(identifiers):
+    return sorted(identifier.location for identifier in identifiers)
+
+
+def test_find():
+    """Test HierarchyIndex() queries."""
+    index = _index()
+
+    assert len(index) == 5
+    assert index.files == ["a.css", "b.css"]
+    assert len(list(index.find())) == 5
+    assert _locations(index.find(namespace="gf_news")) == [
+        ("a.css", 1, 1),
+        ("a.css", 2, 1),
+        ("b.css", 3, 5),
+        ("b.css", 5, 1),
+    ]
+    assert _locations(index.find(component="navbar")) == [
+        ("a.css", 1, 1),
+        ("a.css", 2, 1),
+        ("b.css", 4, 1),
+        ("b.css", 5, 1),
+    ]
+    assert _locations(index.find(namespace="gf_news", component="list")) == [
+        ("a.css", 2, 1),
+        ("b.css", 3, 5),
+    ]
+    assert _locations(index.find(element="li")) == [("a.css", 2, 1)]
+    assert _locations(index.find(function="l", modifier="reverse")) == [("b.css", 3, 5)]
+    assert list(index.find(namespace="gf_blog", element="li")) == []
+    assert list(index.find(namespace="gf_accounts")) == []
+
+    (identifier,) = index.find(element="ul")
+    assert identifier == chcss.Identifier(
+        "gf_news", "l", ("list",), "ul", ("reverse",), ("b.css", 3, 5)
+    )
+
+
+def test_save_load(tmp_path):
+    """Test HierarchyIndex() save and load."""
+    fn = tmp_path / "index"
+    index = _index()
+    index.save(fn)
+    loaded = chcss.HierarchyIndex.load(fn)
+
+    assert len(loaded) == len(index)
+    assert list(loaded.find()) == list(index.find())
+
+    loaded.add(chcss.Identifier("gf_blog", "c", location=("a.css", 9, 1)))
+    assert loaded.files == ["a.css", "b.css"]
+
+    # Indexes are data, validated when loaded.
+    assert json.loads(fn.read_text())["files"] == ["a.css", "b.css"]
+
+    for data in (
+        b"not an index",
+        pickle.dumps(index),
+        b'{"format": 1}',
+        b'{"format": 2, "files": ["a.css"], "root": [[], [[7, "gf_news", [[], []]]]]}',
+        b'{"format": 2, "files": ["a.css"], "root": [[1, 2, 3], []]}',
+        b'{"format": 2, "files": ["a.css"], "root": [[0, 1], []]}',
+        b'{"format": 2, "files": [1], "root": [[], []]}',
+        b'{"format": 2, "files": ["a.css"], "root": [[], [[0, 5, [[], []]]]]}',
+        b"[" * 100000,
+    ):
+        fn.write_bytes(data)
+        with pytest.raises(ValueError):
+            chcss.HierarchyIndex.load(fn)
+
+
+def test_main_index(tmp_path, monkeypatch, capsys):
+    """Test writing and querying an index from the CLI."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.css").write_text(
+        ".gf_news-c-navbar {}\n.gf_news-c-navbr {}\n.gf_news-c-list-li {}\n"
+    )
+    cli = ["--namespaces", "gf_news", "--functions", "c"]
+    cli += ["--components", "navbar,list", "--elements", "li", "--no-cache"]
+
+    assert chcss.main(cli + ["--index", "index", "a.css"]) == 1
+    capsys.readouterr()
+
+    assert chcss.main(cli + ["--index", "index", "--query", "component=list"]) == 0
+    assert capsys.readouterr().out == "a.css:3:1: gf_news-c-list-li\n"
+
+    assert chcss.main(cli + ["--index", "index", "--query", "element=a"]) == 1
+    assert "gf_news" not in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        chcss.main(cli + ["--index", "index", "--query", "block=list"])
+
+    assert chcss.main(cli + ["--query", "component=list"]) == 1
+    assert capsys.readouterr().err.endswith("--query requires --index.\n")
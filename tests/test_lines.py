@@ -0,0 +1,69 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Line index unit tests."""
+
+import random
+
+import pytest
+
+import chcss
+
+
+def _locate(text, pos):
+    """Locate a position by counting newlines from the start."""
+    line = text.count("\n", 0, pos) + 1
+    return line, pos - text.rfind("\n", 0, pos)
+
+
+def test_line_index():
+    """Test LineIndex() against counting newlines."""
+    rng = random.Random(0)
+    text = "".join(rng.choice("ab\n") for _ in range(2000))
+    index = chcss.LineIndex(text)
+
+    assert len(index) == text.count("\n") + 1
+    for pos in range(len(text) + 1):
+        assert index.locate(pos) == _locate(text, pos)
+
+    # Chunks as they are read.
+    chunked = chcss.LineIndex()
+    for i in range(0, len(text), 97):
+        chunked.feed(text[i : i + 97])
+    assert chunked.starts == index.starts
+
+    assert chcss.LineIndex("").locate(0) == (1, 1)
+    assert chcss.LineIndex("\n\n").locate(2) == (3, 1)
+
+
+def test_line_index_offset():
+    """Test LineIndex() of a text starting within another."""
+    index = chcss.LineIndex("ab\ncd", line=10, column=5)
+
+    assert index.locate(1) == (10, 6)
+    assert index.locate(3) == (11, 1)
+    assert index.locate(4) == (11, 2)
+
+
+def test_line_index_code_points():
+    """Test that LineIndex() columns count code points."""
+    data = "é\n.a {}\n\n.é {}\n"
+    index = chcss.LineIndex(data)
+
+    assert index.starts == [0, 2, 8, 9, 15]
+    assert index.locate(data.index(".é") + 1) == (4, 2)
+    assert index.locate(data.index("é {}") + 2) == (4, 4)
+
+    # Only strings are indexed.
+    with pytest.raises(TypeError):
+        chcss.LineIndex(data.encode("utf-8"))
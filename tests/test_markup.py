@@ -0,0 +1,76 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""HTML scanner unit tests."""
+
+import io
+
+import pytest
+
+import chcss
+
+document = """\
+<!DOCTYPE html>
+<html>
+{# <div class="commented"> #}
+<nav class="gf_news-c-navbar">
+  <ul class="gf_news-c-navbar-ul {% if rev %}gf_news-c-navbar-ul-reverse{% endif %}">
+    <li class='gf_news-c-navbar-li btn-{{ size }}'
+        id="x" class="gf_news-c-list"><a href="#" class=gf_news-c-navbar-a>x</a>
+    {% for i in items %}<li class="{% if i == "y" %}gf_news-c-footer{% endif %}">
+  </ul>
+  <img class="
+    gf_news-c-list-li" />
+  <script>if (x) {{ y: ".nope" }}</script>
+</nav>
+"""
+
+expected = [
+    ("gf_news-c-navbar", 4, 13),
+    ("gf_news-c-navbar-ul", 5, 14),
+    ("gf_news-c-navbar-ul-reverse", 5, 46),
+    ("gf_news-c-navbar-li", 6, 16),
+    ("gf_news-c-list", 7, 23),
+    ("gf_news-c-navbar-a", 7, 57),
+    ("gf_news-c-footer", 8, 53),
+    ("gf_news-c-list-li", 11, 5),
+]
+
+
+def test_scan_html():
+    """Test scan_html()."""
+    assert list(chcss.scan_html(io.StringIO(document))) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 11, 64])
+def test_scan_html_chunked(chunk_size):
+    """Test scan_html() with chunks splitting tags."""
+    actual = list(chcss.scan_html(io.StringIO(document), chunk_size))
+
+    assert actual == expected
+
+
+def test_check_file_html(tmp_path):
+    """Test check_file() selecting the HTML scanner by extension."""
+    config = chcss.Config(
+        namespaces=["gf_news"],
+        functions=["c"],
+        components=["navbar"],
+    )
+
+    fn = tmp_path / "page.jinja2"
+    fn.write_text(document)
+
+    actual = list(chcss.check_file(str(fn), config))
+
+    assert [f.result.name for f in actual] == [name for name, _, _ in expected]
+    assert actual[0].result.valid
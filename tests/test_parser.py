@@ -12,15 +12,57 @@
 
 """Parser unit tests."""
 
+import pickle
 import types
 
 import chcss
 
+config = chcss.Config(
+    namespaces=[
+        "gf_accounts",
+        "gf_blog",
+        "gf_content",
+        "gf_news",
+    ],
+    functions=[
+        "c",
+        "l",
+    ],
+    components=[
+        "navbar",
+        "footer",
+        "list",
+    ],
+    elements=[
+        "a",
+        "ul",
+        "li",
+    ],
+    modifiers=[
+        "reverse",
+    ],
+)
+
 
 def test_parser_interface():
     """Test existence of functions and classes of the parser."""
     assert isinstance(chcss.main, types.FunctionType)
     assert isinstance(chcss.parse_class_name, types.FunctionType)
+    assert isinstance(chcss.get_validator, types.FunctionType)
+
+
+def test_get_validator_cache():
+    """Test that validators are shared by identical vocabularies."""
+    other = chcss.Config(
+        namespaces=list(config.namespaces),
+        functions=list(config.functions),
+        components=list(config.components),
+        elements=list(config.elements),
+        modifiers=list(config.modifiers),
+    )
+
+    assert chcss.get_validator(config) is chcss.get_validator(other)
+    assert chcss.get_validator(config) is not chcss.get_validator(chcss.Config())
 
 
 def test_parse_class_name():
@@ -74,4 +116,93 @@ def test_parse_class_name():
     ]
 
     for name in names:
-        assert chcss.parse_class_name(name[0]) is name[1]
+        assert chcss.parse_class_name(name[0], config) is name[1]
+
+
+def test_parse_class_names(capsys):
+    """Test parse_class_names()."""
+    names = (
+        name
+        for name in [
+            "gf_news-c-navbar-li-reverse",
+            "gf_news-c-navbr",
+            "gfnews-c",
+        ]
+    )
+
+    for backend in ["pyparsing", "dfa"]:
+        conf = chcss.Config(**{**vars(config), "backend": backend})
+        actual = list(chcss.parse_class_names(names, conf))
+        names = [result.name for result in actual]
+
+        assert [result.valid for result in actual] == [True, False, False]
+        assert actual[0].identifier == chcss.Identifier(
+            "gf_news", "c", ("navbar",), "li", ("reverse",)
+        )
+        assert actual[0].loc is None
+        assert actual[1].identifier is None
+        assert actual[1].loc > 0
+        assert actual[2].loc == 0
+        assert isinstance(actual[2].msg, str)
+
+    assert capsys.readouterr().out == ""
+
+
+def test_verdict_cache():
+    """Test VerdictCache() memoization, eviction, and counters."""
+    cache = chcss.VerdictCache(chcss.get_validator(config), 2)
+
+    first = cache.check("gf_news-c-navbar")
+    assert cache.check("gf_news-c-navbar") is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.check("gf_news-c-navbr")
+    cache.check("gf_news-c-navbar")
+    cache.check("gf_news-c-list")
+
+    # The least recently used result was evicted.
+    assert len(cache) == 2
+    cache.check("gf_news-c-navbr")
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+
+def test_get_checker():
+    """Test get_checker()."""
+    conf = chcss.Config(**{**vars(config), "verdict_cache_size": 16})
+
+    assert chcss.get_checker(conf) is chcss.get_checker(conf)
+    assert chcss.get_checker(conf).validator is chcss.get_validator(conf)
+    assert chcss.get_checker(conf).maxsize == 16
+
+    conf.verdict_cache_size = 0
+    assert chcss.get_checker(conf) is chcss.get_validator(conf)
+
+
+def test_identifier():
+    """Test the Identifier() produced by both backends."""
+    names = {
+        "gf_news-c": chcss.Identifier("gf_news", "c"),
+        "gf_news-c-navbar-list": chcss.Identifier("gf_news", "c", ("navbar", "list")),
+        "gf_news-c-list-ul-reverse-reverse": chcss.Identifier(
+            "gf_news", "c", ("list",), "ul", ("reverse", "reverse")
+        ),
+    }
+
+    for backend in ["pyparsing", "dfa"]:
+        conf = chcss.Config(**{**vars(config), "backend": backend})
+
+        for result in chcss.parse_class_names(names, conf):
+            assert result.identifier == names[result.name]
+            assert str(result.identifier) == result.name
+
+    identifier = names["gf_news-c-list-ul-reverse-reverse"]
+    assert identifier.segments == ("gf_news", "c", "list", "ul", "reverse", "reverse")
+    assert not hasattr(identifier, "__dict__")
+    assert pickle.loads(pickle.dumps(identifier)) == identifier
+
+    finding = chcss.Finding("a.css", 3, 5, chcss.ClassNameResult("x", True, identifier))
+    assert finding.identifier.location == ("a.css", 3, 5)
+    assert finding.identifier[:5] == identifier[:5]
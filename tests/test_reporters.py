@@ -0,0 +1,188 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Reporter unit tests."""
+
+import io
+import json
+
+import pytest
+
+import chcss
+from chcss.reporters import REPORTERS
+from chcss.reporters import JSONLinesReporter
+from chcss.reporters import Reporter
+from chcss.reporters import SARIFReporter
+from chcss.reporters import TextReporter
+
+config = chcss.Config(
+    namespaces=["gf_news"],
+    functions=["c"],
+    components=["navbar"],
+    cache=False,
+)
+
+cli = [
+    "--namespaces",
+    "gf_news",
+    "--functions",
+    "c",
+    "--components",
+    "navbar",
+    "--no-cache",
+    "--no-daemon",
+]
+
+
+def _results():
+    check = chcss.get_validator(config).check
+    return [
+        chcss.FileResult(
+            "dir/a b.css",
+            (
+                chcss.Finding("dir/a b.css", 1, 1, check("gf_news-c-navbar")),
+                chcss.Finding("dir/a b.css", 2, 3, check("gf_news-c-navbr")),
+            ),
+        ),
+        chcss.FileResult("missing.css", error="No such file: missing.css"),
+    ]
+
+
+def _report(reporter, suggester=None):
+    stream = io.StringIO()
+    with reporter(stream) as r:
+        failed = [r.report(result, suggester) for result in _results()]
+
+    return failed, stream.getvalue()
+
+
+def test_reporter():
+    """Test that Reporter() subclasses must write diagnostics."""
+    with pytest.raises(TypeError):
+        Reporter()
+
+    class Partial(Reporter):
+        def error(self, result):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
+
+    # Findings are read once, as they are reported.
+    findings = iter(_results()[0].findings)
+    assert TextReporter(io.StringIO()).report(chcss.FileResult("a.css", findings))
+    assert next(findings, None) is None
+
+
+def test_text_reporter():
+    """Test TextReporter()."""
+    failed, text = _report(TextReporter, chcss.Suggester(config))
+
+    assert failed == [True, True]
+    assert text == (
+        "dir/a b.css:2:3: gf_news-c-navbr: Expected end of text (at char 9)"
+        "; did you mean 'navbar'?\n"
+        "No such file: missing.css\n"
+    )
+
+
+def test_json_lines_reporter():
+    """Test JSONLinesReporter()."""
+    failed, text = _report(JSONLinesReporter, chcss.Suggester(config))
+
+    assert failed == [True, True]
+    assert [json.loads(line) for line in text.splitlines()] == [
+        {
+            "file": "dir/a b.css",
+            "line": 2,
+            "column": 3,
+            "name": "gf_news-c-navbr",
+            "message": "Expected end of text (at char 9)",
+            "suggestion": "navbar",
+        },
+        {"file": "missing.css", "error": "No such file: missing.css"},
+    ]
+
+
+def test_sarif_reporter():
+    """Test SARIFReporter()."""
+    failed, text = _report(SARIFReporter)
+    log = json.loads(text)
+    run = log["runs"][0]
+
+    assert failed == [True, True]
+    assert log["version"] == "2.1.0"
+    assert run["tool"]["driver"]["name"] == "chcss"
+    assert run["columnKind"] == "unicodeCodePoints"
+    assert [result["ruleId"] for result in run["results"]] == [
+        "invalid-identifier",
+        "unchecked-file",
+    ]
+    assert run["results"][0]["locations"][0]["physicalLocation"] == {
+        "artifactLocation": {"uri": "dir/a%20b.css"},
+        "region": {"startLine": 2, "startColumn": 3},
+    }
+    assert run["results"][0]["message"]["text"] == (
+        "gf_news-c-navbr: Expected end of text (at char 9)"
+    )
+
+    # Results are written as they are reported.
+    stream = io.StringIO()
+    with SARIFReporter(stream) as reporter:
+        reporter.report(_results()[0])
+        assert "gf_news-c-navbr" in stream.getvalue()
+
+    # An empty log is valid.
+    stream = io.StringIO()
+    with SARIFReporter(stream):
+        pass
+    assert json.loads(stream.getvalue())["runs"][0]["results"] == []
+
+
+def test_sarif_reporter_columns(tmp_path):
+    """Test that SARIF columns count code points, however files are read."""
+    fn = tmp_path / "a.css"
+    fn.write_text("/* \xe9\u65e5 */ .gf_news-c-navbr {}\n", encoding="utf-8")
+    regions = []
+
+    for mmap_threshold in (None, 1):
+        result = chcss.FileResult(
+            "a.css",
+            tuple(chcss.check_file(str(fn), config, mmap_threshold=mmap_threshold)),
+        )
+        stream = io.StringIO()
+        with SARIFReporter(stream) as reporter:
+            reporter.report(result)
+        run = json.loads(stream.getvalue())["runs"][0]
+        regions.append(run["results"][0]["locations"][0]["physicalLocation"])
+
+    assert regions[0] == regions[1]
+    assert regions[0]["region"] == {"startLine": 1, "startColumn": 10}
+
+
+def test_main_format(tmp_path, monkeypatch, capsys):
+    """Test main() with --format."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.css").write_text(".gf_news-c-navbar {}\n.gf_news-c-navbr {}\n")
+
+    assert sorted(REPORTERS) == ["jsonl", "sarif", "text"]
+
+    # Configuration diagnostics do not mix with the report.
+    assert chcss.main([*cli, "--format", "jsonl", "a.css"]) == 1
+    out, err = capsys.readouterr()
+    assert json.loads(out)["name"] == "gf_news-c-navbr"
+    assert "Unable to find configuration file" in err
+
+    assert chcss.main([*cli, "--format", "sarif", "a.css"]) == 1
+    out, err = capsys.readouterr()
+    assert len(json.loads(out)["runs"][0]["results"]) == 1
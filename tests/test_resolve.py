@@ -0,0 +1,139 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""Per-directory configuration resolution unit tests."""
+
+import chcss
+from chcss.resolve import ConfigResolver
+
+config = chcss.Config(
+    namespaces=["gf_news"],
+    functions=["c"],
+    components=["navbar"],
+    cache=False,
+)
+
+
+def _tree(root):
+    """Create a tree of packages with their own configuration files."""
+    (root / "pkg" / "sub" / "deeper").mkdir(parents=True)
+    (root / "pkg" / "bad").mkdir()
+    (root / "pyproject.toml").write_text('[tool.chcss]\nnamespaces = ["gf_news"]\n')
+    (root / "pkg" / "pyproject.toml").write_text('[project]\nname = "pkg"\n')
+    (root / "pkg" / "sub" / "package.json").write_text(
+        '{"name": "sub", "chcss": {"namespaces": ["gf_blog"], "syntax": "html"}}'
+    )
+    (root / "pkg" / "bad" / "pyproject.toml").write_text(
+        "[tool.chcss]\nnamespaces = [\n"
+    )
+
+    for fn in (
+        "a.css",
+        "pkg/b.css",
+        "pkg/sub/c.css",
+        "pkg/sub/deeper/d.css",
+        "pkg/bad/e.css",
+    ):
+        (root / fn).write_text(".gf_news-c-navbar {}\n.gf_blog-c-navbar {}\n")
+
+
+def test_resolve(tmp_path, monkeypatch):
+    """Test resolving the nearest configuration file of each file."""
+    _tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    resolver = ConfigResolver(config, ["--no-cache"])
+
+    conf, cache = resolver.resolve("a.css")
+    assert conf.namespaces == ["gf_news"]
+    assert conf.components == ["navbar"]
+    assert cache is None
+
+    # A pyproject.toml without a [tool.chcss] section is skipped.
+    assert resolver.resolve("pkg/b.css") is resolver.resolve("a.css")
+
+    conf, _ = resolver.resolve("pkg/sub/c.css")
+    assert (conf.namespaces, conf.syntax) == (["gf_blog"], "html")
+    assert conf.components == ["navbar"]
+    assert config.namespaces == ["gf_news"]
+
+    # Files under one configuration file share its resolution.
+    assert resolver.resolve("pkg/sub/deeper/d.css") is resolver.resolve(
+        str(tmp_path / "pkg" / "sub" / "c.css")
+    )
+
+
+def test_resolve_cli(tmp_path, monkeypatch):
+    """Test that CLI options replace those of every configuration file."""
+    _tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    resolver = ConfigResolver(config, ["--no-cache", "--namespaces", "gf_x"])
+
+    assert resolver.resolve("pkg/sub/c.css")[0].namespaces == ["gf_x"]
+    assert resolver.resolve("pkg/sub/c.css")[0].syntax == "html"
+
+
+def test_resolve_invalid(tmp_path, monkeypatch, capsys):
+    """Test falling back on the configuration of the run."""
+    _tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    resolver = ConfigResolver(config, ["--no-cache"])
+
+    assert resolver.resolve("pkg/bad/e.css") is resolver.resolve_default()
+    assert resolver.resolve_default()[0] is config
+    assert "pkg/bad/pyproject.toml" in capsys.readouterr().err
+
+
+def test_check_files_resolver(tmp_path, monkeypatch):
+    """Test checking files with their own configurations, in workers too."""
+    _tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    resolver = ConfigResolver(config, ["--no-cache"])
+    files = ["a.css", "pkg/b.css", "pkg/sub/deeper/d.css"]
+
+    for jobs in (1, 2):
+        results = list(chcss.check_files(files, config, jobs, resolver=resolver))
+        invalid = [
+            [f.result.name for f in result.findings if not f.result.valid]
+            for result in results
+        ]
+
+        # d.css is checked as HTML, so has no class attributes.
+        assert invalid == [["gf_blog-c-navbar"], ["gf_blog-c-navbar"], []]
+
+
+def test_main_discover(tmp_path, monkeypatch, capsys):
+    """Test the --discover option."""
+    _tree(tmp_path)
+    (tmp_path / "pkg" / "sub" / "package.json").write_text(
+        '{"chcss": {"namespaces": ["gf_news", "gf_blog"]}}'
+    )
+    monkeypatch.chdir(tmp_path)
+    args = ["--functions", "c", "--components", "navbar", "--no-cache"]
+    args += ["--no-daemon", "--jobs", "1"]
+
+    assert chcss.main([*args, "pkg/sub"]) == 1
+    assert "gf_blog-c-navbar" in capsys.readouterr().out
+    assert chcss.main([*args, "--discover", "pkg/sub"]) == 0
+    assert "gf_blog-c-navbar" not in capsys.readouterr().out
+
+
+def test_resolve_collisions(tmp_path, monkeypatch, capsys):
+    """Test warnings of words both components and elements."""
+    _tree(tmp_path)
+    (tmp_path / "pkg" / "sub" / "package.json").write_text(
+        '{"chcss": {"elements": ["navbar", "li"]}}'
+    )
+    monkeypatch.chdir(tmp_path)
+    resolver = ConfigResolver(config, ["--no-cache"])
+
+    assert resolver.resolve("pkg/sub/c.css")[0].elements == ["navbar", "li"]
+    assert "package.json:  Warning:  'navbar' is both" in capsys.readouterr().err
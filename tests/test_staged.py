@@ -0,0 +1,186 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Staged changes mode unit tests."""
+
+import os
+import subprocess
+
+import pytest
+
+import chcss
+from chcss.staged import check_staged
+from chcss.staged import parse_diff
+
+config = chcss.Config(
+    namespaces=["gf_news"],
+    functions=["c"],
+    components=["navbar"],
+    elements=["ul", "li"],
+    cache=False,
+)
+
+cli = [
+    "--namespaces",
+    "gf_news",
+    "--functions",
+    "c",
+    "--components",
+    "navbar",
+    "--no-cache",
+    "--no-daemon",
+]
+
+diff = """\
+diff --git a/a.css b/a.css
+index 1111111..2222222 100644
+--- a/a.css
++++ b/a.css
+@@ -3,0 +4,2 @@ .x {}
++.gf_news-c-navbr {}
++.gf_news-c-navbar {}
+@@ -9 +11 @@
+-.old {}
++.new {}
+@@ -20,2 +21,0 @@
+-.gone {}
+-.gone {}
+diff --git a/only-deleted.css b/only-deleted.css
+--- a/only-deleted.css
++++ b/only-deleted.css
+@@ -1 +0,0 @@
+-.gone {}
+diff --git "a/sp\\303\\251cial.html" "b/sp\\303\\251cial.html"
+--- "a/sp\\303\\251cial.html"
++++ "b/sp\\303\\251cial.html"
+@@ -1 +1 @@
+-<p>
++<p class="x">
+"""
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=chcss", "-c", "user.email=chcss@localhost", *args],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """Create a git repository with a committed stylesheet."""
+    monkeypatch.chdir(tmp_path)
+    for name in list(os.environ):
+        if name.startswith("GIT_"):
+            monkeypatch.delenv(name)
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "a.css").write_text(
+        "".join(f".gf_news-c-navbr{i} {{ }}\n" for i in range(10))
+    )
+    (tmp_path / "b.txt").write_text("text\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "Initial.")
+
+    return tmp_path
+
+
+def test_parse_diff():
+    """Test parse_diff()."""
+    assert parse_diff(diff) == {
+        "a.css": [(4, 5), (11, 11)],
+        "spécial.html": [(1, 1)],
+    }
+    assert parse_diff("") == {}
+
+    # Added lines looking like headers are part of their hunk.
+    tricky = """\
+diff --git a/b.css b/b.css
+--- a/b.css
++++ b/b.css
+@@ -1,0 +2,4 @@
++++ b/other.css
++@@ -1 +90,9 @@
++-- a/b.css
++diff --git a/x b/x
+@@ -7 +10,0 @@
+-.gone {}
+@@ -9,0 +12 @@
++\f.gf_news-c-navbar {}
+"""
+    assert parse_diff(tricky) == {"b.css": [(2, 5), (12, 12)]}
+
+
+def test_check_staged(repo):
+    """Test check_staged()."""
+    assert list(check_staged(config)) == []
+
+    lines = (repo / "a.css").read_text().splitlines(keepends=True)
+    lines[2] = ".gf_news-c-navbar, .gf_news-c-navbr {}\n"
+    lines.insert(
+        6,
+        "/* .gf_news-c-comment */ .gf_news-c-navbar-ul,\n.gf_news-c-navbar-li {}\n",
+    )
+    (repo / "a.css").write_text("".join(lines))
+    (repo / "sub").mkdir()
+    (repo / "sub" / "c.html").write_text('<p\n  class="gf_news-c x">\n')
+    (repo / "b.txt").write_text(".gf_news-c-navbr {}\n")
+    _git(repo, "add", ".")
+
+    # Changes not staged are ignored.
+    (repo / "a.css").write_text(".gf_news-c-navbr {}\n" * 20)
+
+    results = list(check_staged(config))
+    assert [result.fn for result in results] == ["a.css", "sub/c.html"]
+    assert [
+        (f.line, f.col, f.result.name, f.result.valid) for f in results[0].findings
+    ] == [
+        (3, 1, "gf_news-c-navbar", True),
+        (3, 20, "gf_news-c-navbr", False),
+        (7, 26, "gf_news-c-navbar-ul", True),
+        (8, 1, "gf_news-c-navbar-li", True),
+    ]
+    assert [(f.line, f.col, f.result.name) for f in results[1].findings] == [
+        (2, 10, "gf_news-c"),
+        (2, 20, "x"),
+    ]
+
+    # Paths limit the files, relative to the current directory.
+    assert [result.fn for result in check_staged(config, ["sub"])] == ["sub/c.html"]
+    assert [result.fn for result in check_staged(config, ["b.txt"])] == ["b.txt"]
+
+
+def test_main_staged(repo, capsys):
+    """Test main() with --staged."""
+    (repo / "a.css").write_text(".gf_news-c-navbar {}\n.gf_news-c-navbr {}\n")
+    _git(repo, "add", "a.css")
+
+    assert chcss.main([*cli, "--staged"]) == 1
+    assert capsys.readouterr().out == (
+        "a.css:2:1: gf_news-c-navbr: Expected end of text (at char 9)"
+        "; did you mean 'navbar'?\n"
+    )
+
+    (repo / "a.css").write_text(".gf_news-c-navbar {}\n")
+    _git(repo, "add", "a.css")
+    assert chcss.main([*cli, "--staged"]) == 0
+
+
+def test_main_staged_outside_repository(tmp_path, monkeypatch, capsys):
+    """Test main() with --staged outside a git repository."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.parent))
+
+    assert chcss.main([*cli, "--staged"]) == 1
+    assert capsys.readouterr().err.splitlines()[-1].startswith("git rev-parse failed:")
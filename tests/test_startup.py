@@ -0,0 +1,102 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""CLI startup unit tests."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import chcss
+
+# Modules the CLI must not import unless a run needs them.
+DEFERRED = ("pyparsing", "toml", "tomllib", "concurrent.futures", "html.parser")
+
+# Loose bound on the cumulative import time of the CLI module, in
+# microseconds, to catch gross regressions on slow runners;
+# ``DEFERRED`` guards the expensive imports precisely.
+IMPORT_BUDGET_US = 100000
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(chcss.__file__)))
+
+
+def _importtime(code, *args, cwd=None):
+    """Run Python code with ``-X importtime``, returning import times by module."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (ROOT, env.get("PYTHONPATH")) if path
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def _run(*args, cwd=None):
+    """Run the CLI with ``-X importtime``."""
+    code = "import sys, chcss; sys.exit(chcss.main(sys.argv[1:]))"
+
+    return _importtime(code, *args, cwd=cwd)
+
+
+@pytest.mark.parametrize("args", [["--help"], ["--show-license"]])
+def test_startup_imports(args):
+    """Test that information options import no deferred modules."""
+    times = _run(*args)
+
+    assert "chcss.config" in times
+    assert not set(DEFERRED) & set(times)
+
+
+def test_cache_hit_imports(tmp_path):
+    """Test that runs answered from the caches import no deferred modules."""
+    cfg = tmp_path / "pyproject.toml"
+    cfg.write_text('[tool.chcss]\nnamespaces = ["gf_news"]\nfunctions = ["c"]\n')
+    os.utime(cfg, (0, 0))
+    (tmp_path / "a.css").write_text(".gf_news-c {}\n")
+    (tmp_path / "b.html").write_text('<p class="gf_news-c">\n')
+
+    first = _run("-j", "1", ".", cwd=tmp_path)
+    assert "pyparsing" in first
+
+    times = _run("-j", "1", ".", cwd=tmp_path)
+    assert "chcss.check" in times
+    assert not set(DEFERRED) & set(times)
+
+    # Parallel runs need the process pool, but not the parsers.
+    times = _run("-j", "2", ".", cwd=tmp_path)
+    assert "concurrent.futures" in times
+    assert not {"pyparsing", "toml", "tomllib"} & set(times)
+
+
+def test_import_budget():
+    """Test the import time of the CLI module."""
+    times = _importtime("import chcss.cli")
+
+    assert times["chcss.cli"] < IMPORT_BUDGET_US
@@ -0,0 +1,114 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Run statistics unit tests."""
+
+import json
+
+import chcss
+from chcss.parser import _compile_validator
+
+
+def test_stats():
+    """Test Stats() phases, counters, and merging."""
+    stats = chcss.Stats()
+
+    with stats.phase("validate"):
+        pass
+    stats.add("validate", 1.0, 0.5)
+    stats.add("zzz", 0.0, 0.0)
+    stats.add("config", 0.0, 0.0)
+    stats.counters["verdict_cache_hits"] += 3
+    stats.counters["verdict_cache_misses"] += 1
+
+    other = chcss.Stats()
+    other.add("validate", 1.0, 0.5, 2)
+    other.counters["verdict_cache_hits"] += 4
+    other.names.add("gf_news-c")
+    stats.merge(other)
+
+    result = stats.as_dict()
+    assert list(result["phases"]) == ["config", "validate", "zzz"]
+    assert result["phases"]["validate"]["calls"] == 4
+    assert result["phases"]["validate"]["wall"] >= 2.0
+    assert result["counters"]["unique_names"] == 1
+    assert result["hit_rates"] == {"verdict_cache": 7 / 8}
+
+    assert json.loads(stats.format("json")) == json.loads(json.dumps(result))
+    assert "verdict cache hit rate: 87.5%" in stats.format()
+
+
+def test_check_files_stats(tmp_path):
+    """Test statistics collected by check_files()."""
+    fn = tmp_path / "a.css"
+    fn.write_text(".gf_news-c-navbar {}\n.gf_news-c-navbr {}\n.gf_news-c-navbar {}\n")
+    (tmp_path / "b.html").write_text('<p class="gf_news-c-navbar">\n')
+    config = chcss.Config(
+        namespaces=["gf_news"],
+        functions=["c"],
+        components=["navbar"],
+        cache=False,
+        verdict_cache_size=16,
+    )
+    plain = list(chcss.check_files([str(tmp_path)], config, jobs=1))
+
+    for jobs in [1, 2]:
+        chcss.get_checker(config).clear()
+        stats = chcss.Stats()
+
+        assert list(chcss.check_files([str(tmp_path)], config, jobs, stats)) == plain
+
+        # Workers compile the validator unless they inherit it.
+        result = stats.as_dict()
+        assert set(result["phases"]) - {"compile"} == {"read", "extract", "validate"}
+        assert result["phases"]["read"]["calls"] == 2
+        counters = result["counters"]
+        assert counters["files"] == 2
+        assert counters["names"] == 4
+        assert counters["unique_names"] == 2
+        assert counters["invalid_names"] == 1
+        assert counters["failed_files"] == 1
+        assert counters["verdict_cache_hits"] + counters["verdict_cache_misses"] == 4
+
+    # Compiling is timed where it happens, once.
+    _compile_validator.cache_clear()
+    stats = chcss.Stats()
+    assert list(chcss.check_files([str(tmp_path)], config, 1, stats)) == plain
+    assert stats.as_dict()["phases"]["compile"]["calls"] == 1
+
+
+def test_main_stats(tmp_path, monkeypatch, capsys):
+    """Test the --stats option."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text("[tool.chcss]\n")
+    (tmp_path / "a.css").write_text(".gf_news-c {}\n")
+    cli = ["--namespaces", "gf_news", "--functions", "c", "--no-cache", "a.css"]
+
+    assert chcss.main(cli + ["--stats", "json"]) == 0
+    result = json.loads(capsys.readouterr().err)
+    assert list(result["phases"]) == [
+        "config",
+        "config-file",
+        "compile",
+        "read",
+        "extract",
+        "validate",
+        "report",
+    ]
+    assert result["counters"]["names"] == 1
+
+    assert chcss.main(cli + ["--stats"]) == 0
+    assert capsys.readouterr().err.startswith("phase ")
+
+    assert chcss.main(cli) == 0
+    assert capsys.readouterr().err == ""
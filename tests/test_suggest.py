@@ -0,0 +1,86 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+
+"""Suggestion unit tests."""
+
+import random
+
+import chcss
+from chcss.suggest import distance
+
+config = chcss.Config(
+    namespaces=["gf_accounts", "gf_blog", "gf_content", "gf_news"],
+    functions=["c", "l"],
+    components=["navbar", "footer", "list"],
+    modifiers=["reverse"],
+)
+
+
+def test_distance():
+    """Test distance()."""
+    assert distance("navbar", "navbar") == 0
+    assert distance("navbr", "navbar") == 1
+    assert distance("kitten", "sitting") == 3
+    assert distance("", "abc") == 3
+    assert distance("abc", "") == 3
+
+
+def test_bk_tree():
+    """Test BKTree() searches against a full scan."""
+    rng = random.Random(0)
+    words = ["".join(rng.choices("abcde", k=rng.randint(1, 7))) for _ in range(300)]
+    tree = chcss.BKTree(words)
+
+    assert len(tree) == len(set(words))
+    assert chcss.BKTree().search("a", 2) == []
+
+    for word in words[:20] + ["abcabc", "eeeeeeee"]:
+        for max_distance in [0, 1, 2]:
+            expected = sorted(
+                (distance(word, w), w)
+                for w in set(words)
+                if distance(word, w) <= max_distance
+            )
+            assert tree.search(word, max_distance) == expected
+
+
+def test_suggester():
+    """Test Suggester() suggestions."""
+    suggester = chcss.Suggester(config)
+
+    # Trees are built on the first suggestion only.
+    assert suggester._trees == {}
+
+    assert suggester.suggest("gf_news-c-navbr") == ("navbr", "navbar")
+    assert list(suggester._trees) == ["components"]
+    assert suggester.suggest("gfnews-c") == ("gfnews", "gf_news")
+    assert suggester.suggest("gf_news-c-navbar-lii") == ("lii", "li")
+    assert suggester.suggest("gf_news-c-navbar-li-revers") == ("revers", "reverse")
+    assert suggester.suggest("gf_news-c-list-zzzzzz") is None
+    assert suggester.suggest("gf_news") is None
+    assert suggester.suggest("gf_news-c-") is None
+    assert suggester.suggest("gf_news-c-navbr", max_distance=0) is None
+
+
+def test_report_suggestion(capsys):
+    """Test suggestions in reports."""
+    finding = chcss.Finding(
+        "a.css", 1, 1, chcss.get_validator(config).check("gf_news-c-footr")
+    )
+    result = chcss.FileResult("a.css", (finding,))
+
+    assert chcss.check.report(result, chcss.Suggester(config))
+    assert capsys.readouterr().out.endswith("; did you mean 'footer'?\n")
+
+    assert chcss.check.report(result)
+    assert "did you mean" not in capsys.readouterr().out
@@ -0,0 +1,52 @@
+# ******************************************************************************
+#
+# chcss, a CSS naming hierarchy enforcer.
+#
+# Copyright 2021-2024 Jeremy A Gray <gray@flyquackswim.com>.
+#
+# All rights reserved.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# ******************************************************************************
+
+"""Watch mode unit tests."""
+
+import chcss.watch
+
+pyproject = """\
+[tool.chcss]
+namespaces = ["gf_news"]
+functions = ["c"]
+components = [{components}]
+"""
+
+
+def test_watcher(tmp_path):
+    """Test Watcher.poll() re-checking only changed files."""
+    cfg = tmp_path / "pyproject.toml"
+    cfg.write_text(pyproject.format(components='"navbar"'))
+    a = tmp_path / "a.css"
+    a.write_text(".gf_news-c-navbar {}\n")
+    b = tmp_path / "b.css"
+    b.write_text(".gf_news-c-list {}\n")
+
+    watcher = chcss.watch.Watcher([str(tmp_path), "-o", str(cfg), "--no-cache"])
+
+    assert [r.fn for r in watcher.poll()] == [str(a), str(b)]
+    assert not watcher.results[str(b)].findings[0].result.valid
+    assert watcher.poll() == []
+
+    # A changed file is re-checked.
+    a.write_text(".gf_news-c-navbar, .gf_news-c {}\n")
+    assert [r.fn for r in watcher.poll()] == [str(a)]
+
+    # A new configuration re-checks everything.
+    cfg.write_text(pyproject.format(components='"navbar", "list"'))
+    assert [r.fn for r in watcher.poll()] == [str(a), str(b)]
+    assert watcher.results[str(b)].findings[0].result.valid
+
+    # Removed files are forgotten.
+    b.unlink()
+    assert watcher.poll() == []
+    assert list(watcher.results) == [str(a)]